@@ -0,0 +1,150 @@
+"""
+Benchmark of parsing SBOM and package-maintenance.dev responses into full and projection models.
+
+Run with `make benchmark` or `python -m benchmarks.bench_models [packages_count]`.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from src.clients.github.model import SBOMResponse, SBOMResponseProjection
+from src.clients.package_maintenance.model import PackagesResponse, PackagesResponseProjection
+
+DEFAULT_PACKAGES_COUNT = 10_000
+REPEAT = 5
+
+
+def create_sbom_document(packages_count: int) -> bytes:
+    """
+    Creates SBOM response document with the given number of packages, shaped like GitHub dependency graph SBOM.
+    """
+    packages = [
+        {
+            "SPDXID": f"SPDXRef-maven-com.example-package-{i}-1.0.{i}",
+            "name": f"maven:com.example:package-{i}",
+            "versionInfo": f"1.0.{i}",
+            "downloadLocation": "NOASSERTION",
+            "filesAnalyzed": False,
+            "licenseConcluded": "Apache-2.0",
+            "licenseDeclared": "Apache-2.0",
+            "supplier": "NOASSERTION",
+            "copyrightText": "NOASSERTION",
+            "externalRefs": [
+                {
+                    "referenceCategory": "PACKAGE-MANAGER",
+                    "referenceLocator": f"pkg:maven/com.example/package-{i}@1.0.{i}",
+                    "referenceType": "purl",
+                }
+            ],
+        }
+        for i in range(packages_count)
+    ]
+    return json.dumps(
+        {
+            "sbom": {
+                "SPDXID": "SPDXRef-DOCUMENT",
+                "spdxVersion": "SPDX-2.3",
+                "creationInfo": {"created": "2024-01-01T00:00:00Z", "creators": ["Tool: GitHub.com-Dependency-Graph"]},
+                "name": "example/example",
+                "dataLicense": "CC0-1.0",
+                "documentDescribes": ["example/example"],
+                "documentNamespace": "https://github.com/example/example/dependency_graph/sbom-0123456789",
+                "packages": packages,
+            }
+        }
+    ).encode()
+
+
+def create_packages_document(packages_count: int) -> bytes:
+    """
+    Creates package-maintenance.dev packages response document with the given number of packages.
+    """
+    metric = {"value": 10, "score": "B"}
+    packages = [
+        {
+            "binary_repository": {
+                "id": f"com.example:package-{i}",
+                "type": "maven",
+                "latest_version": f"1.0.{i}",
+                "latest_version_published_at": "2024-01-01T00:00:00Z",
+                "name": f"package-{i}",
+                "description": "An example package used to benchmark parsing of the maintenance metadata.",
+                "url": f"https://central.sonatype.com/artifact/com.example/package-{i}",
+                "source_repository_original_url": f"https://github.com/example/package-{i}",
+                "source_repository_normal_url": f"https://github.com/example/package-{i}",
+                "source_repository_id": f"example/package-{i}",
+                "source_repository_type": "github",
+                "release_recency": metric,
+            },
+            "source_repository": {
+                "id": f"example/package-{i}",
+                "type": "github",
+                "name": f"package-{i}",
+                "description": "An example package used to benchmark parsing of the maintenance metadata.",
+                "url": f"https://github.com/example/package-{i}",
+                "is_archived": False,
+                "is_disabled": False,
+                "is_fork": False,
+                "is_locked": False,
+                "created_at": "2020-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+                "archived_at": None,
+                "stars_count": i,
+                "languages": "Java,Kotlin",
+                "commits_frequency": metric,
+                "commits_recency": metric,
+                "issues_lifetime": metric,
+                "issues_open_percentage": metric,
+                "pull_requests_lifetime": metric,
+                "pull_requests_open_percentage": metric,
+            },
+        }
+        for i in range(packages_count)
+    ]
+    return json.dumps({"packages": packages}).encode()
+
+
+def measure(parse: Callable[[], object]) -> Tuple[float, float]:
+    """
+    Measures the best time of `REPEAT` runs in milliseconds, and the peak memory allocated by a single run in MiB.
+    """
+    timings: List[float] = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        parse()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    parsed = parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+    return min(timings) * 1000, peak / (1024 * 1024)
+
+
+def main(packages_count: int):
+    sbom = create_sbom_document(packages_count)
+    packages = create_packages_document(packages_count)
+    cases = [
+        ("SBOM, full model from parsed JSON", lambda: SBOMResponse.model_validate(json.loads(sbom))),
+        ("SBOM, full model from bytes", lambda: SBOMResponse.model_validate_json(sbom)),
+        ("SBOM, projection from bytes", lambda: SBOMResponseProjection.model_validate_json(sbom)),
+        ("Packages, full model from parsed JSON", lambda: PackagesResponse.model_validate(json.loads(packages))),
+        ("Packages, full model from bytes", lambda: PackagesResponse.model_validate_json(packages)),
+        ("Packages, projection from bytes", lambda: PackagesResponseProjection.model_validate_json(packages)),
+    ]
+
+    print(
+        f"Parsing {packages_count} packages: SBOM {len(sbom) / 1024:.0f} KiB, packages {len(packages) / 1024:.0f} KiB"
+    )
+    print(f"{'Case':<40} {'Time, ms':>10} {'Peak, MiB':>10}")
+    for name, parse in cases:
+        elapsed, peak = measure(parse)
+        print(f"{name:<40} {elapsed:>10.1f} {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PACKAGES_COUNT)
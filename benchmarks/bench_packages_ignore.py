@@ -0,0 +1,112 @@
+"""
+Benchmark of checking packages against a large packages-ignore list, indexed versus scanned linearly.
+
+Run with `make benchmark` or `python -m benchmarks.bench_packages_ignore [patterns_count] [packages_count]`.
+"""
+
+import random
+import sys
+import time
+from typing import List
+
+from packageurl import PackageURL
+
+from src.models.packages_ignore_filter import ASTERISK, PackagesIgnoreFilter
+
+DEFAULT_PATTERNS_COUNT = 10_000
+DEFAULT_PACKAGES_COUNT = 50_000
+# The linear scan is checked on a sample of packages only, and its time is extrapolated.
+LINEAR_SAMPLE_SIZE = 500
+SEED = 42
+
+
+def create_patterns(patterns_count: int) -> List[PackageURL]:
+    """
+    Creates packages to ignore, mixing exact packages with namespace and name prefix globs across types.
+    """
+    patterns: List[PackageURL] = []
+    for i in range(patterns_count):
+        kind = i % 4
+        if kind == 0:
+            patterns.append(PackageURL(type="maven", namespace=f"com.corp{i}", name=f"package-{i}"))
+        elif kind == 1:
+            patterns.append(PackageURL(type="maven", namespace=f"com.corp{i}.{ASTERISK}", name=ASTERISK))
+        elif kind == 2:
+            patterns.append(PackageURL(type="pypi", name=f"corp{i}-{ASTERISK}"))
+        else:
+            patterns.append(PackageURL(type="npm", namespace=f"@corp{i}", name=f"ui-{ASTERISK}"))
+    return patterns
+
+
+def create_packages(packages_count: int, patterns_count: int) -> List[PackageURL]:
+    """
+    Creates packages to check, matching the patterns or their neighbours, so only a part of them is ignored.
+    """
+    rng = random.Random(SEED)
+    packages: List[PackageURL] = []
+    for i in range(packages_count):
+        j = rng.randrange(patterns_count * 2)
+        kind = i % 4
+        if kind == 0:
+            packages.append(PackageURL(type="maven", namespace=f"com.corp{j}", name=f"package-{j}", version="1.0.0"))
+        elif kind == 1:
+            packages.append(PackageURL(type="maven", namespace=f"com.corp{j}.core", name="api", version="1.0.0"))
+        elif kind == 2:
+            packages.append(PackageURL(type="pypi", name=f"corp{j}-client", version="1.0.0"))
+        else:
+            packages.append(PackageURL(type="npm", namespace=f"@corp{j}", name="ui-button", version="1.0.0"))
+    return packages
+
+
+def ignore_linear(patterns: List[PackageURL], purl: PackageURL) -> bool:
+    """
+    Checks package against each of the patterns in turn.
+    """
+    namespace = purl.namespace or ""
+    for pattern in patterns:
+        if pattern.type != purl.type:
+            continue
+        pattern_namespace = pattern.namespace or ASTERISK
+        if pattern_namespace.endswith(ASTERISK):
+            if not namespace.startswith(pattern_namespace[:-1]):
+                continue
+        elif pattern_namespace != namespace:
+            continue
+        if pattern.name.endswith(ASTERISK):
+            if purl.name.startswith(pattern.name[:-1]):
+                return True
+        elif pattern.name == purl.name:
+            return True
+    return False
+
+
+def main(patterns_count: int, packages_count: int):
+    patterns = create_patterns(patterns_count)
+    packages = create_packages(packages_count, patterns_count)
+
+    start = time.perf_counter()
+    packages_ignore_filter = PackagesIgnoreFilter(patterns)
+    build_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ignored = sum(packages_ignore_filter.ignore(purl) for purl in packages)
+    indexed_elapsed = time.perf_counter() - start
+
+    sample = packages[:LINEAR_SAMPLE_SIZE]
+    start = time.perf_counter()
+    linear_ignored = sum(ignore_linear(patterns, purl) for purl in sample)
+    linear_elapsed = (time.perf_counter() - start) * packages_count / len(sample)
+    assert linear_ignored == sum(packages_ignore_filter.ignore(purl) for purl in sample)
+
+    print(f"Checking {packages_count} packages against {patterns_count} patterns, {ignored} packages ignored")
+    print(f"{'Case':<40} {'Time, ms':>10}")
+    print(f"{'Index build':<40} {build_elapsed * 1000:>10.1f}")
+    print(f"{'Indexed check':<40} {indexed_elapsed * 1000:>10.1f}")
+    print(f"{'Linear scan (extrapolated)':<40} {linear_elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PATTERNS_COUNT,
+        int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PACKAGES_COUNT,
+    )
@@ -0,0 +1,65 @@
+"""
+Benchmark of memory held by maintenance reports on pydantic models versus compact records.
+
+Run with `make benchmark` or `python -m benchmarks.bench_report_memory [packages_count]`.
+"""
+
+import gc
+import sys
+import tracemalloc
+from typing import Callable, List
+
+from packageurl import PackageURL
+
+from benchmarks.bench_models import create_packages_document
+from src.arguments.action_arguments import ActionArguments, MaintenanceMetricScore, MaintenanceMetricSlug
+from src.clients.package_maintenance.model import PackageMetadataProjection, PackagesResponse
+from src.models.compact_package_metadata import compact_package_metadata
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+
+DEFAULT_PACKAGES_COUNT = 100_000
+
+
+def measure_retained(build: Callable[[], object]) -> float:
+    """
+    Measures memory retained by the object built by the given function in MiB.
+    """
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return retained / (1024 * 1024)
+
+
+def main(packages_count: int):
+    document = create_packages_document(packages_count)
+    packages_urls = [
+        PackageURL(type="maven", namespace="com.example", name=f"package-{i}") for i in range(packages_count)
+    ]
+    arguments = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        packages_scores_thresholds={MaintenanceMetricSlug.binary_release_recency: MaintenanceMetricScore.B},
+    )
+
+    def parse() -> List[PackageMetadataProjection]:
+        return list(PackagesResponse.model_validate_json(document).packages)
+
+    # Models are parsed within each case, so that strings shared by models and records are counted too.
+    cases = [
+        ("Pydantic models", parse),
+        ("Compact records", lambda: [compact_package_metadata(package) for package in parse()]),
+        ("Report on compact records", lambda: PackagesMaintenanceReport.create(packages_urls, parse(), arguments)),
+    ]
+
+    print(f"Holding maintenance metadata of {packages_count} packages")
+    print(f"{'Case':<30} {'Retained, MiB':>14}")
+    for name, build in cases:
+        print(f"{name:<30} {measure_retained(build):>14.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PACKAGES_COUNT)
@@ -31,6 +31,81 @@ def parse_arguments():
         type=str,
         help="SBOM scores thresholds in string format. Default is None.",
     )
+    parser.add_argument(
+        "--max_concurrency",
+        type=str,
+        help="Maximum number of concurrent requests to package-maintenance.dev API. Default is None.",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        help="Directory of the packages maintenance metadata cache. Default is None, that disables the cache.",
+    )
+    parser.add_argument(
+        "--cache_ttl_seconds",
+        type=str,
+        help="Time in seconds cached packages maintenance metadata is considered fresh. Default is None.",
+    )
+    parser.add_argument(
+        "--cache_max_entries",
+        type=str,
+        help="Maximum number of packages kept in the packages maintenance metadata cache. Default is None.",
+    )
+    parser.add_argument(
+        "--cache_backend",
+        type=str,
+        help="Storage of the packages maintenance metadata cache, 'json' or 'sqlite'. Default is None.",
+    )
+    parser.add_argument(
+        "--sbom_streaming",
+        type=str,
+        help="Whether to parse SBOM incrementally while it is downloaded, 'true' or 'false'. Default is None.",
+    )
+    parser.add_argument(
+        "--sbom_file",
+        type=str,
+        help="SPDX or CycloneDX JSON SBOM file to read packages from instead of GitHub. Default is None.",
+    )
+    parser.add_argument(
+        "--lockfiles",
+        type=str,
+        help="Glob patterns of lockfiles to read packages from instead of GitHub, one per line. Default is None.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        type=str,
+        help="Whether to request maintenance metadata while SBOM is streamed, 'true' or 'false'. Default is None.",
+    )
+    parser.add_argument(
+        "--github_repositories",
+        type=str,
+        help="Multiline string of GitHub repositories to scan at once in the form of owner/repo. Default is None.",
+    )
+    parser.add_argument(
+        "--github_organization",
+        type=str,
+        help="GitHub organization whose repositories are scanned at once. Default is None.",
+    )
+    parser.add_argument(
+        "--diff_base_ref",
+        type=str,
+        help="Revision to check only dependencies changed since, for instance the pull request base. Default is None.",
+    )
+    parser.add_argument(
+        "--diff_head_ref",
+        type=str,
+        help="Revision whose dependency changes are checked. Default is None, that is the current commit.",
+    )
+    parser.add_argument(
+        "--report_dir",
+        type=str,
+        help="Directory the complete report is written to if it does not fit into the step summary. Default is None.",
+    )
+    parser.add_argument(
+        "--report_jsonl_file",
+        type=str,
+        help="File to write the report to as JSON Lines. Default is None, that disables the export.",
+    )
 
     return parser.parse_args()
 
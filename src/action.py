@@ -1,13 +1,31 @@
 import logging
-import os
+from typing import Dict, List, Mapping, Optional, Tuple
 
 import argparse
+from packageurl import PackageURL
 
+from src.arguments.action_arguments import ActionArguments
 from src.arguments.parse_action_arguments import parse_action_arguments
+from src.clients.github.client import GitHubClient
+from src.clients.http_session import create_http_session
+from src.clients.package_maintenance.client import PackageMaintenanceClient
+from src.clients.package_maintenance.model import PackageMetadataProjection
+from src.clients.request_scheduler import RequestScheduler
+from src.models.packages_diff import PackagesDiff
 from src.models.packages_maintenance_report import PackagesMaintenanceReport
-from src.service.packages_maintenance_retriever import PackagesMaintenanceRetriever
+from src.service.packages_maintenance_retriever import (
+    PackagesMaintenanceRetriever,
+    PackagesMaintenanceRetrievalError,
+)
 from src.service.packages_retriever import PackagesRetriever
+from src.service.repositories_scanner import RepositoriesScanner, RepositoriesScanError
+from src.storage.packages_metadata_store import create_packages_metadata_store
+from src.storage.sbom_cache import SbomCache
+from src.view.packages_maintenance_diff_report_document import PackagesMaintenanceDiffReportDocument
 from src.view.packages_maintenance_report_document import PackagesMaintenanceReportDocument
+from src.view.packages_maintenance_report_jsonl import create_run_metadata, write_packages_jsonl
+from src.view.repositories_maintenance_report_document import RepositoriesMaintenanceReportDocument
+from src.view.step_summary import StepSummaryWriter
 
 logger = logging.getLogger(__name__)
 
@@ -17,25 +35,148 @@ def perform_action(raw_arguments: argparse.Namespace):
     Perform action based on the arguments: fetch packages URLs, fetch maintenance data, generate and print report.
     """
     arguments = parse_action_arguments(raw_arguments)
+    github_scheduler = RequestScheduler()
+    package_maintenance_scheduler = RequestScheduler()
 
-    packages_retriever = PackagesRetriever.create(arguments)
-    packages_maintenance_retriever = PackagesMaintenanceRetriever()
+    with create_http_session(pool_maxsize=arguments.max_concurrency) as session:
+        github_client = GitHubClient(session, SbomCache.create(arguments), github_scheduler)
+        package_maintenance_client = PackageMaintenanceClient(session, package_maintenance_scheduler)
+        packages_metadata_store = create_packages_metadata_store(arguments)
+        try:
+            packages_retriever = PackagesRetriever.create(arguments, github_client)
+            packages_maintenance_retriever = PackagesMaintenanceRetriever.create(
+                arguments, package_maintenance_client, packages_metadata_store
+            )
+            if arguments.is_multi_repository_scan():
+                scanner = RepositoriesScanner.create(arguments, github_client, packages_maintenance_retriever)
+                scan_repositories(arguments, scanner)
+                return
 
-    packages_urls = packages_retriever.get_packages_urls_to_check()
-    packages_maintenance = packages_maintenance_retriever.get_packages_maintenance(packages_urls)
+            packages_diff = packages_retriever.get_packages_diff() if arguments.is_diff() else None
+            packages_urls, packages_maintenance = retrieve_packages_maintenance(
+                arguments, packages_retriever, packages_maintenance_retriever, packages_diff
+            )
+        finally:
+            log_requests_stats(
+                {"GitHub API": github_scheduler, "package-maintenance.dev API": package_maintenance_scheduler}
+            )
+            if packages_metadata_store:
+                packages_metadata_store.close()
+
+    write_report(arguments, packages_urls, packages_maintenance, packages_diff)
+
+
+def retrieve_packages_maintenance(
+    arguments: ActionArguments,
+    packages_retriever: PackagesRetriever,
+    packages_maintenance_retriever: PackagesMaintenanceRetriever,
+    packages_diff: Optional[PackagesDiff] = None,
+) -> Tuple[List[PackageURL], List[PackageMetadataProjection]]:
+    """
+    Retrieve packages URLs to check and their maintenance data. In pipeline mode, maintenance data is requested while
+    SBOM is streamed. If maintenance data of some packages failed to be retrieved, the report on the rest of packages
+    is printed before the error is raised.
+    """
+    if packages_diff is None and arguments.pipeline:
+        try:
+            return packages_maintenance_retriever.get_packages_maintenance_pipelined(
+                packages_retriever.iter_packages_urls_to_check()
+            )
+        except PackagesMaintenanceRetrievalError as error:
+            write_partial_report(arguments, error.packages_urls or [], error)
+            raise
+
+    if packages_diff is not None:
+        packages_urls = packages_diff.packages_urls_to_check()
+    else:
+        packages_urls = packages_retriever.get_packages_urls_to_check()
+    try:
+        return packages_urls, packages_maintenance_retriever.get_packages_maintenance(packages_urls)
+    except PackagesMaintenanceRetrievalError as error:
+        write_partial_report(arguments, packages_urls, error, packages_diff)
+        raise
+
+
+def scan_repositories(arguments: ActionArguments, scanner: RepositoriesScanner):
+    """
+    Scan several repositories, generate and print the rollup report on them along with the report of each repository.
+    If maintenance data of some packages failed to be retrieved, the report on the rest of packages is still printed.
+    """
+    summary_writer = StepSummaryWriter.create(arguments)
+    try:
+        report = scanner.scan()
+    except RepositoriesScanError as error:
+        document = RepositoriesMaintenanceReportDocument(error.report)
+        summary_writer.write(document.write, error.report.repositories_reports())
+        write_jsonl_report(arguments, error.report.repositories_reports())
+        raise
+    summary_writer.write(RepositoriesMaintenanceReportDocument(report).write, report.repositories_reports())
+    write_jsonl_report(arguments, report.repositories_reports())
+
+
+def log_requests_stats(schedulers: Dict[str, RequestScheduler]):
+    """
+    Log number of requests, retries and throttles of each API, to help tuning the concurrency.
+    """
+    for api, scheduler in schedulers.items():
+        stats = scheduler.stats
+        logger.info(
+            f"{api}: {stats.requests} requests, {stats.retries} retries, "
+            f"{stats.throttles} throttles ({stats.throttled_seconds:.1f} seconds)."
+        )
+
+
+def write_partial_report(
+    arguments: ActionArguments,
+    packages_urls: List[PackageURL],
+    error: PackagesMaintenanceRetrievalError,
+    packages_diff: Optional[PackagesDiff] = None,
+):
+    """
+    Generate and print report on the packages whose maintenance data were retrieved before the error.
+    Failed packages are excluded, so that they are not reported as missing from the index.
+    """
+    logger.error(f"{error}. Reporting on {len(error.packages_maintenance)} retrieved packages only.")
+    failed_packages_urls = set(error.failed_packages_urls)
+    packages_urls = [package_url for package_url in packages_urls if package_url not in failed_packages_urls]
+    write_report(arguments, packages_urls, error.packages_maintenance, packages_diff)
+
+
+def write_report(
+    arguments: ActionArguments,
+    packages_urls: List[PackageURL],
+    packages_maintenance: List[PackageMetadataProjection],
+    packages_diff: Optional[PackagesDiff] = None,
+):
+    """
+    Generate report and print it to the GitHub step summary, or to stdout if the summary is not available.
+    In diff mode, the report is rendered as a delta of the dependency changes. If the report does not fit into
+    the step summary, the complete report is written to the report directory.
+    """
     report = PackagesMaintenanceReport.create(
         packages=packages_urls,
         packages_maintenance=packages_maintenance,
         action_arguments=arguments,
     )
-    document = PackagesMaintenanceReportDocument(report)
+    reports = {f"{arguments.github_repository_owner}/{arguments.github_repository_name}": report}
+    summary_writer = StepSummaryWriter.create(arguments)
+    if packages_diff is not None:
+        summary_writer.write(PackagesMaintenanceDiffReportDocument(report, packages_diff).write, reports)
+    else:
+        summary_writer.write(PackagesMaintenanceReportDocument(report).write, reports)
+    write_jsonl_report(arguments, reports, packages_diff)
 
-    summary_file = os.getenv("GITHUB_STEP_SUMMARY")
 
-    # Check if the environment variable exists
-    report_markdown = document.render()
-    if summary_file:
-        with open(summary_file, "a") as f:
-            f.write(report_markdown)
-    else:
-        print(f"GITHUB_STEP_SUMMARY is not set. Printing the report to stdout: \n{report_markdown}")
+def write_jsonl_report(
+    arguments: ActionArguments,
+    reports: Mapping[str, PackagesMaintenanceReport],
+    packages_diff: Optional[PackagesDiff] = None,
+):
+    """
+    Write reports to the JSON Lines file, if configured, for machine processing of the results of many runs.
+    """
+    if not arguments.report_jsonl_file:
+        return
+    with open(arguments.report_jsonl_file, "w", encoding="utf-8") as sink:
+        write_packages_jsonl(sink, reports, create_run_metadata(arguments, packages_diff))
+    logger.info(f"JSON Lines report is written to '{arguments.report_jsonl_file}'.")
@@ -5,6 +5,12 @@ from packageurl import PackageURL
 from pydantic import BaseModel, SkipValidation  # type: ignore[attr-defined]
 
 DEFAULT_SCORE_THRESHOLD = "B"
+DEFAULT_MAX_CONCURRENCY = 4
+# Maintenance scores are recalculated daily, hence cached data is considered fresh for a day.
+DEFAULT_CACHE_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_CACHE_MAX_ENTRIES = 50_000
+# Directory the complete report is written to if it does not fit into the step summary.
+DEFAULT_REPORT_DIR = "package-maintenance-report"
 
 
 class MaintenanceMetricSlug(Enum):
@@ -25,6 +31,13 @@ def default_packages_scores_thresholds():
     }
 
 
+class CacheBackend(Enum):
+    # Single JSON file, to be persisted between workflow runs with `actions/cache`.
+    json = "json"
+    # SQLite database shared by all processes on the host, for self-hosted runners.
+    sqlite = "sqlite"
+
+
 class MaintenanceMetricScore(Enum):
     A = "A"
     B = "B"
@@ -40,3 +53,36 @@ class ActionArguments(BaseModel):
     packages_scores_thresholds: dict[MaintenanceMetricSlug, MaintenanceMetricScore] = (
         default_packages_scores_thresholds()
     )
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    cache_dir: Optional[str] = None
+    cache_ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS
+    cache_max_entries: int = DEFAULT_CACHE_MAX_ENTRIES
+    cache_backend: CacheBackend = CacheBackend.json
+    sbom_streaming: bool = False
+    # SBOM file generated earlier in the workflow to read packages from instead of the GitHub dependency graph.
+    sbom_file: Optional[str] = None
+    # Glob patterns of lockfiles in the workspace to read packages from instead of the GitHub dependency graph.
+    lockfiles: list[str] = []
+    # Whether to request maintenance metadata while SBOM is streamed, rather than after the whole SBOM is parsed.
+    pipeline: bool = False
+    # Repositories to scan in multi-repository mode, as (owner, name) pairs, in addition to organization repositories.
+    github_repositories: list[tuple[str, str]] = []
+    github_organization: Optional[str] = None
+    # Revisions to compare dependencies between in diff mode, for instance the base and the head of a pull request.
+    diff_base_ref: Optional[str] = None
+    diff_head_ref: Optional[str] = None
+    report_dir: str = DEFAULT_REPORT_DIR
+    # File to write the machine-readable report to as JSON Lines, if any.
+    report_jsonl_file: Optional[str] = None
+
+    def is_multi_repository_scan(self) -> bool:
+        """
+        Whether several repositories are scanned at once, rather than the single GitHub repository.
+        """
+        return bool(self.github_repositories or self.github_organization)
+
+    def is_diff(self) -> bool:
+        """
+        Whether only dependencies changed since the base revision are checked, rather than all dependencies.
+        """
+        return bool(self.diff_base_ref)
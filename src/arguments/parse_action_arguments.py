@@ -2,6 +2,8 @@
 Module containing the function to parse the action arguments into the corresponding typesafe model.
 """
 
+import json
+import logging
 import os
 from typing import Optional
 
@@ -12,27 +14,96 @@ from src.arguments.action_arguments import (
     MaintenanceMetricScore,
     MaintenanceMetricSlug,
     ActionArguments,
+    CacheBackend,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_CACHE_TTL_SECONDS,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_REPORT_DIR,
     default_packages_scores_thresholds,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def parse_action_arguments(args: argparse.Namespace) -> ActionArguments:
-    github_owner, github_repo = _parse_github_repository(args)
+    github_repositories = _parse_github_repositories(getattr(args, "github_repositories", None))
+    github_organization = (getattr(args, "github_organization", None) or "").strip() or None
+    multi_repository_scan = bool(github_repositories or github_organization)
+    github_owner, github_repo = _parse_github_repository(args, multi_repository_scan, github_repositories)
     github_token = args.github_token
     packages_ignore = _parse_packages_ignore(args)
     packages_scores_thresholds = _parse_packages_scores_thresholds(args.packages_scores_thresholds)
+    max_concurrency = _parse_max_concurrency(getattr(args, "max_concurrency", None))
+    cache_dir = getattr(args, "cache_dir", None) or None
+    cache_ttl_seconds = _parse_positive_integer(
+        getattr(args, "cache_ttl_seconds", None), DEFAULT_CACHE_TTL_SECONDS, "cache TTL"
+    )
+    cache_max_entries = _parse_positive_integer(
+        getattr(args, "cache_max_entries", None), DEFAULT_CACHE_MAX_ENTRIES, "cache max entries"
+    )
+    cache_backend = _parse_cache_backend(getattr(args, "cache_backend", None))
+    diff_base_ref, diff_head_ref = _parse_diff_refs(args)
+    report_dir = (getattr(args, "report_dir", None) or "").strip() or DEFAULT_REPORT_DIR
+    report_jsonl_file = (getattr(args, "report_jsonl_file", None) or "").strip() or None
+    sbom_streaming = _parse_boolean(getattr(args, "sbom_streaming", None), False, "SBOM streaming")
+    sbom_file = _parse_sbom_file(getattr(args, "sbom_file", None))
+    lockfiles = _parse_lockfiles(getattr(args, "lockfiles", None))
+    if sbom_file and lockfiles:
+        raise ValueError("Invalid packages source. Either SBOM file or lockfiles should be set, not both.")
+    pipeline = _parse_boolean(getattr(args, "pipeline", None), False, "pipeline")
     action_arguments = ActionArguments(
         github_repository_owner=github_owner,
         github_repository_name=github_repo,
         github_token=github_token,
         packages_ignore=packages_ignore,
         packages_scores_thresholds=packages_scores_thresholds,
+        max_concurrency=max_concurrency,
+        cache_dir=cache_dir,
+        cache_ttl_seconds=cache_ttl_seconds,
+        cache_max_entries=cache_max_entries,
+        cache_backend=cache_backend,
+        sbom_streaming=sbom_streaming,
+        sbom_file=sbom_file,
+        lockfiles=lockfiles,
+        pipeline=pipeline,
+        github_repositories=github_repositories,
+        github_organization=github_organization,
+        diff_base_ref=diff_base_ref,
+        diff_head_ref=diff_head_ref,
+        report_dir=report_dir,
+        report_jsonl_file=report_jsonl_file,
     )
     return action_arguments
 
 
-def _parse_github_repository(args: argparse.Namespace) -> tuple[str, str]:
+def _parse_github_repository(
+    args: argparse.Namespace,
+    multi_repository_scan: bool = False,
+    github_repositories: Optional[list[tuple[str, str]]] = None,
+) -> tuple[str, str]:
+    if multi_repository_scan and not (args.github_repository or os.getenv("GITHUB_REPOSITORY")):
+        # The single repository is not scanned in multi-repository mode, so it is not required.
+        return github_repositories[0] if github_repositories else ("", "")
     github_repository = args.github_repository or os.environ["GITHUB_REPOSITORY"]
+    return _parse_repository_name(github_repository)
+
+
+def _parse_github_repositories(github_repositories: Optional[str]) -> list[tuple[str, str]]:
+    if not github_repositories:
+        return []
+
+    repositories: list[tuple[str, str]] = []
+    for repository in github_repositories.replace(",", "\n").split("\n"):
+        repository = repository.strip()
+        if not repository:
+            continue
+        owner_repo = _parse_repository_name(repository)
+        if owner_repo not in repositories:
+            repositories.append(owner_repo)
+    return repositories
+
+
+def _parse_repository_name(github_repository: str) -> tuple[str, str]:
     try:
         owner, repo = map(str.strip, github_repository.split("/"))
         if not owner or not repo:
@@ -42,6 +113,65 @@ def _parse_github_repository(args: argparse.Namespace) -> tuple[str, str]:
     return owner, repo
 
 
+def _parse_cache_backend(cache_backend: Optional[str]) -> CacheBackend:
+    cache_backend = (cache_backend or "").strip().lower()
+    if not cache_backend:
+        return CacheBackend.json
+    try:
+        return CacheBackend(cache_backend)
+    except ValueError:
+        backends = ", ".join(f"'{backend.value}'" for backend in CacheBackend)
+        raise ValueError(f"Invalid cache backend: {cache_backend}. It should be one of {backends}.")
+
+
+def _parse_diff_refs(args: argparse.Namespace) -> tuple[Optional[str], Optional[str]]:
+    diff_base_ref = (getattr(args, "diff_base_ref", None) or "").strip() or None
+    if not diff_base_ref:
+        return None, None
+
+    diff_head_ref = (getattr(args, "diff_head_ref", None) or "").strip() or _default_diff_head_ref()
+    if not diff_head_ref:
+        raise ValueError("Invalid diff head revision. It should be set when the diff base revision is set.")
+    return diff_base_ref, diff_head_ref
+
+
+def _default_diff_head_ref() -> Optional[str]:
+    """
+    Returns the head of the pull request the workflow runs for, or the commit the workflow runs on otherwise.
+    On pull requests, the workflow runs on the temporary merge commit into the base branch, whose dependency changes
+    would include the changes of the base branch made since the pull request was branched.
+    """
+    event_path = os.getenv("GITHUB_EVENT_PATH")
+    if event_path:
+        try:
+            with open(event_path, "r", encoding="utf-8") as f:
+                event = json.load(f)
+        except (OSError, ValueError) as error:
+            logger.warning(f"Failed to read GitHub event '{event_path}': {error}. Using the workflow commit.")
+            event = None
+        pull_request = event.get("pull_request") if isinstance(event, dict) else None
+        head = pull_request.get("head") if isinstance(pull_request, dict) else None
+        head_sha = head.get("sha") if isinstance(head, dict) else None
+        if isinstance(head_sha, str) and head_sha:
+            return head_sha
+    return os.getenv("GITHUB_SHA")
+
+
+def _parse_sbom_file(sbom_file: Optional[str]) -> Optional[str]:
+    sbom_file = (sbom_file or "").strip()
+    if not sbom_file:
+        return None
+    if not os.path.isfile(sbom_file):
+        raise ValueError(f"Invalid SBOM file: {sbom_file}. It should be an existing file.")
+    return sbom_file
+
+
+def _parse_lockfiles(lockfiles: Optional[str]) -> list[str]:
+    if lockfiles is None:
+        return []
+    return [pattern.strip() for pattern in lockfiles.split("\n") if pattern.strip()]
+
+
 def _parse_packages_ignore(args: argparse.Namespace) -> list[PackageURL]:
     if args.packages_ignore is None:
         return []
@@ -74,3 +204,33 @@ def _parse_packages_scores_thresholds(
         sbom_score = MaintenanceMetricScore(value.upper())
         thresholds_dict[sbom_metric] = sbom_score
     return thresholds_dict
+
+
+def _parse_max_concurrency(max_concurrency: Optional[str]) -> int:
+    return _parse_positive_integer(max_concurrency, DEFAULT_MAX_CONCURRENCY, "max concurrency")
+
+
+def _parse_positive_integer(value: Optional[str], default: int, name: str) -> int:
+    if not value:
+        return default
+
+    try:
+        parsed_value = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value}. It should be a positive integer.")
+    if parsed_value < 1:
+        raise ValueError(f"Invalid {name}: {value}. It should be a positive integer.")
+    return parsed_value
+
+
+def _parse_boolean(value: Optional[str], default: bool, name: str) -> bool:
+    if not value:
+        return default
+
+    match value.strip().lower():
+        case "true":
+            return True
+        case "false":
+            return False
+        case _:
+            raise ValueError(f"Invalid {name}: {value}. It should be either 'true' or 'false'.")
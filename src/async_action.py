@@ -0,0 +1,65 @@
+import logging
+
+import argparse
+
+from src.action import log_requests_stats, write_report, write_partial_report
+from src.arguments.parse_action_arguments import parse_action_arguments
+from src.clients.github.async_client import AsyncGitHubClient
+from src.clients.http_session import create_async_http_client
+from src.clients.package_maintenance.async_client import AsyncPackageMaintenanceClient
+from src.clients.request_scheduler import AsyncRequestScheduler
+from src.service.async_packages_maintenance_retriever import AsyncPackagesMaintenanceRetriever
+from src.service.async_packages_retriever import AsyncPackagesRetriever
+from src.service.packages_maintenance_retriever import PackagesMaintenanceRetrievalError
+from src.storage.packages_metadata_store import create_packages_metadata_store
+from src.storage.sbom_cache import SbomCache
+
+logger = logging.getLogger(__name__)
+
+
+async def perform_action_async(raw_arguments: argparse.Namespace):
+    """
+    Asynchronous counterpart of `perform_action`: fetch packages URLs, fetch maintenance data, generate and print
+    report without blocking the event loop while waiting for the APIs.
+    Multi-repository scans and pipeline mode are supported by `perform_action` only.
+
+    :raises ValueError: if several repositories are to be scanned, or pipeline mode is enabled.
+    """
+    arguments = parse_action_arguments(raw_arguments)
+    if arguments.is_multi_repository_scan():
+        raise ValueError(
+            "Scanning several repositories with 'github-repositories' or 'github-organization' "
+            "is not supported by the asynchronous action."
+        )
+    if arguments.pipeline:
+        raise ValueError("Pipeline mode is not supported by the asynchronous action.")
+    github_scheduler = AsyncRequestScheduler()
+    package_maintenance_scheduler = AsyncRequestScheduler()
+
+    async with create_async_http_client(max_connections=arguments.max_concurrency) as client:
+        github_client = AsyncGitHubClient(client, SbomCache.create(arguments), github_scheduler)
+        package_maintenance_client = AsyncPackageMaintenanceClient(client, package_maintenance_scheduler)
+        packages_metadata_store = create_packages_metadata_store(arguments)
+        try:
+            packages_retriever = AsyncPackagesRetriever.create(arguments, github_client)
+            packages_maintenance_retriever = AsyncPackagesMaintenanceRetriever.create(
+                arguments, package_maintenance_client, packages_metadata_store
+            )
+            packages_diff = await packages_retriever.get_packages_diff() if arguments.is_diff() else None
+            if packages_diff is not None:
+                packages_urls = packages_diff.packages_urls_to_check()
+            else:
+                packages_urls = await packages_retriever.get_packages_urls_to_check()
+            try:
+                packages_maintenance = await packages_maintenance_retriever.get_packages_maintenance(packages_urls)
+            except PackagesMaintenanceRetrievalError as error:
+                write_partial_report(arguments, packages_urls, error, packages_diff)
+                raise
+        finally:
+            log_requests_stats(
+                {"GitHub API": github_scheduler, "package-maintenance.dev API": package_maintenance_scheduler}
+            )
+            if packages_metadata_store:
+                packages_metadata_store.close()
+
+    write_report(arguments, packages_urls, packages_maintenance, packages_diff)
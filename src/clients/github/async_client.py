@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import typing
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, ContextManager, List, Optional, Type, TypeVar
+
+import httpx
+
+from src.clients.github.client import (
+    DEPENDENCY_CHANGES_ADAPTER,
+    SBOM_PACKAGES_PATH,
+    SBOM_STREAM_CHUNK_SIZE,
+    github_dependency_graph_compare_url,
+    github_headers,
+    github_sbom_url,
+)
+from src.clients.github.model import DependencyChange, SBOMResponse, SBOMResponseProjection
+from src.clients.request_scheduler import AsyncRequestScheduler
+from src.utils.json_stream import JsonArrayStreamParser
+from src.storage.sbom_cache import SbomCache, CachedSbom
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGitHubClient:
+    """
+    Asynchronous client of the GitHub REST API. All requests are made through the given HTTP client, so
+    connections are reused between requests and requests to many repositories can be made concurrently
+    within one event loop. Like `GitHubClient`, it revalidates SBOM cached in the SBOM cache, if given.
+    The SBOM cache reads and writes files, so it is accessed in worker threads rather than on the event loop.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        sbom_cache: Optional[SbomCache] = None,
+        scheduler: Optional[AsyncRequestScheduler] = None,
+    ):
+        self._client = client
+        self._sbom_cache = sbom_cache
+        self._scheduler = scheduler or AsyncRequestScheduler()
+
+    @typing.no_type_check
+    async def fetch_github_sbom(
+        self,
+        owner: str,
+        repo: str,
+        token: Optional[str] = None,
+        response_model: Type[SBOMResponseProjection] = SBOMResponse,
+    ) -> SBOMResponseProjection:
+        """
+        Fetches the SBOM for a given GitHub repository and parses it into a Pydantic model.
+        See `GitHubClient.fetch_github_sbom` for more details.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The repository name.
+            token (Optional[str]): The GitHub personal access token. Default is None.
+            response_model (Type[SBOMResponseProjection]): The model to parse the SBOM into. Default is the full
+                `SBOMResponse`, pass `SBOMResponseProjection` to validate only the fields used to extract packages.
+
+        Returns:
+            SBOMResponseProjection: The parsed SBOM data as an instance of `response_model`.
+        """
+        url = github_sbom_url(owner, repo)
+        headers = github_headers(token)
+        cached_sbom = await asyncio.to_thread(self._sbom_cache.get, owner, repo) if self._sbom_cache else None
+        if cached_sbom:
+            headers["If-None-Match"] = cached_sbom.etag
+        response = await self._scheduler.send_async(lambda: self._client.get(url, headers=headers))
+
+        if response.status_code == 304 and cached_sbom:
+            logger.info(f"SBOM of '{owner}/{repo}' is not modified. Using cached SBOM.")
+            return response_model.model_validate_json(cached_sbom.body)
+        elif response.status_code == 200:
+            etag = response.headers.get("ETag")
+            if self._sbom_cache and etag:
+                await asyncio.to_thread(self._sbom_cache.put, owner, repo, CachedSbom(etag=etag, body=response.content))
+            return response_model.model_validate_json(response.content)
+        else:
+            response.raise_for_status()
+
+    @typing.no_type_check
+    async def fetch_dependency_changes(
+        self, owner: str, repo: str, base_ref: str, head_ref: str, token: Optional[str] = None
+    ) -> List[DependencyChange]:
+        """
+        Fetches dependency changes between two revisions of a given GitHub repository.
+        See `GitHubClient.fetch_dependency_changes` for more details.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The repository name.
+            base_ref (str): The base revision: a branch, a tag or a commit SHA.
+            head_ref (str): The head revision: a branch, a tag or a commit SHA.
+            token (Optional[str]): The GitHub personal access token. Default is None.
+
+        Returns:
+            List[DependencyChange]: Added and removed dependencies.
+        """
+        url = github_dependency_graph_compare_url(owner, repo, base_ref, head_ref)
+        headers = github_headers(token)
+        response = await self._scheduler.send_async(lambda: self._client.get(url, headers=headers))
+        response.raise_for_status()
+        return DEPENDENCY_CHANGES_ADAPTER.validate_json(response.content)
+
+    async def stream_github_sbom_packages(
+        self, owner: str, repo: str, token: Optional[str] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Streams packages of the SBOM for a given GitHub repository.
+        See `GitHubClient.stream_github_sbom_packages` for more details.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The repository name.
+            token (Optional[str]): The GitHub personal access token. Default is None.
+
+        Returns:
+            AsyncIterator[Any]: SPDX packages of the SBOM as parsed JSON objects.
+        """
+        url = github_sbom_url(owner, repo)
+        headers = github_headers(token)
+        etag = await asyncio.to_thread(self._sbom_cache.get_etag, owner, repo) if self._sbom_cache else None
+        if etag:
+            headers["If-None-Match"] = etag
+
+        parser = JsonArrayStreamParser(SBOM_PACKAGES_PATH)
+        request = self._client.build_request("GET", url, headers=headers)
+        response = await self._scheduler.send_async(lambda: self._client.send(request, stream=True))
+        try:
+            if response.status_code == 304 and etag and self._sbom_cache:
+                logger.info(f"SBOM of '{owner}/{repo}' is not modified. Using cached SBOM.")
+                chunks = self._sbom_cache.iter_body(owner, repo, SBOM_STREAM_CHUNK_SIZE)
+                while chunk := await asyncio.to_thread(next, chunks, b""):
+                    for package in parser.feed(chunk):
+                        yield package
+                    if parser.done:
+                        break
+            else:
+                response.raise_for_status()
+                response_etag = response.headers.get("ETag")
+                if self._sbom_cache and response_etag:
+                    async with _in_thread(self._sbom_cache.body_writer(owner, repo, response_etag)) as body:
+                        # The rest of the document after the packages is read too, to cache it complete.
+                        async for chunk in response.aiter_bytes(SBOM_STREAM_CHUNK_SIZE):
+                            await asyncio.to_thread(body.write, chunk)
+                            for package in parser.feed(chunk):
+                                yield package
+                else:
+                    async for chunk in response.aiter_bytes(SBOM_STREAM_CHUNK_SIZE):
+                        for package in parser.feed(chunk):
+                            yield package
+                        if parser.done:
+                            break
+        finally:
+            await response.aclose()
+        for package in parser.close():
+            yield package
+
+
+@asynccontextmanager
+async def _in_thread(context_manager: ContextManager[T]) -> AsyncIterator[T]:
+    """
+    Enters and exits the given context manager in a worker thread, for context managers doing blocking I/O.
+    """
+    value = await asyncio.to_thread(context_manager.__enter__)
+    try:
+        yield value
+    except BaseException as error:
+        if not await asyncio.to_thread(context_manager.__exit__, type(error), error, error.__traceback__):
+            raise
+    else:
+        await asyncio.to_thread(context_manager.__exit__, None, None, None)
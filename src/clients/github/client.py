@@ -1,35 +1,54 @@
+import logging
 import typing
-from typing import Optional
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Type
 
 import requests
+from pydantic import TypeAdapter
 
-from src.clients.github.model import SBOMResponse
+from src.clients.github.model import DependencyChange, Repository, SBOMResponse, SBOMResponseProjection
+from src.clients.request_scheduler import RequestScheduler
+from src.storage.sbom_cache import SbomCache, CachedSbom
+from src.utils.json_stream import iter_json_array_items
 
+GITHUB_API_HOST = "https://api.github.com"
 
-@typing.no_type_check
-def fetch_github_sbom(owner: str, repo: str, token: Optional[str] = None) -> SBOMResponse:
+# Path to the packages array in the SBOM response document.
+SBOM_PACKAGES_PATH = ("sbom", "packages")
+SBOM_STREAM_CHUNK_SIZE = 64 * 1024
+# Maximum page size of GitHub REST API list endpoints.
+GITHUB_PAGE_SIZE = 100
+
+REPOSITORIES_ADAPTER = TypeAdapter(List[Repository])
+DEPENDENCY_CHANGES_ADAPTER = TypeAdapter(List[DependencyChange])
+
+logger = logging.getLogger(__name__)
+
+
+def github_sbom_url(owner: str, repo: str) -> str:
+    """
+    Returns URL of the dependency graph SBOM for a given GitHub repository.
     """
-    Fetches the SBOM for a given GitHub repository and parses it into a Pydantic model.
+    return f"{GITHUB_API_HOST}/repos/{owner}/{repo}/dependency-graph/sbom"
 
-    Args:
-        owner (str): The owner of the repository.
-        repo (str): The repository name.
-        token (Optional[str]): The GitHub personal access token. Default is None.
 
-    Returns:
-        SBOMResponse: The parsed SBOM data as a Pydantic model.
+def github_dependency_graph_compare_url(owner: str, repo: str, base_ref: str, head_ref: str) -> str:
+    """
+    Returns URL of the dependency changes between two revisions of a given GitHub repository.
+    """
+    return f"{GITHUB_API_HOST}/repos/{owner}/{repo}/dependency-graph/compare/{base_ref}...{head_ref}"
 
-    Example curl request:
-        curl -L \\
-          -H "Accept: application/vnd.github+json" \\
-          -H "Authorization: Bearer <YOUR-TOKEN>" \\
-          -H "X-GitHub-Api-Version: 2022-11-28" \\
-          https://api.github.com/repos/OWNER/REPO/dependency-graph/sbom
 
-    More details can be found in GitHub's official documentation:
-    https://docs.github.com/en/rest/dependency-graph/sboms?apiVersion=2022-11-28#export-a-software-bill-of-materials-sbom-for-a-repository
+def github_organization_repositories_url(organization: str) -> str:
+    """
+    Returns URL of the repositories of a given GitHub organization.
+    """
+    return f"{GITHUB_API_HOST}/orgs/{organization}/repos"
+
+
+def github_headers(token: Optional[str] = None) -> dict[str, str]:
+    """
+    Returns headers of a GitHub REST API request, authenticated with the token if given.
     """
-    url = f"https://api.github.com/repos/{owner}/{repo}/dependency-graph/sbom"
     headers = {
         "Accept": "application/vnd.github+json",
         "X-GitHub-Api-Version": "2022-11-28",
@@ -37,11 +56,177 @@ def fetch_github_sbom(owner: str, repo: str, token: Optional[str] = None) -> SBO
 
     if token:
         headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+class GitHubClient:
+    """
+    Client of the GitHub REST API. All requests are made through the given HTTP session, so connections are
+    reused between requests. If SBOM cache is given, SBOM is revalidated with `If-None-Match` request header and
+    the cached document is reused if it is not modified. Requests are paced and retried by the request scheduler.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        sbom_cache: Optional[SbomCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        self._session = session
+        self._sbom_cache = sbom_cache
+        self._scheduler = scheduler or RequestScheduler()
+
+    @typing.no_type_check
+    def fetch_github_sbom(
+        self,
+        owner: str,
+        repo: str,
+        token: Optional[str] = None,
+        response_model: Type[SBOMResponseProjection] = SBOMResponse,
+    ) -> SBOMResponseProjection:
+        """
+        Fetches the SBOM for a given GitHub repository and parses it into a Pydantic model.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The repository name.
+            token (Optional[str]): The GitHub personal access token. Default is None.
+            response_model (Type[SBOMResponseProjection]): The model to parse the SBOM into. Default is the full
+                `SBOMResponse`, pass `SBOMResponseProjection` to validate only the fields used to extract packages.
 
-    response = requests.get(url, headers=headers)
+        Returns:
+            SBOMResponseProjection: The parsed SBOM data as an instance of `response_model`.
 
-    if response.status_code == 200:
-        json = response.json()
-        return SBOMResponse.model_validate(json)
-    else:
+        Example curl request:
+            curl -L \\
+              -H "Accept: application/vnd.github+json" \\
+              -H "Authorization: Bearer <YOUR-TOKEN>" \\
+              -H "X-GitHub-Api-Version: 2022-11-28" \\
+              https://api.github.com/repos/OWNER/REPO/dependency-graph/sbom
+
+        More details can be found in GitHub's official documentation:
+        https://docs.github.com/en/rest/dependency-graph/sboms?apiVersion=2022-11-28#export-a-software-bill-of-materials-sbom-for-a-repository
+        """
+        url = github_sbom_url(owner, repo)
+        headers = github_headers(token)
+        cached_sbom = self._sbom_cache.get(owner, repo) if self._sbom_cache else None
+        if cached_sbom:
+            headers["If-None-Match"] = cached_sbom.etag
+        response = self._scheduler.send(lambda: self._session.get(url, headers=headers))
+
+        if response.status_code == 304 and cached_sbom:
+            logger.info(f"SBOM of '{owner}/{repo}' is not modified. Using cached SBOM.")
+            return response_model.model_validate_json(cached_sbom.body)
+        elif response.status_code == 200:
+            etag = response.headers.get("ETag")
+            if self._sbom_cache and etag:
+                self._sbom_cache.put(owner, repo, CachedSbom(etag=etag, body=response.content))
+            return response_model.model_validate_json(response.content)
+        else:
+            response.raise_for_status()
+
+    def stream_github_sbom_packages(self, owner: str, repo: str, token: Optional[str] = None) -> Iterator[Any]:
+        """
+        Streams packages of the SBOM for a given GitHub repository. The response body is parsed incrementally while
+        it is read, so memory usage does not depend on the SBOM size. Packages are yielded as raw JSON objects
+        without validation. Like `fetch_github_sbom`, cached SBOM is revalidated and reused if it is not modified.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The repository name.
+            token (Optional[str]): The GitHub personal access token. Default is None.
+
+        Returns:
+            Iterator[Any]: SPDX packages of the SBOM as parsed JSON objects.
+        """
+        url = github_sbom_url(owner, repo)
+        headers = github_headers(token)
+        etag = self._sbom_cache.get_etag(owner, repo) if self._sbom_cache else None
+        if etag:
+            headers["If-None-Match"] = etag
+
+        with self._scheduler.send(lambda: self._session.get(url, headers=headers, stream=True)) as response:
+            if response.status_code == 304 and etag and self._sbom_cache:
+                logger.info(f"SBOM of '{owner}/{repo}' is not modified. Using cached SBOM.")
+                chunks = self._sbom_cache.iter_body(owner, repo, SBOM_STREAM_CHUNK_SIZE)
+                yield from iter_json_array_items(chunks, SBOM_PACKAGES_PATH)
+                return
+            response.raise_for_status()
+
+            chunks = response.iter_content(chunk_size=SBOM_STREAM_CHUNK_SIZE)
+            response_etag = response.headers.get("ETag")
+            if not (self._sbom_cache and response_etag):
+                yield from iter_json_array_items(chunks, SBOM_PACKAGES_PATH)
+                return
+
+            with self._sbom_cache.body_writer(owner, repo, response_etag) as body:
+                chunks = _write_through(chunks, body)
+                yield from iter_json_array_items(chunks, SBOM_PACKAGES_PATH)
+                # Parsing stops after the packages, the rest of the document is read to cache it complete.
+                for _ in chunks:
+                    pass
+
+    @typing.no_type_check
+    def fetch_dependency_changes(
+        self, owner: str, repo: str, base_ref: str, head_ref: str, token: Optional[str] = None
+    ) -> List[DependencyChange]:
+        """
+        Fetches dependency changes between two revisions of a given GitHub repository. Unlike the SBOM, which is
+        exported for the default branch only, the changes can be compared between any revisions, for instance
+        between the base and the head of a pull request.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The repository name.
+            base_ref (str): The base revision: a branch, a tag or a commit SHA.
+            head_ref (str): The head revision: a branch, a tag or a commit SHA.
+            token (Optional[str]): The GitHub personal access token. Default is None.
+
+        Returns:
+            List[DependencyChange]: Added and removed dependencies. A changed version is reported as removed
+                dependency of the old version and added dependency of the new version.
+
+        More details can be found in GitHub's official documentation:
+        https://docs.github.com/en/rest/dependency-graph/dependency-review?apiVersion=2022-11-28#get-a-diff-of-the-dependencies-between-commits
+        """
+        url = github_dependency_graph_compare_url(owner, repo, base_ref, head_ref)
+        headers = github_headers(token)
+        response = self._scheduler.send(lambda: self._session.get(url, headers=headers))
         response.raise_for_status()
+        return DEPENDENCY_CHANGES_ADAPTER.validate_json(response.content)
+
+    @typing.no_type_check
+    def list_organization_repositories(self, organization: str, token: Optional[str] = None) -> List[str]:
+        """
+        Lists names of the repositories of a given GitHub organization, following pagination.
+        Archived repositories are skipped, as their dependencies are no longer maintained.
+
+        Args:
+            organization (str): The organization name.
+            token (Optional[str]): The GitHub personal access token. Default is None.
+
+        Returns:
+            List[str]: Names of the organization repositories, without the organization name.
+
+        More details can be found in GitHub's official documentation:
+        https://docs.github.com/en/rest/repos/repos?apiVersion=2022-11-28#list-organization-repositories
+        """
+        url = github_organization_repositories_url(organization)
+        headers = github_headers(token)
+        names: List[str] = []
+        page = 1
+        while True:
+            params = {"type": "all", "per_page": GITHUB_PAGE_SIZE, "page": page}
+            response = self._scheduler.send(lambda: self._session.get(url, headers=headers, params=params))
+            response.raise_for_status()
+            repositories = REPOSITORIES_ADAPTER.validate_json(response.content)
+            names.extend(repository.name for repository in repositories if not repository.archived)
+            if len(repositories) < GITHUB_PAGE_SIZE:
+                return names
+            page += 1
+
+
+def _write_through(chunks: Iterable[bytes], file: BinaryIO) -> Iterator[bytes]:
+    for chunk in chunks:
+        file.write(chunk)
+        yield chunk
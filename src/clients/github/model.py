@@ -1,8 +1,21 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from pydantic import BaseModel
 
 
-class ExternalRef(BaseModel):
+class ExternalRefProjection(BaseModel):
+    """
+    Projection of `ExternalRef` with only the fields used to extract package URLs.
+
+    Attributes:
+        referenceLocator (str): A locator for the external resource (e.g., 'pkg:gem/rails@6.0.1').
+        referenceType (str): The type of reference (e.g., 'purl').
+    """
+
+    referenceLocator: str
+    referenceType: str
+
+
+class ExternalRef(ExternalRefProjection):
     """
     Represents an external reference for a package.
 
@@ -13,11 +26,22 @@ class ExternalRef(BaseModel):
     """
 
     referenceCategory: str
-    referenceLocator: str
-    referenceType: str
 
 
-class Package(BaseModel):
+class PackageProjection(BaseModel):
+    """
+    Projection of `Package` with only the fields used to extract package URLs.
+
+    Attributes:
+        name (str): The name of the package (e.g., 'rubygems:github/github').
+        externalRefs (Optional[Sequence[ExternalRefProjection]]): External references related to the package.
+    """
+
+    name: str
+    externalRefs: Optional[Sequence[ExternalRefProjection]] = None
+
+
+class Package(PackageProjection):
     """
     Represents a package within the SBOM.
 
@@ -35,7 +59,6 @@ class Package(BaseModel):
     """
 
     SPDXID: str
-    name: str
     filesAnalyzed: bool
     versionInfo: Optional[str] = None
     downloadLocation: Optional[str] = None
@@ -59,7 +82,18 @@ class CreationInfo(BaseModel):
     creators: List[str]
 
 
-class SBOM(BaseModel):
+class SBOMProjection(BaseModel):
+    """
+    Projection of `SBOM` with only the fields used to extract package URLs.
+
+    Attributes:
+        packages (Sequence[PackageProjection]): A list of packages included in the SBOM.
+    """
+
+    packages: Sequence[PackageProjection]
+
+
+class SBOM(SBOMProjection):
     """
     Represents the full SBOM document.
 
@@ -85,7 +119,19 @@ class SBOM(BaseModel):
     documentDescribes: List[str] = []
 
 
-class SBOMResponse(BaseModel):
+class SBOMResponseProjection(BaseModel):
+    """
+    Projection of `SBOMResponse` with only the fields used to extract package URLs. Other fields of the response
+    are skipped without validation, which makes parsing of large SBOM documents significantly faster.
+
+    Attributes:
+        sbom (SBOMProjection): The SBOM document.
+    """
+
+    sbom: SBOMProjection
+
+
+class SBOMResponse(SBOMResponseProjection):
     """
     Represents the response from the GitHub SBOM API containing the SBOM.
 
@@ -94,3 +140,36 @@ class SBOMResponse(BaseModel):
     """
 
     sbom: SBOM
+
+
+class DependencyChange(BaseModel):
+    """
+    Represents a change of a dependency between two revisions, as reported by the dependency graph compare API.
+    Only the fields used to find changed packages are parsed.
+
+    Attributes:
+        change_type (str): The type of the change, either 'added' or 'removed'.
+        manifest (str): The manifest the dependency is declared in (e.g., 'pom.xml').
+        name (str): The name of the package (e.g., 'com.example:example-package').
+        version (str): The version of the package (e.g., '1.0.0').
+        package_url (Optional[str]): The package URL of the package, if known (e.g., 'pkg:maven/com.example/example@1.0.0').
+    """
+
+    change_type: str
+    manifest: str
+    name: str
+    version: str
+    package_url: Optional[str] = None
+
+
+class Repository(BaseModel):
+    """
+    Represents a repository listed by the GitHub API. Only the fields used to select repositories to scan are parsed.
+
+    Attributes:
+        name (str): The name of the repository without the owner (e.g., 'github').
+        archived (bool): Whether the repository is archived.
+    """
+
+    name: str
+    archived: bool = False
@@ -0,0 +1,55 @@
+"""
+Module containing the factories of the HTTP sessions shared by the API clients.
+"""
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.arguments.action_arguments import DEFAULT_MAX_CONCURRENCY
+
+# Number of distinct hosts the action talks to: api.github.com and package-maintenance.dev.
+HTTP_POOL_HOSTS = 2
+
+# httpx, unlike requests, times out requests after 5 seconds by default, which is not enough to export SBOM of
+# a large repository.
+ASYNC_HTTP_TIMEOUT_SECONDS = 60.0
+
+
+def create_http_session(pool_maxsize: int = DEFAULT_MAX_CONCURRENCY) -> requests.Session:
+    """
+    Creates HTTP session shared by the API clients. The session keeps connections alive and reuses them across
+    requests, so TCP and TLS handshakes are made once per host rather than once per request.
+
+    :param pool_maxsize: maximum number of connections kept open per host. Requests over this limit wait for
+        a connection to be returned to the pool instead of opening a new one.
+    :return: configured HTTP session. The caller is responsible for closing it.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=pool_maxsize, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+        }
+    )
+    return session
+
+
+def create_async_http_client(max_connections: int = DEFAULT_MAX_CONCURRENCY) -> httpx.AsyncClient:
+    """
+    Creates asynchronous HTTP client shared by the asynchronous API clients. Like `create_http_session`, it keeps
+    connections alive and reuses them across requests.
+
+    :param max_connections: maximum number of connections kept open. Requests over this limit wait for
+        a connection to be returned to the pool instead of opening a new one.
+    :return: configured HTTP client. The caller is responsible for closing it.
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=ASYNC_HTTP_TIMEOUT_SECONDS,
+        headers={"Accept-Encoding": "gzip"},
+    )
@@ -0,0 +1,54 @@
+import logging
+import typing
+from typing import Optional, Type
+
+import httpx
+
+from src.clients.package_maintenance.client import PACKAGES_URL
+from src.clients.package_maintenance.model import PackagesRequest, PackagesResponse, PackagesResponseProjection
+from src.clients.request_scheduler import AsyncRequestScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPackageMaintenanceClient:
+    """
+    Asynchronous client of the package-maintenance.dev API. All requests are made through the given HTTP client, so
+    connections are reused between requests. Requests are paced and retried by the request scheduler.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, scheduler: Optional[AsyncRequestScheduler] = None):
+        self._client = client
+        self._scheduler = scheduler or AsyncRequestScheduler()
+
+    @typing.no_type_check
+    async def fetch_packages(
+        self,
+        payload: PackagesRequest,
+        response_model: Type[PackagesResponseProjection] = PackagesResponse,
+    ) -> PackagesResponseProjection:
+        """
+        Fetches a bulk of binary packages along with corresponding source repositories.
+        See `PackageMaintenanceClient.fetch_packages` for more details.
+
+        Args:
+            payload (PackagesRequestApiModel): The request payload containing a list of packages.
+            response_model (Type[PackagesResponseProjection]): The model to parse the response into. Default is
+                the full `PackagesResponse`, pass `PackagesResponseProjection` to validate only the reported fields.
+
+        Returns:
+            PackagesResponseProjection: The response containing found package and source repository metadata,
+                as an instance of `response_model`.
+
+        Raises:
+            Exception: If the API returns any non success status code.
+        """
+        headers = {"Content-Type": "application/json"}
+        json = payload.model_dump()
+        response = await self._scheduler.send_async(lambda: self._client.post(PACKAGES_URL, json=json, headers=headers))
+
+        if response.status_code == 200:
+            return response_model.model_validate_json(response.content)
+        else:
+            logger.error("Failed to fetch packages. Response body: %s", response.text)
+            response.raise_for_status()
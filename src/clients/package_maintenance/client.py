@@ -1,37 +1,57 @@
 import logging
 import typing
+from typing import Optional, Type
 
 import requests
 
-from src.clients.package_maintenance.model import PackagesRequest, PackagesResponse
+from src.clients.package_maintenance.model import PackagesRequest, PackagesResponse, PackagesResponseProjection
+from src.clients.request_scheduler import RequestScheduler
 
 API_HOST = "https://package-maintenance.dev"
+PACKAGES_URL = f"{API_HOST}/api/v0/packages"
 
 logger = logging.getLogger(__name__)
 
 
-@typing.no_type_check
-def fetch_packages(payload: PackagesRequest) -> PackagesResponse:
+class PackageMaintenanceClient:
     """
-    Fetches a bulk of binary packages along with corresponding source repositories.
-
-    Args:
-        payload (PackagesRequestApiModel): The request payload containing a list of packages.
-
-    Returns:
-        PackagesApiModel: The response containing found package and source repository metadata.
-
-    Raises:
-        Exception: If the API returns any non success status code.
+    Client of the package-maintenance.dev API. All requests are made through the given HTTP session, so
+    connections are reused between requests. The client is safe to use from multiple threads as long as
+    the session connection pool is sized for them. Requests are paced and retried by the request scheduler.
     """
-    url = f"{API_HOST}/api/v0/packages"
-    headers = {"Content-Type": "application/json"}
-    json = payload.model_dump()
-    response = requests.post(url, json=json, headers=headers)
-
-    if response.status_code == 200:
-        json = response.json()
-        return PackagesResponse.model_validate(json)
-    else:
-        logger.error("Failed to fetch packages. Response body: %s", response.text)
-        response.raise_for_status()
+
+    def __init__(self, session: requests.Session, scheduler: Optional[RequestScheduler] = None):
+        self._session = session
+        self._scheduler = scheduler or RequestScheduler()
+
+    @typing.no_type_check
+    def fetch_packages(
+        self,
+        payload: PackagesRequest,
+        response_model: Type[PackagesResponseProjection] = PackagesResponse,
+    ) -> PackagesResponseProjection:
+        """
+        Fetches a bulk of binary packages along with corresponding source repositories.
+
+        Args:
+            payload (PackagesRequestApiModel): The request payload containing a list of packages.
+            response_model (Type[PackagesResponseProjection]): The model to parse the response into. Default is
+                the full `PackagesResponse`, pass `PackagesResponseProjection` to validate only the reported fields.
+
+        Returns:
+            PackagesResponseProjection: The response containing found package and source repository metadata,
+                as an instance of `response_model`.
+
+        Raises:
+            Exception: If the API returns any non success status code.
+        """
+        url = PACKAGES_URL
+        headers = {"Content-Type": "application/json"}
+        json = payload.model_dump()
+        response = self._scheduler.send(lambda: self._session.post(url, json=json, headers=headers))
+
+        if response.status_code == 200:
+            return response_model.model_validate_json(response.content)
+        else:
+            logger.error("Failed to fetch packages. Response body: %s", response.text)
+            response.raise_for_status()
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from pydantic import BaseModel
 
@@ -18,7 +18,26 @@ class MaintenanceMetric(BaseModel):
     score: str
 
 
-class BinaryRepository(BaseModel):
+class BinaryRepositoryProjection(BaseModel):
+    """
+    Projection of `BinaryRepository` with only the fields used to report on package maintenance.
+
+    Attributes:
+        id (str): Unique identifier for the package. Example: 'example-package-id'.
+        type (str): Type of the binary repository. Example: 'maven'.
+        latest_version (str): Latest version of the package. Example: '1.0.0'.
+        url (str): URL to the binary repository. Example: 'https://repo.example.com/package'.
+        release_recency (MaintenanceMetric): Metric representing the recency of the latest release.
+    """
+
+    id: str
+    type: str
+    latest_version: str
+    url: str
+    release_recency: MaintenanceMetric
+
+
+class BinaryRepository(BinaryRepositoryProjection):
     """
     Represents metadata and maintenance metrics for a package published
     in a binary repository, including its versioning, repository URLs, and recency scoring.
@@ -40,21 +59,39 @@ class BinaryRepository(BaseModel):
         release_recency (MaintenanceMetric): Metric representing the recency of the latest release.
     """
 
-    id: str
-    type: str
-    latest_version: str
     latest_version_published_at: str
     name: Optional[str]
     description: Optional[str]
-    url: str
     source_repository_original_url: Optional[str]
     source_repository_normal_url: Optional[str]
     source_repository_id: Optional[str]
     source_repository_type: Optional[str]
-    release_recency: MaintenanceMetric
 
 
-class SourceRepository(BaseModel):
+class SourceRepositoryProjection(BaseModel):
+    """
+    Projection of `SourceRepository` with only the fields used to report on package maintenance.
+
+    Attributes:
+        url (str): URL to the source repository. Example: 'https://github.com/example/repo'.
+        commits_frequency: Optional[MaintenanceMetric]
+        commits_recency: Optional[MaintenanceMetric]
+        issues_lifetime: Optional[MaintenanceMetric]
+        issues_open_percentage: Optional[MaintenanceMetric]
+        pull_requests_lifetime: Optional[MaintenanceMetric]
+        pull_requests_open_percentage: Optional[MaintenanceMetric]
+    """
+
+    url: str
+    commits_frequency: Optional[MaintenanceMetric]
+    commits_recency: Optional[MaintenanceMetric]
+    issues_lifetime: Optional[MaintenanceMetric]
+    issues_open_percentage: Optional[MaintenanceMetric]
+    pull_requests_lifetime: Optional[MaintenanceMetric]
+    pull_requests_open_percentage: Optional[MaintenanceMetric]
+
+
+class SourceRepository(SourceRepositoryProjection):
     """
     Represents metadata and various maintenance metrics for a source code repository,
     including commit activity, issues, and pull request statistics.
@@ -86,7 +123,6 @@ class SourceRepository(BaseModel):
     type: str
     name: str
     description: Optional[str]
-    url: str
     is_archived: bool
     is_disabled: bool
     is_fork: bool
@@ -96,15 +132,23 @@ class SourceRepository(BaseModel):
     archived_at: Optional[str]
     stars_count: int
     languages: str
-    commits_frequency: Optional[MaintenanceMetric]
-    commits_recency: Optional[MaintenanceMetric]
-    issues_lifetime: Optional[MaintenanceMetric]
-    issues_open_percentage: Optional[MaintenanceMetric]
-    pull_requests_lifetime: Optional[MaintenanceMetric]
-    pull_requests_open_percentage: Optional[MaintenanceMetric]
 
 
-class PackageMetadata(BaseModel):
+class PackageMetadataProjection(BaseModel):
+    """
+    Projection of `PackageMetadata` with only the fields used to report on package maintenance. Reports and caches
+    work with projections, so full `PackageMetadata` can be used anywhere a projection is expected.
+
+    Attributes:
+        binary_repository (BinaryRepositoryProjection): Metadata from the corresponding binary repository.
+        source_repository (Optional[SourceRepositoryProjection]): Metadata from the corresponding source repository.
+    """
+
+    binary_repository: BinaryRepositoryProjection
+    source_repository: Optional[SourceRepositoryProjection]
+
+
+class PackageMetadata(PackageMetadataProjection):
     """
     Represents a found package by binary repository ID and type. It might contain metadata about
     published packages from both binary repositories and corresponding source code repositories.
@@ -118,7 +162,19 @@ class PackageMetadata(BaseModel):
     source_repository: Optional[SourceRepository]
 
 
-class PackagesResponse(BaseModel):
+class PackagesResponseProjection(BaseModel):
+    """
+    Projection of `PackagesResponse` with only the fields used to report on package maintenance. Other fields of
+    the response are skipped without validation, which makes parsing of large responses faster.
+
+    Attributes:
+        packages (Sequence[PackageMetadataProjection]): List of found packages.
+    """
+
+    packages: Sequence[PackageMetadataProjection]
+
+
+class PackagesResponse(PackagesResponseProjection):
     """
     Represents the response containing a list of found packages based on the request.
 
@@ -0,0 +1,258 @@
+"""
+Module containing the scheduler of API requests that paces them according to the rate limits announced by the APIs
+and retries failed requests with exponential backoff.
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Mapping, NamedTuple, Optional
+
+import httpx
+import requests
+
+# Statuses of responses that are worth retrying: rate limiting and transient server errors.
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# GitHub API responds with 403 rather than 429 when the rate limit is exceeded.
+RATE_LIMITED_STATUSES = frozenset({403, 429})
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE_SECONDS = 1.0
+DEFAULT_BACKOFF_MAX_SECONDS = 60.0
+# Longest wait for a rate limit to reset. Waiting for longer makes the run slower than failing and re-running it.
+DEFAULT_MAX_THROTTLE_SECONDS = 300.0
+
+logger = logging.getLogger(__name__)
+
+
+class RequestSchedulerStats(NamedTuple):
+    """
+    Counters of the requests sent by a scheduler.
+
+    :param requests: number of requests sent, including retries.
+    :param retries: number of retried requests.
+    :param throttles: number of times a request was delayed because the rate limit was exhausted.
+    :param throttled_seconds: total time requests were delayed because of the rate limit.
+    """
+
+    requests: int
+    retries: int
+    throttles: int
+    throttled_seconds: float
+
+
+class RequestScheduler:
+    """
+    Schedules requests to a single API. Before a request is sent, the scheduler takes a token from the bucket
+    filled with the number of requests remaining in the current rate limit window, as announced by the
+    `X-RateLimit-Remaining` and `X-RateLimit-Reset` response headers. When the bucket is empty, the request waits
+    until the window resets.
+
+    Requests that fail with a retryable status or a connection error are retried, waiting as long as the
+    `Retry-After` header or the rate limit reset requires, or with jittered exponential backoff otherwise.
+    Only the failed request is retried, so a retried group of packages resumes where it failed rather than
+    restarting the run. The scheduler is safe to use from multiple threads.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = DEFAULT_BACKOFF_MAX_SECONDS,
+        max_throttle_seconds: float = DEFAULT_MAX_THROTTLE_SECONDS,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Any] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self._max_retries = max_retries
+        self._backoff_base_seconds = backoff_base_seconds
+        self._backoff_max_seconds = backoff_max_seconds
+        self._max_throttle_seconds = max_throttle_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        # Remaining requests in the current rate limit window and when it resets, None until announced by the API.
+        self._remaining: Optional[int] = None
+        self._reset_at: Optional[float] = None
+        self._requests = 0
+        self._retries = 0
+        self._throttles = 0
+        self._throttled_seconds = 0.0
+
+    @property
+    def stats(self) -> RequestSchedulerStats:
+        """
+        Counters of the requests sent so far.
+        """
+        with self._lock:
+            return RequestSchedulerStats(self._requests, self._retries, self._throttles, self._throttled_seconds)
+
+    def send(self, send_request: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Sends request, pacing and retrying it as needed.
+
+        :param send_request: function sending the request, called once per attempt.
+        :return: response of the last attempt. It is not checked for success, so the caller can handle any status.
+        :raises requests.ConnectionError, requests.Timeout: if the last attempt failed to connect.
+        """
+        attempt = 0
+        while True:
+            delay = self._reserve()
+            if delay > 0:
+                self._record_throttle(delay)
+                self._sleep(delay)
+            try:
+                response = send_request()
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if attempt >= self._max_retries:
+                    raise
+                self._sleep(self._record_retry(self._backoff_delay(attempt), attempt, error))
+                attempt += 1
+                continue
+
+            retry_delay = self._on_response(response.status_code, response.headers, attempt)
+            if retry_delay is None:
+                return response
+            response.close()
+            self._sleep(self._record_retry(retry_delay, attempt, response.status_code))
+            attempt += 1
+
+    def _reserve(self) -> float:
+        """
+        Takes a token for the next request.
+        :return: seconds to wait before sending the request, at most `max_throttle_seconds`.
+        """
+        with self._lock:
+            self._requests += 1
+            now = self._clock()
+            if self._reset_at is not None and now >= self._reset_at:
+                # The window has reset, the new number of remaining requests is unknown until the next response.
+                self._remaining = None
+                self._reset_at = None
+            if self._remaining is None:
+                return 0.0
+            if self._remaining > 0:
+                self._remaining -= 1
+                return 0.0
+            if self._reset_at is None:
+                return 0.0
+            delay = self._reset_at - now
+        if delay > self._max_throttle_seconds:
+            # Same as for rate limited responses, the request is sent anyway and fails rather than waiting that long.
+            logger.warning(f"Rate limit resets in {delay:.0f} seconds, which is too long to wait. Not waiting.")
+            return 0.0
+        return delay
+
+    def _on_response(self, status: int, headers: Mapping[str, str], attempt: int) -> Optional[float]:
+        """
+        Updates the rate limit from the response headers and decides whether to retry the request.
+        :return: seconds to wait before retrying the request, or None if the response is final.
+        """
+        remaining = _parse_int(headers.get("X-RateLimit-Remaining"))
+        reset_at = _parse_int(headers.get("X-RateLimit-Reset"))
+        retry_after = _parse_retry_after(headers.get("Retry-After"), self._clock())
+        with self._lock:
+            if remaining is not None:
+                self._remaining = remaining
+                self._reset_at = float(reset_at) if reset_at is not None else self._reset_at
+
+        rate_limited = status in RATE_LIMITED_STATUSES and (retry_after is not None or remaining == 0)
+        if not rate_limited and status not in RETRYABLE_STATUSES:
+            return None
+        if attempt >= self._max_retries:
+            return None
+
+        if retry_after is not None:
+            delay = retry_after
+        elif remaining == 0 and reset_at is not None:
+            delay = reset_at - self._clock()
+        else:
+            delay = self._backoff_delay(attempt)
+        if delay > self._max_throttle_seconds:
+            logger.warning(f"Rate limit resets in {delay:.0f} seconds, which is too long to wait. Giving up.")
+            return None
+        return max(0.0, delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # "Full jitter" backoff, so that concurrent requests failed at the same time are not retried at the same time.
+        return self._jitter() * min(self._backoff_max_seconds, self._backoff_base_seconds * 2**attempt)
+
+    def _record_throttle(self, delay: float):
+        with self._lock:
+            self._throttles += 1
+            self._throttled_seconds += delay
+        logger.warning(f"Rate limit is exhausted. Waiting {delay:.1f} seconds for it to reset...")
+
+    def _record_retry(self, delay: float, attempt: int, reason: Any) -> float:
+        with self._lock:
+            self._retries += 1
+        logger.warning(f"Request failed ({reason}). Retrying in {delay:.1f} seconds (retry {attempt + 1})...")
+        return delay
+
+
+class AsyncRequestScheduler(RequestScheduler):
+    """
+    Asynchronous counterpart of `RequestScheduler`, waiting without blocking the event loop.
+    See `RequestScheduler` for more details.
+    """
+
+    def __init__(self, *args, sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._async_sleep = sleep
+
+    async def send_async(self, send_request: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Sends request, pacing and retrying it as needed.
+
+        :param send_request: function sending the request, called once per attempt.
+        :return: response of the last attempt. It is not checked for success, so the caller can handle any status.
+        :raises httpx.TransportError: if the last attempt failed to connect.
+        """
+        attempt = 0
+        while True:
+            delay = self._reserve()
+            if delay > 0:
+                self._record_throttle(delay)
+                await self._async_sleep(delay)
+            try:
+                response = await send_request()
+            except httpx.TransportError as error:
+                if attempt >= self._max_retries:
+                    raise
+                await self._async_sleep(self._record_retry(self._backoff_delay(attempt), attempt, error))
+                attempt += 1
+                continue
+
+            retry_delay = self._on_response(response.status_code, response.headers, attempt)
+            if retry_delay is None:
+                return response
+            await response.aclose()
+            await self._async_sleep(self._record_retry(retry_delay, attempt, response.status_code))
+            attempt += 1
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_retry_after(value: Optional[str], now: float) -> Optional[float]:
+    """
+    Parses `Retry-After` header, which is either a number of seconds or an HTTP date.
+    :return: seconds to wait, or None if the header is absent or malformed.
+    """
+    if value is None:
+        return None
+    seconds = _parse_int(value)
+    if seconds is not None:
+        return float(seconds)
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp() - now
+    except (TypeError, ValueError):
+        return None
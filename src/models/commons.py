@@ -1,4 +1,7 @@
-from typing import Optional, Tuple
+import functools
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Tuple, TypeAlias
 
 from packageurl import PackageURL
 
@@ -6,16 +9,101 @@ MAVEN_PACKAGE_TYPE = "maven"
 PYPI_PACKAGE_TYPE = "pypi"
 SUPPORTED_PACKAGE_TYPES = [MAVEN_PACKAGE_TYPE, PYPI_PACKAGE_TYPE]
 
+PACKAGE_URL_SCHEME = "pkg"
+# Number of parsed package URLs kept in the process-wide cache, enough for the largest SBOMs while bounding memory
+# of long-running processes.
+PACKAGE_URL_CACHE_SIZE = 65_536
 
-def package_url_to_repository_id(package_url: PackageURL) -> Optional[Tuple[str, str]]:
+# Tuple type identifying a package in package-maintenance.dev index: binary repository `type` and `id`.
+# For instance, `('maven', 'com.example:example-package')`.
+PackageKey: TypeAlias = Tuple[str, str]
+
+# Runs of characters that are equivalent in Python package names, see PEP 503.
+_PYPI_NAME_SEPARATORS = re.compile(r"[-_.]+")
+
+logger = logging.getLogger(__name__)
+
+
+def package_url_type(locator: str) -> Optional[str]:
+    """
+    Reads the type of package URL string without parsing it, so that package URLs of unsupported types are skipped
+    cheaply. Returns None if the string is not a package URL.
+    For instance, `pkg:maven/com.example/package@1.0` is of type `maven`.
+    """
+    scheme, separator, remainder = locator.partition(":")
+    if not separator or scheme.lower() != PACKAGE_URL_SCHEME:
+        return None
+    # Slashes following the scheme are allowed by the specification.
+    package_type, separator, _ = remainder.lstrip("/").partition("/")
+    return package_type.lower() if separator else None
+
+
+def is_supported_package_url(locator: str) -> bool:
+    """
+    Checks whether package URL string is of a supported type without parsing it.
+    """
+    return package_url_type(locator) in SUPPORTED_PACKAGE_TYPES
+
+
+@functools.lru_cache(maxsize=PACKAGE_URL_CACHE_SIZE)
+def parse_package_url(locator: str) -> PackageURL:
+    """
+    Parses package URL string, caching the result, so that package URLs referenced many times, for instance by
+    several SBOM packages or by SBOMs of several repositories, are parsed once per process. Parsed package URLs are
+    shared, so they must not be modified.
+
+    :param locator: package URL string.
+    :return: parsed package URL.
+    :raises ValueError: if the string is not a valid package URL.
+    """
+    return PackageURL.from_string(locator)
+
+
+def normalize_pypi_name(name: str) -> str:
+    """
+    Normalizes a Python package name according to PEP 503: names are case-insensitive and runs of
+    `-`, `_` and `.` are equivalent. For instance, `Zope.Interface` is normalized to `zope-interface`.
+    """
+    return _PYPI_NAME_SEPARATORS.sub("-", name).lower()
+
+
+def canonical_package_key(package_type: str, package_id: str) -> PackageKey:
     """
-    Converts a PackageURL to a binary repository ID if the package type is supported.
+    Converts binary repository type and id to the canonical package key, so that different spellings of the same
+    package are identified by the same key.
+    """
+    if package_type == PYPI_PACKAGE_TYPE:
+        return package_type, normalize_pypi_name(package_id)
+    return package_type, package_id
+
+
+def package_url_to_repository_id(package_url: PackageURL) -> Optional[PackageKey]:
+    """
+    Converts a PackageURL to a canonical binary repository ID if the package type is supported.
     Returns None if the package type is not supported.
     """
     match package_url.type:
         case package_type if package_type == MAVEN_PACKAGE_TYPE:
             return package_type, f"{package_url.namespace}:{package_url.name}"
         case package_type if package_type == PYPI_PACKAGE_TYPE:
-            return package_type, package_url.name
+            return canonical_package_key(package_type, package_url.name)
         case _:
             return None
+
+
+def group_packages_urls_by_key(packages_urls: Iterable[PackageURL]) -> Dict[PackageKey, List[PackageURL]]:
+    """
+    Groups package URLs by canonical binary repository ID, so that each package is checked only once no matter how
+    many versions or spellings of it are referenced. Package URLs of unsupported types are skipped.
+
+    :param packages_urls: package URLs to group.
+    :return: originating package URLs of each unique key, in the order keys are first referenced.
+    """
+    packages_urls_by_key: Dict[PackageKey, List[PackageURL]] = {}
+    for package_url in packages_urls:
+        key = package_url_to_repository_id(package_url)
+        if key is None:
+            logger.info(f"Package '{package_url}' has an unsupported type '{package_url.type}'. Skipping...")
+            continue
+        packages_urls_by_key.setdefault(key, []).append(package_url)
+    return packages_urls_by_key
@@ -0,0 +1,113 @@
+"""
+Module containing the compact in-memory representation of packages maintenance metadata. API responses are parsed
+into pydantic models, which are converted into these records at the report boundary, so that results of many
+packages across many repositories are held in a fraction of the memory.
+"""
+
+import functools
+import sys
+from typing import NamedTuple, Optional, Union
+
+from src.clients.package_maintenance.model import MaintenanceMetric, PackageMetadataProjection
+
+
+class CompactMetric(NamedTuple):
+    """
+    Maintenance metric: the absolute value and the score from A to D. Equal metrics are shared, see `compact_metric`.
+    """
+
+    value: int
+    score: str
+
+
+class CompactBinaryRepository(NamedTuple):
+    """
+    Binary repository fields used by reports, see `BinaryRepositoryProjection`.
+    """
+
+    id: str
+    type: str
+    latest_version: str
+    url: str
+    release_recency: Optional[CompactMetric]
+
+
+class CompactSourceRepository(NamedTuple):
+    """
+    Source repository fields used by reports, see `SourceRepositoryProjection`.
+    """
+
+    url: str
+    commits_frequency: Optional[CompactMetric]
+    commits_recency: Optional[CompactMetric]
+    issues_lifetime: Optional[CompactMetric]
+    issues_open_percentage: Optional[CompactMetric]
+    pull_requests_lifetime: Optional[CompactMetric]
+    pull_requests_open_percentage: Optional[CompactMetric]
+
+
+class CompactPackageMetadata(NamedTuple):
+    """
+    Package maintenance metadata used by reports, see `PackageMetadataProjection`. Fields are named after
+    the pydantic models, so both are read the same way.
+    """
+
+    binary_repository: CompactBinaryRepository
+    source_repository: Optional[CompactSourceRepository]
+
+
+# Package maintenance metadata and metrics either as parsed from the API response or as held by reports.
+PackageMetadataRecord = Union[PackageMetadataProjection, CompactPackageMetadata]
+MetricRecord = Union[MaintenanceMetric, CompactMetric]
+
+# Number of distinct metrics shared by all packages. Metrics take a few distinct values, e.g. months since the latest
+# release, so most metrics are shared, while the memory of long-running processes stays bounded.
+METRICS_CACHE_SIZE = 4096
+
+
+def compact_metric(metric: Optional[MetricRecord]) -> Optional[CompactMetric]:
+    """
+    Returns the shared compact metric equal to the given metric.
+    """
+    if metric is None:
+        return None
+    return _shared_metric(metric.value, metric.score)
+
+
+@functools.lru_cache(maxsize=METRICS_CACHE_SIZE)
+def _shared_metric(value: int, score: str) -> CompactMetric:
+    return CompactMetric(value, sys.intern(score))
+
+
+def compact_package_metadata(package: PackageMetadataRecord) -> CompactPackageMetadata:
+    """
+    Converts package maintenance metadata into the compact record. Already compact records are returned as is.
+    Repeated strings, like the package type, are interned.
+    """
+    if isinstance(package, CompactPackageMetadata):
+        return package
+
+    binary_repository = package.binary_repository
+    source_repository = package.source_repository
+    return CompactPackageMetadata(
+        binary_repository=CompactBinaryRepository(
+            id=binary_repository.id,
+            type=sys.intern(binary_repository.type),
+            latest_version=binary_repository.latest_version,
+            url=binary_repository.url,
+            release_recency=compact_metric(binary_repository.release_recency),
+        ),
+        source_repository=(
+            CompactSourceRepository(
+                url=source_repository.url,
+                commits_frequency=compact_metric(source_repository.commits_frequency),
+                commits_recency=compact_metric(source_repository.commits_recency),
+                issues_lifetime=compact_metric(source_repository.issues_lifetime),
+                issues_open_percentage=compact_metric(source_repository.issues_open_percentage),
+                pull_requests_lifetime=compact_metric(source_repository.pull_requests_lifetime),
+                pull_requests_open_percentage=compact_metric(source_repository.pull_requests_open_percentage),
+            )
+            if source_repository
+            else None
+        ),
+    )
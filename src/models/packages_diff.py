@@ -0,0 +1,71 @@
+from typing import List, Set
+
+from packageurl import PackageURL
+
+from src.models.commons import PackageKey, package_url_to_repository_id
+
+
+class PackagesDiff:
+    """
+    Represents dependency changes between two revisions of a repository, for instance between the base and the head
+    of a pull request. Packages are matched by key, so that a package both removed and added in another version is
+    reported as updated rather than as removed and added.
+
+    Only new and updated packages are checked for maintenance scores, since the rest of the dependencies are
+    already checked on the base revision.
+    """
+
+    def __init__(
+        self,
+        base_ref: str,
+        head_ref: str,
+        added_packages_urls: List[PackageURL],
+        removed_packages_urls: List[PackageURL],
+    ):
+        self._base_ref = base_ref
+        self._head_ref = head_ref
+        self._added_packages_urls = added_packages_urls
+        self._removed_packages_urls = removed_packages_urls
+        self._added_keys = _packages_keys(added_packages_urls)
+        self._removed_keys = _packages_keys(removed_packages_urls)
+
+    def base_ref(self) -> str:
+        """
+        Returns the revision the dependencies are compared against.
+        """
+        return self._base_ref
+
+    def head_ref(self) -> str:
+        """
+        Returns the revision the dependencies are compared to the base revision.
+        """
+        return self._head_ref
+
+    def packages_urls_to_check(self) -> List[PackageURL]:
+        """
+        Returns package URLs of new and updated packages, which are to be checked for maintenance scores.
+        """
+        return self._added_packages_urls
+
+    def new_packages_urls(self) -> List[PackageURL]:
+        """
+        Returns package URLs of packages the base revision does not depend on.
+        """
+        return [url for url in self._added_packages_urls if package_url_to_repository_id(url) not in self._removed_keys]
+
+    def updated_packages_urls(self) -> List[PackageURL]:
+        """
+        Returns package URLs of packages the base revision depends on in other versions.
+        """
+        return [url for url in self._added_packages_urls if package_url_to_repository_id(url) in self._removed_keys]
+
+    def removed_packages_urls(self) -> List[PackageURL]:
+        """
+        Returns package URLs of packages the head revision does not depend on anymore.
+        """
+        return [url for url in self._removed_packages_urls if package_url_to_repository_id(url) not in self._added_keys]
+
+
+def _packages_keys(packages_urls: List[PackageURL]) -> Set[PackageKey]:
+    keys = (package_url_to_repository_id(package_url) for package_url in packages_urls)
+    return {key for key in keys if key is not None}
@@ -1,26 +1,118 @@
-from typing import Set, FrozenSet, Tuple, TypeAlias
+from typing import Dict, Generic, Iterator, List, Optional, TypeVar
 
 from packageurl import PackageURL
 
 from src.arguments.action_arguments import ActionArguments
 
-# Tuple type representing package to ignore fo checking: `type`, `namespace` and `name`.
-# The former two have supports dedicated asterisk symbol `*` that is considered as 'ignore all'.
-# For instance, tuple `('maven', 'com.example', '*')` will be treated as ignore all packages for type 'maven' and
-# namespace 'com.example'.
-PackageIgnore: TypeAlias = Tuple[str, str, str]
-
+# Asterisk symbol `*` at the end of the namespace or the name of a package to ignore is treated as a prefix glob,
+# and on its own as 'ignore all'. For instance, `pkg:maven/com.example.*/*` ignores all packages of type 'maven'
+# within namespaces starting with 'com.example.', and `pkg:pypi/example-*` all 'pypi' packages starting with 'example-'.
 ASTERISK = "*"
 
+T = TypeVar("T")
+
+
+class _PrefixTrieNode(Generic[T]):
+    __slots__ = ("children", "value")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_PrefixTrieNode[T]"] = {}
+        self.value: Optional[T] = None
+
+
+class _PrefixTrie(Generic[T]):
+    """
+    Character trie of values by prefix. Values of all prefixes of a text are found in time linear in the length of
+    the text, regardless of the number of prefixes.
+    """
+
+    def __init__(self) -> None:
+        self._root: _PrefixTrieNode[T] = _PrefixTrieNode()
+
+    def set_default(self, prefix: str, value: T) -> T:
+        """
+        Returns value of the prefix, setting it to the given value if the prefix has no value yet.
+        """
+        node = self._root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _PrefixTrieNode()
+            node = child
+        if node.value is None:
+            node.value = value
+        return node.value
+
+    def prefixes_values(self, text: str) -> Iterator[T]:
+        """
+        Yields values of all prefixes of the text, from the shortest to the longest one.
+        """
+        node = self._root
+        for char in text:
+            if node.value is not None:
+                yield node.value
+            child = node.children.get(char)
+            if child is None:
+                return
+            node = child
+        if node.value is not None:
+            yield node.value
+
+
+class _NamesPatterns:
+    """
+    Names to ignore within a type and a namespace: exact names and name prefixes.
+    """
+
+    def __init__(self) -> None:
+        self._names: set[str] = set()
+        self._prefixes: _PrefixTrie[bool] = _PrefixTrie()
+
+    def add(self, name: str) -> None:
+        if name.endswith(ASTERISK):
+            self._prefixes.set_default(name[: -len(ASTERISK)], True)
+        else:
+            self._names.add(name)
+
+    def matches(self, name: str) -> bool:
+        return name in self._names or next(self._prefixes.prefixes_values(name), False)
+
+
+class _TypePatterns:
+    """
+    Packages to ignore within a type, indexed by exact namespaces and by namespace prefixes.
+    """
+
+    def __init__(self) -> None:
+        self._namespaces: Dict[str, _NamesPatterns] = {}
+        self._namespaces_prefixes: _PrefixTrie[_NamesPatterns] = _PrefixTrie()
+
+    def add(self, namespace: str, name: str) -> None:
+        if namespace.endswith(ASTERISK):
+            names = self._namespaces_prefixes.set_default(namespace[: -len(ASTERISK)], _NamesPatterns())
+        else:
+            names = self._namespaces.setdefault(namespace, _NamesPatterns())
+        names.add(name)
+
+    def matches(self, namespace: str, name: str) -> bool:
+        names = self._namespaces.get(namespace)
+        if names is not None and names.matches(name):
+            return True
+        return any(prefix_names.matches(name) for prefix_names in self._namespaces_prefixes.prefixes_values(namespace))
+
 
 class PackagesIgnoreFilter:
     """
     Creates filter implementation to filter out packages for maintenance check based on
     `packages_ignore` action argument. Packages to ignore are identified as package URL, but only
-    `type`, `name` and `namespace` are taken into account. `name` and `namespace` might have asterisk (`*`) value
-    this is treated as 'ignore all'.
-    For instance, tuple `('maven', 'com.example', '*')` will be treated as ignore all packages for type 'maven' and
-    namespace 'com.example'.
+    `type`, `name` and `namespace` are taken into account. `name` and `namespace` might end with asterisk (`*`)
+    that is treated as a prefix glob, and asterisk on its own as 'ignore all'. Package URL without namespace
+    ignores packages of any namespace.
+    For instance, `pkg:maven/com.example/*` will be treated as ignore all packages for type 'maven' and
+    namespace 'com.example', and `pkg:maven/com.example.*/*` as ignore all packages within its sub-namespaces.
+
+    Packages to ignore are indexed by type, and by namespace and name prefixes in tries, so the cost of a check
+    depends on the length of the package namespace and name rather than on the number of packages to ignore.
     """
 
     @staticmethod
@@ -31,19 +123,19 @@ class PackagesIgnoreFilter:
         :param arguments: action arguments to supplied to the action.
         :return: constructed filter.
         """
-        ignore: Set[PackageIgnore] = set()
-        if arguments.packages_ignore is not None:
-            for package in arguments.packages_ignore:
-                package_ignore: PackageIgnore = (
-                    package.type,
-                    package.namespace or ASTERISK,
-                    package.name,
-                )
-                ignore.add(package_ignore)
-        return PackagesIgnoreFilter(frozenset(ignore))
+        return PackagesIgnoreFilter(arguments.packages_ignore or [])
 
-    def __init__(self, ignore: FrozenSet[PackageIgnore]):
-        self._ignore = ignore
+    def __init__(self, packages_ignore: List[PackageURL]):
+        self._patterns_by_type: Dict[str, _TypePatterns] = {}
+        for package in packages_ignore:
+            namespace = package.namespace or ASTERISK
+            for value in (namespace, package.name):
+                if ASTERISK in value[: -len(ASTERISK)]:
+                    raise ValueError(
+                        f"Invalid package to ignore: {package.to_string()}. "
+                        f"Asterisk is supported only at the end of the namespace and the name."
+                    )
+            self._patterns_by_type.setdefault(package.type, _TypePatterns()).add(namespace, package.name)
 
     def ignore(self, purl: PackageURL) -> bool:
         """
@@ -52,11 +144,7 @@ class PackagesIgnoreFilter:
         :param purl: package URL to check
         :return: True if to ignore package, False if to check
         """
-        ignore_all_type_item = (purl.type, ASTERISK, ASTERISK)
-        ignore_all_namespaces_item = (purl.type, purl.namespace, ASTERISK)
-        ignore_all_names_item = (purl.type, purl.namespace, purl.name)
-        return (
-            (ignore_all_type_item in self._ignore)
-            | (ignore_all_namespaces_item in self._ignore)
-            | (ignore_all_names_item in self._ignore)
-        )
+        patterns = self._patterns_by_type.get(purl.type)
+        if patterns is None:
+            return False
+        return patterns.matches(purl.namespace or "", purl.name)
@@ -1,25 +1,25 @@
-from typing import List, Set, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Set
 
 from packageurl import PackageURL
 
 from src.models.packages_maintenance_report_row import PackagesMaintenanceReportRow
-from src.arguments.action_arguments import (
-    MaintenanceMetricSlug,
-    MaintenanceMetricScore,
-    ActionArguments,
-)
-from src.clients.package_maintenance.model import PackageMetadata, MaintenanceMetric
-from src.models.commons import package_url_to_repository_id
+from src.arguments.action_arguments import MaintenanceMetricSlug, ActionArguments
+from src.models.compact_package_metadata import CompactPackageMetadata, PackageMetadataRecord, compact_package_metadata
+from src.models.commons import PackageKey, canonical_package_key, group_packages_urls_by_key
+from src.models.threshold_evaluator import ThresholdEvaluator
 
 
 class PackagesMaintenanceReport:
     @staticmethod
     def create(
         packages: List[PackageURL],
-        packages_maintenance: List[PackageMetadata],
+        packages_maintenance: Sequence[PackageMetadataRecord],
         action_arguments: ActionArguments,
+        threshold_evaluator: Optional[ThresholdEvaluator] = None,
     ) -> "PackagesMaintenanceReport":
-        return PackagesMaintenanceReport(packages, packages_maintenance, action_arguments.packages_scores_thresholds)
+        return PackagesMaintenanceReport(
+            packages, packages_maintenance, threshold_evaluator or ThresholdEvaluator.create(action_arguments)
+        )
 
     """
     Represents a report based on a repository packages (fetched from dependency graph GitHub API) and
@@ -33,83 +33,98 @@ class PackagesMaintenanceReport:
     def __init__(
         self,
         packages: List["PackageURL"],
-        packages_maintenance: List[PackageMetadata],
-        packages_scores_thresholds: dict[MaintenanceMetricSlug, MaintenanceMetricScore],
+        packages_maintenance: Sequence[PackageMetadataRecord],
+        threshold_evaluator: ThresholdEvaluator,
     ):
         self._packages = packages
-        self._packages_maintenance = packages_maintenance
-        self._packages_scores_thresholds = packages_scores_thresholds
+        self._threshold_evaluator = threshold_evaluator
+        # Metadata is held as compact records only, pydantic models parsed from the API are not referenced anymore.
+        compact_packages_maintenance = [compact_package_metadata(package) for package in packages_maintenance]
+
+        # The report is indexed by package key once, so that accessors are views over the index, and the report can
+        # be queried repeatedly, e.g. by rendering, export and gating, at no extra cost.
+        self._packages_urls_by_key: Dict[PackageKey, List[PackageURL]] = group_packages_urls_by_key(packages)
+        self._keys_by_package_url: Dict[PackageURL, PackageKey] = {
+            package_url: key
+            for key, packages_urls in self._packages_urls_by_key.items()
+            for package_url in packages_urls
+        }
+        self._rows_by_key: Dict[PackageKey, PackagesMaintenanceReportRow] = {}
+        self._rows: List[PackagesMaintenanceReportRow] = []
+        packages_below_threshold_metrics = threshold_evaluator.below_threshold_metrics_batch(
+            compact_packages_maintenance
+        )
+        for package, below_threshold_metrics in zip(compact_packages_maintenance, packages_below_threshold_metrics):
+            row = self._create_row(package, below_threshold_metrics)
+            self._rows.append(row)
+            self._rows_by_key[self._package_key(package)] = row
+        self._below_threshold_rows = [row for row in self._rows if row.is_maintenance_below_threshold()]
+        self._missing_data_packages_by_key: Dict[PackageKey, List[PackageURL]] = {
+            key: packages_urls
+            for key, packages_urls in self._packages_urls_by_key.items()
+            if key not in self._rows_by_key
+        }
+        self._missing_data_packages: Set[PackageURL] = {
+            package_url
+            for packages_urls in self._missing_data_packages_by_key.values()
+            for package_url in packages_urls
+        }
 
     def missing_data_packages(self) -> Set["PackageURL"]:
         """
         Returns a list of packages that are missing maintenance data in the package-maintenance.dev index.
         """
-        packages_maintenance_ids: Set[Tuple[str, str]] = set()
-        for package_maintenance in self._packages_maintenance:
-            packages_maintenance_ids.add(
-                (
-                    package_maintenance.binary_repository.type,
-                    package_maintenance.binary_repository.id,
-                )
-            )
-
-        missing_data_packages = set()
-        for package_url in self._packages:
-            binary_repository_type_id = package_url_to_repository_id(package_url)
-            if binary_repository_type_id:
-                binary_repository_type, binary_repository_id = binary_repository_type_id
-                package_id = (
-                    binary_repository_type,
-                    binary_repository_id,
-                )
-                if package_id not in packages_maintenance_ids:
-                    missing_data_packages.add(package_url)
-        return missing_data_packages
+        return self._missing_data_packages
+
+    def missing_data_packages_by_key(self) -> Dict[PackageKey, List["PackageURL"]]:
+        """
+        Returns originating package URLs of each package missing in the package-maintenance.dev index, in the order
+        packages are first referenced.
+        """
+        return self._missing_data_packages_by_key
 
     def found_packages(self) -> List[PackagesMaintenanceReportRow]:
         """
         Returns a list of all packages that including the information about the metrics that are below the threshold.
         """
-        found_packages = [self._create_row(package) for package in self._packages_maintenance]
-        return found_packages
-
-    def _create_row(self, package: PackageMetadata) -> PackagesMaintenanceReportRow:
-        below_threshold_metrics = self._get_below_threshold_metrics(package)
-        return PackagesMaintenanceReportRow(package=package, below_threshold_metrics=below_threshold_metrics)
-
-    def _get_below_threshold_metrics(self, package: PackageMetadata) -> Set[MaintenanceMetricSlug]:
-        below_threshold_metrics: Set[MaintenanceMetricSlug] = set()
-        for threshold in self._packages_scores_thresholds.items():
-            threshold_metric, threshold_score = threshold
-            package_metric = self._get_package_metric(package, threshold_metric)
-            if package_metric is None:
-                continue
-            # Check if the metric value is below the threshold. Because score is in range from A to D
-            # the direct alphabetical comparison is not applicable, and we need to reverse it.
-            metric_value_below_threshold = threshold_score.value < package_metric.score
-
-            if metric_value_below_threshold:
-                below_threshold_metrics.add(threshold_metric)
-        return below_threshold_metrics
-
-    def _get_package_metric(
-        self, package: PackageMetadata, metric: MaintenanceMetricSlug
-    ) -> Optional[MaintenanceMetric]:
-        source_repository = package.source_repository
-        match metric:
-            case MaintenanceMetricSlug.binary_release_recency:
-                return package.binary_repository.release_recency
-            case MaintenanceMetricSlug.source_commit_frequency:
-                return source_repository.commits_frequency if source_repository else None
-            case MaintenanceMetricSlug.source_commit_recency:
-                return source_repository.commits_recency if source_repository else None
-            case MaintenanceMetricSlug.issues_lifetime:
-                return source_repository.issues_lifetime if source_repository else None
-            case MaintenanceMetricSlug.issues_open_percentage:
-                return source_repository.issues_open_percentage if source_repository else None
-            case MaintenanceMetricSlug.pull_requests_lifetime:
-                return source_repository.pull_requests_lifetime if source_repository else None
-            case MaintenanceMetricSlug.pull_requests_open_percentage:
-                return source_repository.pull_requests_open_percentage if source_repository else None
-            case _:
-                return None
+        return self._rows
+
+    def below_threshold_packages(self) -> List[PackagesMaintenanceReportRow]:
+        """
+        Returns a list of found packages with any metric below the threshold.
+        """
+        return self._below_threshold_rows
+
+    def package_key(self, package_url: "PackageURL") -> Optional[PackageKey]:
+        """
+        Returns the key of the given package URL of the report, or None if the package URL is not in the report or
+        its type is not supported.
+        """
+        return self._keys_by_package_url.get(package_url)
+
+    def package_row(self, key: PackageKey) -> Optional[PackagesMaintenanceReportRow]:
+        """
+        Returns the report row of the package with the given key, or None if the package is not found in the index.
+        """
+        return self._rows_by_key.get(key)
+
+    def below_threshold_metrics(self, key: PackageKey) -> Set[MaintenanceMetricSlug]:
+        """
+        Returns metrics below the threshold of the package with the given key, empty if the package is not found.
+        """
+        row = self._rows_by_key.get(key)
+        return row.below_threshold_metrics if row else set()
+
+    def _create_row(
+        self, package: CompactPackageMetadata, below_threshold_metrics: Set[MaintenanceMetricSlug]
+    ) -> PackagesMaintenanceReportRow:
+        packages_urls = self._packages_urls_by_key.get(self._package_key(package), [])
+        return PackagesMaintenanceReportRow(
+            package=package,
+            below_threshold_metrics=below_threshold_metrics,
+            packages_urls=packages_urls,
+        )
+
+    @staticmethod
+    def _package_key(package: CompactPackageMetadata) -> PackageKey:
+        return canonical_package_key(package.binary_repository.type, package.binary_repository.id)
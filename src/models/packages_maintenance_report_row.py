@@ -1,20 +1,22 @@
-from typing import Set
+from typing import List, NamedTuple, Set
 
-from pydantic import BaseModel
+from packageurl import PackageURL
 
 from src.arguments.action_arguments import MaintenanceMetricSlug
-from src.clients.package_maintenance.model import PackageMetadata
+from src.models.compact_package_metadata import CompactPackageMetadata
 
 
-class PackagesMaintenanceReportRow(BaseModel):
+class PackagesMaintenanceReportRow(NamedTuple):
     """
     Represents a row in the maintenance report.
-    :param package: PackageMetadata - package metadata.
+    :param package: CompactPackageMetadata - package metadata.
     :param below_threshold_metrics: List[MaintenanceMetricSlug] - list of metrics that are below the threshold.
+    :param packages_urls: List[PackageURL] - originating package URLs of the package, e.g. all referenced versions.
     """
 
-    package: PackageMetadata
+    package: CompactPackageMetadata
     below_threshold_metrics: Set[MaintenanceMetricSlug]
+    packages_urls: List["PackageURL"] = []
 
     def is_maintenance_below_threshold(self) -> bool:
         """
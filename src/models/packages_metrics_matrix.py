@@ -0,0 +1,139 @@
+"""
+Module containing the columnar representation of packages maintenance metrics for fleet-wide analytics.
+It requires NumPy, which is an optional dependency: install it with `pip install .[analytics]`.
+"""
+
+from typing import Iterable, List, Mapping, Sequence, Union
+
+from src.arguments.action_arguments import MaintenanceMetricScore, MaintenanceMetricSlug
+from src.clients.package_maintenance.model import PackageMetadataProjection, PackagesResponseProjection
+from src.models.commons import PackageKey, canonical_package_key
+from src.models.threshold_evaluator import METRIC_ACCESSORS, SCORE_ORDINALS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Columns of the metrics matrix, in the order of the metrics slugs.
+METRICS: List[MaintenanceMetricSlug] = list(MaintenanceMetricSlug)
+# Score ordinal of missing metrics and metrics with unknown scores, which are never below a threshold.
+MISSING_SCORE_ORDINAL = -1
+
+Thresholds = Mapping[MaintenanceMetricSlug, Union[MaintenanceMetricScore, str]]
+
+
+class PackagesMetricsMatrix:
+    """
+    Represents maintenance metrics of many packages as columns rather than objects: parallel package keys and
+    packages × metrics matrices of values and score ordinals, along with the mask of present metrics. Metrics are
+    extracted from the metadata objects once, so threshold checks, distributions and what-if queries over thousands
+    of packages run vectorized instead of walking the objects.
+
+    Columns are ordered as `METRICS`. Values of missing metrics are NaN and their score ordinals are
+    `MISSING_SCORE_ORDINAL`.
+    """
+
+    @staticmethod
+    def create(packages: Iterable[PackageMetadataProjection]) -> "PackagesMetricsMatrix":
+        """
+        Create new metrics matrix from packages maintenance metadata
+
+        :param packages: packages maintenance metadata, e.g. of all packages of an organization.
+        :return: constructed metrics matrix.
+        :raises ImportError: if NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError(
+                "NumPy is required for the packages metrics matrix. Install it with `pip install .[analytics]`."
+            )
+
+        keys: List[PackageKey] = []
+        values: List[List[float]] = []
+        scores: List[List[int]] = []
+        accessors = [METRIC_ACCESSORS[metric] for metric in METRICS]
+        for package in packages:
+            binary_repository = package.binary_repository
+            keys.append(canonical_package_key(binary_repository.type, binary_repository.id))
+            package_values: List[float] = []
+            package_scores: List[int] = []
+            for accessor in accessors:
+                metric = accessor(package)
+                if metric is None:
+                    package_values.append(float("nan"))
+                    package_scores.append(MISSING_SCORE_ORDINAL)
+                else:
+                    package_values.append(metric.value)
+                    package_scores.append(SCORE_ORDINALS.get(metric.score, MISSING_SCORE_ORDINAL))
+            values.append(package_values)
+            scores.append(package_scores)
+
+        shape = (len(keys), len(METRICS))
+        return PackagesMetricsMatrix(
+            keys=keys,
+            values=np.array(values, dtype=np.float64).reshape(shape),
+            scores=np.array(scores, dtype=np.int8).reshape(shape),
+        )
+
+    @staticmethod
+    def from_response(response: PackagesResponseProjection) -> "PackagesMetricsMatrix":
+        """
+        Create new metrics matrix from a package-maintenance.dev API response.
+        """
+        return PackagesMetricsMatrix.create(response.packages)
+
+    def __init__(self, keys: List[PackageKey], values, scores):
+        self.keys = keys
+        self.values = values
+        self.scores = scores
+        self.mask = scores != MISSING_SCORE_ORDINAL
+
+    def below_threshold(self, thresholds: Thresholds):
+        """
+        Returns packages × metrics boolean matrix of metrics below the threshold. Metrics without a threshold, missing
+        metrics and metrics with unknown scores are never below the threshold.
+        """
+        threshold_ordinals = np.full(len(METRICS), len(SCORE_ORDINALS), dtype=np.int8)
+        for metric, score in thresholds.items():
+            threshold_ordinals[METRICS.index(metric)] = SCORE_ORDINALS[MaintenanceMetricScore(score).value]
+        return self.scores > threshold_ordinals
+
+    def below_threshold_count(self, thresholds: Thresholds) -> int:
+        """
+        Returns number of packages with any metric below the threshold.
+        """
+        return int(self.below_threshold(thresholds).any(axis=1).sum())
+
+    def below_threshold_count_if(
+        self, thresholds: Thresholds, metric: MaintenanceMetricSlug, score: Union[MaintenanceMetricScore, str]
+    ) -> int:
+        """
+        Returns number of packages with any metric below the threshold if the threshold of the given metric were
+        changed to the given score, e.g. how many packages fail if the release recency threshold is tightened to A.
+        """
+        return self.below_threshold_count({**thresholds, metric: score})
+
+    def hit_rates(self, thresholds: Thresholds) -> Mapping[MaintenanceMetricSlug, float]:
+        """
+        Returns share of packages below the threshold of each metric with a threshold, among packages having the
+        metric. The share is NaN if no package has the metric.
+        """
+        below_threshold = self.below_threshold(thresholds)
+        rates = {}
+        for metric in thresholds:
+            column = METRICS.index(metric)
+            present_count = int(self.mask[:, column].sum())
+            below_count = int(below_threshold[:, column].sum())
+            rates[metric] = below_count / present_count if present_count else float("nan")
+        return rates
+
+    def percentiles(self, metric: MaintenanceMetricSlug, percentiles: Sequence[float]) -> List[float]:
+        """
+        Returns the given percentiles (from 0 to 100) of the metric values, ignoring missing metrics.
+        The percentiles are NaN if no package has the metric.
+        """
+        column = self.values[:, METRICS.index(metric)]
+        present = column[~np.isnan(column)]
+        if present.size == 0:
+            return [float("nan")] * len(percentiles)
+        return [float(value) for value in np.percentile(present, percentiles)]
@@ -0,0 +1,107 @@
+from typing import Dict, List, NamedTuple, Set
+
+from pydantic import BaseModel
+
+from src.arguments.action_arguments import MaintenanceMetricSlug
+from src.models.compact_package_metadata import CompactPackageMetadata
+from src.models.commons import PackageKey, canonical_package_key
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+
+
+class RepositoryMaintenanceSummary(BaseModel):
+    """
+    Represents a row of the repositories rollup: the maintenance status of a single repository at a glance.
+    :param repository: str - repository in the form of owner/repo.
+    :param packages_count: int - number of unique packages checked in the repository.
+    :param below_threshold_count: int - number of packages with any metric below the threshold.
+    :param missing_data_count: int - number of packages missing in the package-maintenance.dev index.
+    """
+
+    repository: str
+    packages_count: int
+    below_threshold_count: int
+    missing_data_count: int
+
+
+class BelowThresholdPackageUsage(NamedTuple):
+    """
+    Represents a package below the maintenance threshold along with the repositories that depend on it.
+    :param package: CompactPackageMetadata - package metadata.
+    :param below_threshold_metrics: Set[MaintenanceMetricSlug] - metrics that are below the threshold.
+    :param repositories: List[str] - repositories depending on the package, in the form of owner/repo.
+    """
+
+    package: CompactPackageMetadata
+    below_threshold_metrics: Set[MaintenanceMetricSlug]
+    repositories: List[str]
+
+
+class RepositoriesMaintenanceReport:
+    """
+    Represents a rollup of the maintenance reports of several repositories, for instance of all repositories of
+    an organization.
+
+    This report provides following information:
+    - Maintenance report of each repository.
+    - Summary of each repository: number of packages, packages below the threshold and packages missing data.
+    - Packages below the threshold across all repositories, ordered by the number of repositories depending on them.
+    - Repositories that failed to be scanned, along with the error.
+    """
+
+    def __init__(
+        self,
+        repositories_reports: Dict[str, PackagesMaintenanceReport],
+        failed_repositories: Dict[str, str],
+    ):
+        self._repositories_reports = repositories_reports
+        self._failed_repositories = failed_repositories
+
+    def repositories_reports(self) -> Dict[str, PackagesMaintenanceReport]:
+        """
+        Returns maintenance report of each scanned repository.
+        """
+        return self._repositories_reports
+
+    def failed_repositories(self) -> Dict[str, str]:
+        """
+        Returns error message of each repository that failed to be scanned.
+        """
+        return self._failed_repositories
+
+    def repositories_summaries(self) -> List[RepositoryMaintenanceSummary]:
+        """
+        Returns summary of each scanned repository.
+        """
+        summaries = []
+        for repository, report in self._repositories_reports.items():
+            # Packages are counted by key, so that several referenced versions of a package are counted once.
+            missing_data_count = len(report.missing_data_packages_by_key())
+            summaries.append(
+                RepositoryMaintenanceSummary(
+                    repository=repository,
+                    packages_count=len(report.found_packages()) + missing_data_count,
+                    below_threshold_count=len(report.below_threshold_packages()),
+                    missing_data_count=missing_data_count,
+                )
+            )
+        return summaries
+
+    def below_threshold_packages(self) -> List[BelowThresholdPackageUsage]:
+        """
+        Returns packages below the threshold in any repository, most widely used first.
+        """
+        usages: Dict[PackageKey, BelowThresholdPackageUsage] = {}
+        for repository, report in self._repositories_reports.items():
+            for row in report.below_threshold_packages():
+                binary_repository = row.package.binary_repository
+                key = canonical_package_key(binary_repository.type, binary_repository.id)
+                usage = usages.get(key)
+                if usage is None:
+                    usages[key] = BelowThresholdPackageUsage(
+                        package=row.package,
+                        below_threshold_metrics=row.below_threshold_metrics,
+                        repositories=[repository],
+                    )
+                else:
+                    usage.repositories.append(repository)
+        return sorted(usages.values(), key=lambda usage: len(usage.repositories), reverse=True)
@@ -0,0 +1,91 @@
+"""
+Module containing the evaluator of packages maintenance metrics against the configured score thresholds.
+"""
+
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+from src.arguments.action_arguments import ActionArguments, MaintenanceMetricScore, MaintenanceMetricSlug
+from src.models.compact_package_metadata import MetricRecord, PackageMetadataRecord
+
+# Function returning a maintenance metric of a package, or None if the package has no such metric.
+MetricAccessor = Callable[[PackageMetadataRecord], Optional[MetricRecord]]
+
+# Scores ordered from the best to the worst, so that a score is below a threshold if its ordinal is greater.
+SCORE_ORDINALS: Dict[str, int] = {score.value: ordinal for ordinal, score in enumerate(MaintenanceMetricScore)}
+
+
+def _binary_release_recency(package: PackageMetadataRecord) -> Optional[MetricRecord]:
+    return package.binary_repository.release_recency
+
+
+def _source_metric_accessor(field: str) -> MetricAccessor:
+    def accessor(package: PackageMetadataRecord) -> Optional[MetricRecord]:
+        source_repository = package.source_repository
+        return getattr(source_repository, field) if source_repository else None
+
+    return accessor
+
+
+METRIC_ACCESSORS: Dict[MaintenanceMetricSlug, MetricAccessor] = {
+    MaintenanceMetricSlug.binary_release_recency: _binary_release_recency,
+    MaintenanceMetricSlug.source_commit_frequency: _source_metric_accessor("commits_frequency"),
+    MaintenanceMetricSlug.source_commit_recency: _source_metric_accessor("commits_recency"),
+    MaintenanceMetricSlug.issues_lifetime: _source_metric_accessor("issues_lifetime"),
+    MaintenanceMetricSlug.issues_open_percentage: _source_metric_accessor("issues_open_percentage"),
+    MaintenanceMetricSlug.pull_requests_lifetime: _source_metric_accessor("pull_requests_lifetime"),
+    MaintenanceMetricSlug.pull_requests_open_percentage: _source_metric_accessor("pull_requests_open_percentage"),
+}
+
+
+def get_package_metric(package: PackageMetadataRecord, metric: MaintenanceMetricSlug) -> Optional[MetricRecord]:
+    """
+    Returns the given maintenance metric of a package, or None if the package has no such metric.
+    """
+    accessor = METRIC_ACCESSORS.get(metric)
+    return accessor(package) if accessor else None
+
+
+class ThresholdEvaluator:
+    """
+    Evaluates packages maintenance metrics against score thresholds. Thresholds are compiled once into pairs of
+    a metric accessor and the threshold score ordinal, so evaluating a package takes a field access and an integer
+    comparison per threshold. The evaluator holds no per-report state, so it is shared by all reports created from
+    the same arguments.
+    """
+
+    @staticmethod
+    def create(arguments: ActionArguments) -> "ThresholdEvaluator":
+        """
+        Create new threshold evaluator from arguments
+
+        :param arguments: action arguments to supplied to the action.
+        :return: constructed threshold evaluator.
+        """
+        return ThresholdEvaluator(arguments.packages_scores_thresholds)
+
+    def __init__(self, thresholds: Mapping[MaintenanceMetricSlug, Union[MaintenanceMetricScore, str]]):
+        self._thresholds: Tuple[Tuple[MaintenanceMetricSlug, MetricAccessor, int], ...] = tuple(
+            (metric, METRIC_ACCESSORS[metric], SCORE_ORDINALS[MaintenanceMetricScore(score).value])
+            for metric, score in thresholds.items()
+        )
+
+    def below_threshold_metrics(self, package: PackageMetadataRecord) -> Set[MaintenanceMetricSlug]:
+        """
+        Returns metrics of the package that are below the threshold. Missing metrics and metrics with unknown scores
+        are not considered below the threshold, since there is not enough data to tell.
+        """
+        below_threshold_metrics: Set[MaintenanceMetricSlug] = set()
+        for metric, accessor, threshold_ordinal in self._thresholds:
+            package_metric = accessor(package)
+            if package_metric is not None and SCORE_ORDINALS.get(package_metric.score, -1) > threshold_ordinal:
+                below_threshold_metrics.add(metric)
+        return below_threshold_metrics
+
+    def below_threshold_metrics_batch(
+        self, packages: Iterable[PackageMetadataRecord]
+    ) -> List[Set[MaintenanceMetricSlug]]:
+        """
+        Returns metrics below the threshold of each package, in the order of the packages.
+        """
+        below_threshold_metrics = self.below_threshold_metrics
+        return [below_threshold_metrics(package) for package in packages]
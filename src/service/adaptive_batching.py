@@ -0,0 +1,217 @@
+"""
+Module containing adaptive batching of packages requested from the package-maintenance.dev API.
+"""
+
+import logging
+from collections import deque
+from typing import Deque, List, NamedTuple, Optional
+
+from src.models.commons import PackageKey
+
+# Batches completing slower than this are considered a sign of the API being overloaded.
+TARGET_BATCH_LATENCY_SECONDS = 10.0
+# Batch size grows by this number of packages after each batch completing within the target latency.
+BATCH_SIZE_INCREASE_STEP = 10
+# Failed batches per queue before it is aborted. Isolating a failing package in a batch of 100 takes 7 failed
+# batches, so this allows for a few failing packages, while a failing API is given up after a bounded number of requests.
+MAX_BATCH_FAILURES = 32
+
+logger = logging.getLogger(__name__)
+
+
+class PackagesBatch(NamedTuple):
+    """
+    Batch of packages requested at once.
+
+    :param start: position of the first package of the batch among all requested packages.
+    :param keys: keys of the packages of the batch.
+    """
+
+    start: int
+    keys: List[PackageKey]
+
+
+class AdaptiveBatchSizer:
+    """
+    Sizes batches with additive increase and multiplicative decrease: the size grows by `increase_step` after each
+    batch completing within the target latency up to `max_size`, and it is halved after each slow or failed batch.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        target_latency_seconds: float = TARGET_BATCH_LATENCY_SECONDS,
+        increase_step: int = BATCH_SIZE_INCREASE_STEP,
+    ):
+        self._max_size = max_size
+        self._target_latency_seconds = target_latency_seconds
+        self._increase_step = increase_step
+        self._size = max_size
+
+    @property
+    def size(self) -> int:
+        """
+        Size of the next batch.
+        """
+        return self._size
+
+    def on_success(self, batch_size: int, latency_seconds: float):
+        """
+        Adjusts the size after a batch of the given size completed in the given time.
+        """
+        if latency_seconds > self._target_latency_seconds:
+            self._decrease(batch_size)
+        else:
+            self._size = min(self._max_size, self._size + self._increase_step)
+
+    def on_failure(self, batch_size: int):
+        """
+        Adjusts the size after a batch of the given size failed.
+        """
+        self._decrease(batch_size)
+
+    def _decrease(self, batch_size: int):
+        self._size = max(1, min(self._size, batch_size) // 2)
+
+
+class PackagesBatchQueue:
+    """
+    Queue of packages to request in adaptively sized batches. A failed batch of more than one package is split in
+    halves, which are put back at the front of the queue, so the packages of a failing batch are retried in smaller
+    batches until the failing packages are isolated. Batches are split only if the error could be caused by their
+    packages, and only until `max_failures` batches failed. Otherwise, the queue is aborted: pending batches and batches added
+    later are dropped rather than requested, see `take_dropped`.
+
+    A queue created open accepts more keys while its batches are requested, so that packages are requested while
+    the rest of them are still being discovered. It is exhausted only after it is closed.
+
+    The queue does not perform any I/O and is not thread-safe, so it is shared by synchronous and asynchronous
+    retrievers, which guard it with their own locks.
+    """
+
+    def __init__(
+        self,
+        keys: List[PackageKey],
+        sizer: AdaptiveBatchSizer,
+        closed: bool = True,
+        max_failures: int = MAX_BATCH_FAILURES,
+    ):
+        self._sizer = sizer
+        self._pending: Deque[PackagesBatch] = deque([PackagesBatch(0, keys)] if keys else [])
+        self._pending_size = len(keys)
+        self._added_size = len(keys)
+        self._in_flight = 0
+        self._closed = closed
+        self._failures_left = max_failures
+        self._aborted = False
+        self._dropped: List[PackagesBatch] = []
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        Whether the queue is closed and all batches were completed or failed, so no more batches are going to be queued.
+        """
+        return self._closed and not self._pending and self._in_flight == 0
+
+    @property
+    def pending_size(self) -> int:
+        """
+        Number of packages waiting to be taken, including the packages of failed batches to be retried.
+        """
+        return self._pending_size
+
+    @property
+    def aborted(self) -> bool:
+        """
+        Whether the queue is aborted, so no more batches are going to be taken.
+        """
+        return self._aborted
+
+    def add(self, keys: List[PackageKey]):
+        """
+        Adds packages to the end of the open queue, positioned after all packages added before.
+        """
+        if self._closed:
+            raise ValueError("Packages cannot be added to a closed queue.")
+        if not keys:
+            return
+        if self._aborted:
+            self._dropped.append(PackagesBatch(self._added_size, keys))
+            self._added_size += len(keys)
+            return
+        self._pending.append(PackagesBatch(self._added_size, keys))
+        self._pending_size += len(keys)
+        self._added_size += len(keys)
+
+    def close(self):
+        """
+        Closes the queue, so that it is exhausted once the packages added so far are requested.
+        """
+        self._closed = True
+
+    def take(self) -> Optional[PackagesBatch]:
+        """
+        Takes the next batch sized by the sizer.
+        :return: next batch, or None if no batches are pending right now.
+        """
+        if not self._pending:
+            return None
+        batch = self._pending.popleft()
+        size = self._sizer.size
+        if len(batch.keys) > size:
+            self._pending.appendleft(PackagesBatch(batch.start + size, batch.keys[size:]))
+            batch = PackagesBatch(batch.start, batch.keys[:size])
+        self._pending_size -= len(batch.keys)
+        self._in_flight += 1
+        return batch
+
+    def complete(self, batch: PackagesBatch, latency_seconds: float):
+        """
+        Marks the batch as completed in the given time.
+        """
+        self._in_flight -= 1
+        self._sizer.on_success(len(batch.keys), latency_seconds)
+
+    def fail(self, batch: PackagesBatch, split: bool = True) -> bool:
+        """
+        Marks the batch as failed and splits it in halves to be retried, if it has more than one package.
+        The queue is aborted if the batch is not to be split, or if too many batches failed already.
+
+        :param batch: failed batch.
+        :param split: whether the error could be caused by the packages of the batch, so that it is worth splitting.
+        :return: True if the batch is going to be retried, False if it failed for good.
+        """
+        self._in_flight -= 1
+        self._sizer.on_failure(len(batch.keys))
+        if self._aborted:
+            return False
+        if not split or self._failures_left == 0:
+            self.abort()
+            return False
+        self._failures_left -= 1
+        if len(batch.keys) == 1:
+            return False
+        middle = len(batch.keys) // 2
+        logger.warning(f"Retrying failed group of {len(batch.keys)} packages split in halves...")
+        self._pending_size += len(batch.keys)
+        self._pending.appendleft(PackagesBatch(batch.start + middle, batch.keys[middle:]))
+        self._pending.appendleft(PackagesBatch(batch.start, batch.keys[:middle]))
+        return True
+
+    def abort(self):
+        """
+        Aborts the queue, dropping the pending batches. Batches in flight are still completed or failed.
+        """
+        if not self._aborted:
+            logger.warning(f"Giving up on {self._pending_size} packages waiting to be requested.")
+        self._aborted = True
+        self._dropped.extend(self._pending)
+        self._pending.clear()
+        self._pending_size = 0
+
+    def take_dropped(self) -> List[PackagesBatch]:
+        """
+        Takes the batches dropped since the queue was aborted, so they are reported as failed.
+        """
+        dropped, self._dropped = self._dropped, []
+        return dropped
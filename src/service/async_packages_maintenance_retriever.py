@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from packageurl import PackageURL
+
+from src.arguments.action_arguments import ActionArguments, DEFAULT_MAX_CONCURRENCY
+from src.clients.package_maintenance.async_client import AsyncPackageMaintenanceClient
+from src.clients.package_maintenance.model import PackagesResponseProjection, PackageMetadataProjection
+from src.service.packages_maintenance_retriever import (
+    PACKAGE_MAINTENANCE_API_MAX_SIZE,
+    GroupPackagesMaintenance,
+    create_packages_request,
+    merge_batches_packages_maintenance,
+    record_batch_result,
+    record_dropped_batches,
+)
+from src.models.commons import PackageKey, group_packages_urls_by_key
+from src.service.adaptive_batching import AdaptiveBatchSizer, PackagesBatch, PackagesBatchQueue
+from src.storage.packages_metadata_store import PackagesMetadataStore
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPackagesMaintenanceRetriever:
+    """
+    Asynchronous counterpart of `PackagesMaintenanceRetriever`. Retrieves maintenance metadata for a list of packages
+    based on the package-maintenance.dev API, with up to `max_concurrency` adaptively sized groups of packages
+    requested at the same time. If the cache is given, only packages missing in the cache are requested. The cache does
+    blocking I/O, so it is accessed in a worker thread rather than on the event loop.
+    """
+
+    @staticmethod
+    def create(
+        arguments: ActionArguments,
+        package_maintenance_client: AsyncPackageMaintenanceClient,
+        cache: Optional[PackagesMetadataStore] = None,
+    ):
+        """
+        Create new asynchronous packages maintenance retriever from arguments
+
+        :param arguments: action arguments to supplied to the action.
+        :param package_maintenance_client: asynchronous client to fetch packages from package-maintenance.dev API.
+        :param cache: cache of packages maintenance metadata, if any.
+        :return: constructed packages maintenance retriever.
+        """
+        return AsyncPackagesMaintenanceRetriever(
+            package_maintenance_client=package_maintenance_client,
+            max_concurrency=arguments.max_concurrency,
+            cache=cache,
+        )
+
+    def __init__(
+        self,
+        package_maintenance_client: AsyncPackageMaintenanceClient,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: Optional[PackagesMetadataStore] = None,
+    ):
+        self._package_maintenance_client = package_maintenance_client
+        self._max_concurrency = max_concurrency
+        self._cache = cache
+
+    async def get_packages_maintenance(self, packages_urls: List[PackageURL]) -> List[PackageMetadataProjection]:
+        """
+        Get maintenance metadata for the given packages.
+
+        :param packages_urls: list of package URLs to retrieve maintenance metadata for.
+        :return: list of found packages maintenance metadata.
+        :raises PackagesMaintenanceRetrievalError: if any group of packages failed to be retrieved.
+        """
+        packages_urls_by_key = group_packages_urls_by_key(packages_urls)
+        keys = list(packages_urls_by_key)
+        logger.info(f"Found {len(keys)} unique packages among {len(packages_urls)} package URLs.")
+
+        cached_packages_maintenance: List[PackageMetadataProjection] = []
+        if self._cache:
+            cached_packages_maintenance, keys = await asyncio.to_thread(self._cache.split_cached, keys)
+
+        batch_queue = PackagesBatchQueue(keys, AdaptiveBatchSizer(max_size=PACKAGE_MAINTENANCE_API_MAX_SIZE))
+        condition = asyncio.Condition()
+        results: List[Tuple[PackagesBatch, GroupPackagesMaintenance]] = []
+        workers = max(1, min(self._max_concurrency, len(keys)))
+        try:
+            await asyncio.gather(*(self._retrieve_batches(batch_queue, condition, results) for _ in range(workers)))
+        finally:
+            if self._cache:
+                await asyncio.to_thread(self._cache.save)
+
+        record_dropped_batches(batch_queue, results)
+        return merge_batches_packages_maintenance(results, packages_urls_by_key, cached_packages_maintenance)
+
+    async def _retrieve_batches(
+        self,
+        batch_queue: PackagesBatchQueue,
+        condition: asyncio.Condition,
+        results: List[Tuple[PackagesBatch, GroupPackagesMaintenance]],
+    ):
+        while True:
+            async with condition:
+                batch = batch_queue.take()
+                while batch is None and not batch_queue.exhausted:
+                    # Batches in flight might fail and be split, wait for them before giving up.
+                    await condition.wait()
+                    batch = batch_queue.take()
+                if batch is None:
+                    return
+
+            started_at = time.monotonic()
+            result = await self._get_group_packages_maintenance(batch.keys)
+            async with condition:
+                record_batch_result(batch_queue, batch, result, time.monotonic() - started_at, results)
+                condition.notify_all()
+
+    async def _get_group_packages_maintenance(self, keys: List[PackageKey]) -> GroupPackagesMaintenance:
+        logger.info(f"Retrieving maintenance metadata for group of {len(keys)} packages...")
+        try:
+            packages_request = create_packages_request(keys)
+            response = await self._package_maintenance_client.fetch_packages(
+                packages_request, PackagesResponseProjection
+            )
+            if self._cache:
+                await asyncio.to_thread(self._cache.put, keys, response.packages)
+            return response.packages, None
+        except Exception as error:
+            logger.error(f"Failed to retrieve maintenance metadata for group of {len(keys)} packages: {error}")
+            return [], error
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from typing import Optional, List
+
+from packageurl import PackageURL
+
+from src.arguments.action_arguments import ActionArguments
+from src.clients.github.model import SBOMResponseProjection
+from src.clients.github.async_client import AsyncGitHubClient
+from src.models.packages_diff import PackagesDiff
+from src.models.packages_ignore_filter import PackagesIgnoreFilter
+from src.service.packages_retriever import iter_sbom_file_packages_urls
+from src.service.sbom_packages_extractor import SbomPackagesExtractor
+from src.storage.lockfiles import Lockfiles
+from src.storage.sbom_file import SbomFile
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPackagesRetriever:
+    """
+    Asynchronous counterpart of `PackagesRetriever`. Retrieves list of packages URLs to check for maintenance scores
+    based on SBOM and action arguments without blocking the event loop.
+    """
+
+    @staticmethod
+    def create(arguments: ActionArguments, github_client: AsyncGitHubClient):
+        """
+        Create new asynchronous packages retriever from arguments
+
+        :param arguments: action arguments to supplied to the action.
+        :param github_client: asynchronous client to fetch SBOM from GitHub API.
+        :return: constructed packages retriever.
+        """
+        packages_ignore_filter = PackagesIgnoreFilter.create(arguments)
+        return AsyncPackagesRetriever(
+            owner=arguments.github_repository_owner,
+            name=arguments.github_repository_name,
+            token=arguments.github_token,
+            packages_ignore_filter=packages_ignore_filter,
+            github_client=github_client,
+            sbom_streaming=arguments.sbom_streaming,
+            diff_base_ref=arguments.diff_base_ref,
+            diff_head_ref=arguments.diff_head_ref,
+            sbom_file=SbomFile.create(arguments),
+            lockfiles=Lockfiles.create(arguments),
+        )
+
+    def __init__(
+        self,
+        owner: str,
+        name: str,
+        token: Optional[str],
+        packages_ignore_filter: PackagesIgnoreFilter,
+        github_client: AsyncGitHubClient,
+        sbom_streaming: bool = False,
+        diff_base_ref: Optional[str] = None,
+        diff_head_ref: Optional[str] = None,
+        sbom_file: Optional[SbomFile] = None,
+        lockfiles: Optional[Lockfiles] = None,
+    ):
+        self._owner = owner
+        self._name = name
+        self._token = token
+        self._sbom_packages_extractor = SbomPackagesExtractor(packages_ignore_filter)
+        self._github_client = github_client
+        self._sbom_streaming = sbom_streaming
+        self._diff_base_ref = diff_base_ref
+        self._diff_head_ref = diff_head_ref
+        self._sbom_file = sbom_file
+        self._lockfiles = lockfiles
+
+    async def get_packages_urls_to_check(self) -> List["PackageURL"]:
+        """
+        Get list of packages URLs to check for maintenance scores based on SBOM and action arguments.
+        :return: list of package URLs to check
+        """
+        if self._diff_base_ref:
+            return (await self.get_packages_diff()).packages_urls_to_check()
+        packages_urls: List["PackageURL"] = []
+        if self._lockfiles:
+            lockfiles = self._lockfiles
+            packages_urls = await asyncio.to_thread(
+                lambda: list(self._sbom_packages_extractor.filter_packages_urls(lockfiles.iter_packages_urls()))
+            )
+        elif self._sbom_file:
+            # The file is read in a worker thread, so that parsing does not block the event loop.
+            sbom_file = self._sbom_file
+            packages_urls = await asyncio.to_thread(
+                lambda: list(iter_sbom_file_packages_urls(sbom_file, self._sbom_packages_extractor))
+            )
+        elif self._sbom_streaming:
+            packages = self._github_client.stream_github_sbom_packages(
+                owner=self._owner,
+                repo=self._name,
+                token=self._token,
+            )
+            async for package in packages:
+                packages_urls.extend(self._sbom_packages_extractor.iter_raw_packages_urls([package]))
+        else:
+            sbom = await self._github_client.fetch_github_sbom(
+                owner=self._owner,
+                repo=self._name,
+                token=self._token,
+                response_model=SBOMResponseProjection,
+            )
+            packages_urls = self._sbom_packages_extractor.get_packages_urls(sbom)
+        logger.info(f"Found {len(packages_urls)} packages to check.")
+        return packages_urls
+
+    async def get_packages_diff(self) -> PackagesDiff:
+        """
+        Get packages added, updated and removed between the base and the head revisions.
+        See `PackagesRetriever.get_packages_diff` for more details.
+        :return: packages diff, with ignored packages and packages without package URL filtered out
+        """
+        if not self._diff_base_ref or not self._diff_head_ref:
+            raise ValueError("Both base and head revisions are required to compare dependencies.")
+
+        changes = await self._github_client.fetch_dependency_changes(
+            owner=self._owner,
+            repo=self._name,
+            base_ref=self._diff_base_ref,
+            head_ref=self._diff_head_ref,
+            token=self._token,
+        )
+        packages_diff = self._sbom_packages_extractor.get_packages_diff(
+            self._diff_base_ref, self._diff_head_ref, changes
+        )
+        logger.info(
+            f"Found {len(packages_diff.packages_urls_to_check())} added or updated packages "
+            f"between '{self._diff_base_ref}' and '{self._diff_head_ref}'."
+        )
+        return packages_diff
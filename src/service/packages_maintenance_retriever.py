@@ -1,60 +1,407 @@
 import logging
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, TypeAlias
 
+import httpx
+import requests
 from packageurl import PackageURL
 
-from src.clients.package_maintenance.client import fetch_packages
+from src.arguments.action_arguments import ActionArguments, DEFAULT_MAX_CONCURRENCY
+from src.clients.package_maintenance.client import PackageMaintenanceClient
 from src.clients.package_maintenance.model import (
     PackageRequest,
     PackagesRequest,
-    PackagesResponse,
-    PackageMetadata,
+    PackagesResponseProjection,
+    PackageMetadataProjection,
 )
-from src.models.commons import package_url_to_repository_id
-from src.utils.list_utils import grouped
+from src.models.commons import PackageKey, group_packages_urls_by_key, package_url_to_repository_id
+from src.service.adaptive_batching import AdaptiveBatchSizer, PackagesBatch, PackagesBatchQueue
+from src.storage.packages_metadata_store import PackagesMetadataStore
 
 # package-maintenance.dev API has a limit of 100 packages per request. Hence, we need to split the list of packages
-# into chunks of 100 packages each.
+# into chunks of at most 100 packages each.
 PACKAGE_MAINTENANCE_API_MAX_SIZE = 100
+# In pipelined retrieval, discovery of packages is paused while this many batches per worker wait to be requested,
+# so that the queue of packages stays bounded when the API is slower than the discovery.
+PIPELINE_PENDING_BATCHES_PER_WORKER = 2
+# Statuses of responses that might be caused by the requested packages, so a failed group is split to isolate them:
+# the request is too large or takes too long to process, or some of the packages are rejected.
+BATCH_ERROR_STATUSES = frozenset({400, 413, 422, 504})
+
+# Result of the retrieval of a group of packages: either found packages maintenance metadata or an error.
+GroupPackagesMaintenance: TypeAlias = Tuple[List[PackageMetadataProjection], Optional[Exception]]
 
 logger = logging.getLogger(__name__)
 
 
+class PackagesMaintenanceRetrievalError(Exception):
+    """
+    Raised when one or more groups of packages failed to be retrieved from the package-maintenance.dev API.
+    Maintenance metadata of the groups that were retrieved successfully is preserved, so the caller is still
+    able to report on them.
+
+    :param packages_maintenance: maintenance metadata of successfully retrieved groups, in the original order.
+    :param failed_packages_urls: package URLs of the groups that failed to be retrieved.
+    :param errors: errors raised by the failed groups.
+    :param packages_urls: all package URLs maintenance metadata was requested for, if they were discovered during
+        the retrieval, see `PackagesMaintenanceRetriever.get_packages_maintenance_pipelined`.
+    """
+
+    def __init__(
+        self,
+        packages_maintenance: List[PackageMetadataProjection],
+        failed_packages_urls: List[PackageURL],
+        errors: List[Exception],
+        packages_urls: Optional[List[PackageURL]] = None,
+    ):
+        super().__init__(
+            f"Failed to retrieve maintenance metadata for {len(failed_packages_urls)} packages "
+            f"in {len(errors)} groups: {errors[0]}"
+        )
+        self.packages_maintenance = packages_maintenance
+        self.failed_packages_urls = failed_packages_urls
+        self.errors = errors
+        self.packages_urls = packages_urls
+
+
 class PackagesMaintenanceRetriever:
     """
     Retrieves maintenance metadata for a list of packages based on the package-maintenance.dev API.
+    Unique packages are split in groups of up to `PACKAGE_MAINTENANCE_API_MAX_SIZE`, sized adaptively from the
+    observed latency and errors, and up to `max_concurrency` groups are requested at the same time. A group failed
+    with an error that might be caused by its packages is split in halves and retried, so that a single failing
+    package does not fail the whole group. Other errors, such as the API being unreachable, fail the remaining groups
+    without requesting them.
+    Results are merged in the order of the packages.
+    If the cache is given, only packages missing in the cache are requested, and the cache is updated with the
+    fetched maintenance metadata.
     """
 
-    def get_packages_maintenance(self, packages_urls: List[PackageURL]) -> List[PackageMetadata]:
-        grouped_packages_urls = grouped(input_list=packages_urls, size=PACKAGE_MAINTENANCE_API_MAX_SIZE)
-        all_packages_maintenance: List[PackageMetadata] = []
-        for group in grouped_packages_urls:
-            logger.info(f"Retrieving maintenance metadata for group of {len(group)} packages...")
-            packages_maintenance = self._get_packages_maintenance(group)
-            all_packages_maintenance.extend(packages_maintenance)
-        return all_packages_maintenance
-
-    def _get_packages_maintenance(self, packages_urls: List[PackageURL]) -> List[PackageMetadata]:
-        packages = self._create_package_requests(packages_urls)
-        packages_request = PackagesRequest(packages=packages)
-        response: PackagesResponse = fetch_packages(packages_request)
-        return response.packages
-
-    def _create_package_requests(self, packages_urls) -> List[PackageRequest]:
-        packages: List[PackageRequest] = []
-        for package_url in packages_urls:
-            binary_repository_type_id = package_url_to_repository_id(package_url)
-            if binary_repository_type_id:
-                package = self._create_package_request(binary_repository_type_id)
-                packages.append(package)
-            else:
-                logger.info(f"Package '{package_url}' has an unsupported type '{package_url.type}'. Skipping...")
-        return packages
-
-    def _create_package_request(self, binary_repository_type_id):
-        binary_repository_type, binary_repository_id = binary_repository_type_id
-        package = PackageRequest(
-            binary_repository_type=binary_repository_type,
-            binary_repository_id=binary_repository_id,
+    @staticmethod
+    def create(
+        arguments: ActionArguments,
+        package_maintenance_client: PackageMaintenanceClient,
+        cache: Optional[PackagesMetadataStore] = None,
+    ):
+        """
+        Create new packages maintenance retriever from arguments
+
+        :param arguments: action arguments to supplied to the action.
+        :param package_maintenance_client: client to fetch packages from package-maintenance.dev API.
+        :param cache: cache of packages maintenance metadata, if any.
+        :return: constructed packages maintenance retriever.
+        """
+        return PackagesMaintenanceRetriever(
+            package_maintenance_client=package_maintenance_client,
+            max_concurrency=arguments.max_concurrency,
+            cache=cache,
         )
-        return package
+
+    def __init__(
+        self,
+        package_maintenance_client: PackageMaintenanceClient,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: Optional[PackagesMetadataStore] = None,
+    ):
+        self._package_maintenance_client = package_maintenance_client
+        self._max_concurrency = max_concurrency
+        self._cache = cache
+
+    def get_packages_maintenance(self, packages_urls: List[PackageURL]) -> List[PackageMetadataProjection]:
+        """
+        Get maintenance metadata for the given packages. Package URLs are deduplicated by canonical key first,
+        so each package is requested once regardless of how many versions or spellings of it are referenced.
+
+        :param packages_urls: list of package URLs to retrieve maintenance metadata for.
+        :return: list of found packages maintenance metadata.
+        :raises PackagesMaintenanceRetrievalError: if any group of packages failed to be retrieved.
+        """
+        packages_urls_by_key = group_packages_urls_by_key(packages_urls)
+        keys = list(packages_urls_by_key)
+        logger.info(f"Found {len(keys)} unique packages among {len(packages_urls)} package URLs.")
+
+        cached_packages_maintenance: List[PackageMetadataProjection] = []
+        if self._cache:
+            cached_packages_maintenance, keys = self._cache.split_cached(keys)
+
+        batch_queue = PackagesBatchQueue(keys, AdaptiveBatchSizer(max_size=PACKAGE_MAINTENANCE_API_MAX_SIZE))
+        condition = threading.Condition()
+        results: List[Tuple[PackagesBatch, GroupPackagesMaintenance]] = []
+        max_workers = max(1, min(self._max_concurrency, len(keys)))
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="packages-maintenance") as executor:
+                workers = [
+                    executor.submit(self._retrieve_batches, batch_queue, condition, results) for _ in range(max_workers)
+                ]
+                for worker in workers:
+                    # Re-raises the unexpected error a worker crashed with, if any.
+                    worker.result()
+        finally:
+            if self._cache:
+                self._cache.save()
+
+        record_dropped_batches(batch_queue, results)
+        return merge_batches_packages_maintenance(results, packages_urls_by_key, cached_packages_maintenance)
+
+    def get_packages_maintenance_pipelined(
+        self, packages_urls: Iterable[PackageURL]
+    ) -> Tuple[List[PackageURL], List[PackageMetadataProjection]]:
+        """
+        Get maintenance metadata for the given packages while they are still being discovered, for instance parsed
+        from a streamed SBOM. Unique packages are put into the queue of batches in groups of
+        `PACKAGE_MAINTENANCE_API_MAX_SIZE` as soon as they are discovered, and worker threads request them in
+        parallel with the discovery. Results are merged in the order of the packages, same as in
+        `get_packages_maintenance`.
+
+        :param packages_urls: package URLs to retrieve maintenance metadata for, consumed in the calling thread.
+        :return: all consumed package URLs and found packages maintenance metadata.
+        :raises PackagesMaintenanceRetrievalError: if any group of packages failed to be retrieved.
+        """
+        batch_queue = PackagesBatchQueue(
+            [], AdaptiveBatchSizer(max_size=PACKAGE_MAINTENANCE_API_MAX_SIZE), closed=False
+        )
+        condition = threading.Condition()
+        results: List[Tuple[PackagesBatch, GroupPackagesMaintenance]] = []
+        all_packages_urls: List[PackageURL] = []
+        packages_urls_by_key: Dict[PackageKey, List[PackageURL]] = {}
+        cached_packages_maintenance: List[PackageMetadataProjection] = []
+        max_workers = max(1, self._max_concurrency)
+        max_pending_size = max_workers * PIPELINE_PENDING_BATCHES_PER_WORKER * PACKAGE_MAINTENANCE_API_MAX_SIZE
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="packages-maintenance") as executor:
+                workers = [
+                    executor.submit(self._retrieve_batches, batch_queue, condition, results) for _ in range(max_workers)
+                ]
+                try:
+                    new_keys: List[PackageKey] = []
+                    for package_url in packages_urls:
+                        all_packages_urls.append(package_url)
+                        key = package_url_to_repository_id(package_url)
+                        if key is None:
+                            logger.info(
+                                f"Package '{package_url}' has an unsupported type '{package_url.type}'. Skipping..."
+                            )
+                            continue
+                        if key in packages_urls_by_key:
+                            packages_urls_by_key[key].append(package_url)
+                            continue
+                        packages_urls_by_key[key] = [package_url]
+                        new_keys.append(key)
+                        if len(new_keys) == PACKAGE_MAINTENANCE_API_MAX_SIZE:
+                            self._queue_keys(
+                                new_keys, batch_queue, condition, max_pending_size, cached_packages_maintenance
+                            )
+                            new_keys = []
+                    self._queue_keys(new_keys, batch_queue, condition, max_pending_size, cached_packages_maintenance)
+                finally:
+                    # Let the workers finish the queued batches and stop, also if the discovery failed.
+                    with condition:
+                        batch_queue.close()
+                        condition.notify_all()
+                for worker in workers:
+                    worker.result()
+        finally:
+            if self._cache:
+                self._cache.save()
+
+        logger.info(f"Found {len(packages_urls_by_key)} unique packages among {len(all_packages_urls)} package URLs.")
+        record_dropped_batches(batch_queue, results)
+        try:
+            packages_maintenance = merge_batches_packages_maintenance(
+                results, packages_urls_by_key, cached_packages_maintenance
+            )
+        except PackagesMaintenanceRetrievalError as error:
+            raise PackagesMaintenanceRetrievalError(
+                error.packages_maintenance, error.failed_packages_urls, error.errors, all_packages_urls
+            ) from error
+        return all_packages_urls, packages_maintenance
+
+    def _queue_keys(
+        self,
+        keys: List[PackageKey],
+        batch_queue: PackagesBatchQueue,
+        condition: threading.Condition,
+        max_pending_size: int,
+        cached_packages_maintenance: List[PackageMetadataProjection],
+    ):
+        if self._cache:
+            cached, keys = self._cache.split_cached(keys)
+            cached_packages_maintenance.extend(cached)
+        with condition:
+            while batch_queue.pending_size >= max_pending_size:
+                condition.wait()
+            batch_queue.add(keys)
+            condition.notify_all()
+
+    def _retrieve_batches(
+        self,
+        batch_queue: PackagesBatchQueue,
+        condition: threading.Condition,
+        results: List[Tuple[PackagesBatch, GroupPackagesMaintenance]],
+    ):
+        while True:
+            with condition:
+                batch = batch_queue.take()
+                while batch is None and not batch_queue.exhausted:
+                    # Batches in flight might fail and be split, wait for them before giving up.
+                    condition.wait()
+                    batch = batch_queue.take()
+                if batch is None:
+                    return
+
+            started_at = time.monotonic()
+            try:
+                result = self._get_group_packages_maintenance(batch.keys)
+            except BaseException:
+                # The worker crashed on an unexpected error, which is re-raised by the caller. Other workers are
+                # woken up and stopped rather than left waiting for its batch forever.
+                with condition:
+                    batch_queue.fail(batch, split=False)
+                    condition.notify_all()
+                raise
+            with condition:
+                try:
+                    record_batch_result(batch_queue, batch, result, time.monotonic() - started_at, results)
+                except BaseException:
+                    batch_queue.abort()
+                    raise
+                finally:
+                    condition.notify_all()
+
+    def _get_group_packages_maintenance(self, keys: List[PackageKey]) -> GroupPackagesMaintenance:
+        logger.info(f"Retrieving maintenance metadata for group of {len(keys)} packages...")
+        try:
+            packages_request = create_packages_request(keys)
+            response = self._package_maintenance_client.fetch_packages(packages_request, PackagesResponseProjection)
+            if self._cache:
+                self._cache.put(keys, response.packages)
+            return response.packages, None
+        except Exception as error:
+            logger.error(f"Failed to retrieve maintenance metadata for group of {len(keys)} packages: {error}")
+            return [], error
+
+
+def record_batch_result(
+    batch_queue: PackagesBatchQueue,
+    batch: PackagesBatch,
+    result: GroupPackagesMaintenance,
+    latency_seconds: float,
+    results: List[Tuple[PackagesBatch, GroupPackagesMaintenance]],
+):
+    """
+    Records result of the retrieval of a batch: the batch is either completed, split in halves to be retried,
+    or failed for good. Batches are split only on errors that might be caused by their packages, see
+    `is_batch_error`. Other errors, such as connection or authentication errors that persisted after the request
+    was retried, fail the retrieval of all remaining batches.
+
+    :param batch_queue: queue the batch was taken from.
+    :param batch: retrieved batch.
+    :param result: result of the retrieval of the batch.
+    :param latency_seconds: time the retrieval took.
+    :param results: final results of the batches, to append the result to unless the batch is retried.
+    """
+    _, error = result
+    if error is None:
+        batch_queue.complete(batch, latency_seconds)
+        results.append((batch, result))
+    elif not batch_queue.fail(batch, split=is_batch_error(error)):
+        results.append((batch, result))
+        record_dropped_batches(batch_queue, results)
+
+
+def record_dropped_batches(
+    batch_queue: PackagesBatchQueue, results: List[Tuple[PackagesBatch, GroupPackagesMaintenance]]
+):
+    """
+    Records batches dropped by the aborted queue as failed with the error of the last failed batch, which is the one
+    the queue was aborted on.
+    """
+    dropped = batch_queue.take_dropped()
+    if not dropped:
+        return
+    error = next(error for _, (_, error) in reversed(results) if error is not None)
+    results.extend((batch, ([], error)) for batch in dropped)
+
+
+def is_batch_error(error: Exception) -> bool:
+    """
+    Whether the error of a batch might be caused by the requested packages, so that the batch is worth splitting:
+    read timeouts, responses with one of `BATCH_ERROR_STATUSES`, and other errors, such as invalid responses.
+    Transport errors and other error statuses, including rate limiting and server errors, are not caused by the
+    packages, and they are already retried by the request scheduler.
+    """
+    if isinstance(error, (requests.ReadTimeout, httpx.ReadTimeout)):
+        return True
+    if isinstance(error, (requests.RequestException, httpx.TransportError)) and not isinstance(
+        error, requests.HTTPError
+    ):
+        return False
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in BATCH_ERROR_STATUSES
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in BATCH_ERROR_STATUSES
+    return True
+
+
+def merge_batches_packages_maintenance(
+    results: List[Tuple[PackagesBatch, GroupPackagesMaintenance]],
+    packages_urls_by_key: Dict[PackageKey, List[PackageURL]],
+    cached_packages_maintenance: Optional[List[PackageMetadataProjection]] = None,
+) -> List[PackageMetadataProjection]:
+    """
+    Merges maintenance metadata retrieved for batches of packages in the order of the packages, regardless of
+    the order the batches completed in. See `merge_groups_packages_maintenance` for more details.
+    """
+    results = sorted(results, key=lambda batch_result: batch_result[0].start)
+    return merge_groups_packages_maintenance(
+        [batch.keys for batch, _ in results],
+        [result for _, result in results],
+        packages_urls_by_key,
+        cached_packages_maintenance,
+    )
+
+
+def merge_groups_packages_maintenance(
+    grouped_keys: List[List[PackageKey]],
+    results: List[GroupPackagesMaintenance],
+    packages_urls_by_key: Dict[PackageKey, List[PackageURL]],
+    cached_packages_maintenance: Optional[List[PackageMetadataProjection]] = None,
+) -> List[PackageMetadataProjection]:
+    """
+    Merges maintenance metadata retrieved for groups of packages in the order of the groups.
+
+    :param grouped_keys: groups of package keys.
+    :param results: result of the retrieval for each group, in the same order as the groups.
+    :param packages_urls_by_key: originating package URLs of each key, to report failed packages.
+    :param cached_packages_maintenance: maintenance metadata found in the cache, placed before the retrieved one.
+    :return: merged maintenance metadata.
+    :raises PackagesMaintenanceRetrievalError: if any group of packages failed to be retrieved.
+    """
+    all_packages_maintenance: List[PackageMetadataProjection] = list(cached_packages_maintenance or [])
+    failed_packages_urls: List[PackageURL] = []
+    errors: List[Exception] = []
+    for group, (packages_maintenance, error) in zip(grouped_keys, results):
+        if error is not None:
+            for key in group:
+                failed_packages_urls.extend(packages_urls_by_key[key])
+            errors.append(error)
+        else:
+            all_packages_maintenance.extend(packages_maintenance)
+
+    if errors:
+        raise PackagesMaintenanceRetrievalError(all_packages_maintenance, failed_packages_urls, errors)
+    return all_packages_maintenance
+
+
+def create_packages_request(keys: List[PackageKey]) -> PackagesRequest:
+    """
+    Creates package-maintenance.dev API request for the given packages keys.
+    """
+    packages = [
+        PackageRequest(binary_repository_type=binary_repository_type, binary_repository_id=binary_repository_id)
+        for binary_repository_type, binary_repository_id in keys
+    ]
+    return PackagesRequest(packages=packages)
@@ -1,12 +1,16 @@
 import logging
-from typing import Optional, List
+from typing import Iterator, Optional, List
 
 from packageurl import PackageURL
 
 from src.arguments.action_arguments import ActionArguments
-from src.clients.github.client import fetch_github_sbom
-from src.clients.github.model import SBOMResponse, Package, ExternalRef
+from src.clients.github.model import SBOMResponseProjection
+from src.clients.github.client import GitHubClient
+from src.models.packages_diff import PackagesDiff
 from src.models.packages_ignore_filter import PackagesIgnoreFilter
+from src.service.sbom_packages_extractor import SbomPackagesExtractor
+from src.storage.lockfiles import Lockfiles
+from src.storage.sbom_file import SbomFile, SbomFileFormat
 
 logger = logging.getLogger(__name__)
 
@@ -17,14 +21,20 @@ class PackagesRetriever:
     Internally, it retrieves SBOM for a given repository and filters out packages based on external reference
     type (purl), package type (maven, npm, etc.) and `packages_ignore` action argument.
     Packages that match the criteria are returned as a list of package URLs.
+    In SBOM streaming mode, SBOM is parsed incrementally while it is downloaded, and only package URLs are kept.
+    If SBOM file is given, packages are read from the file incrementally instead of fetching SBOM from GitHub.
+    If lockfiles are given, packages are read from the lockfiles of the checked-out repository instead.
+    In diff mode, for instance on pull requests, only packages added or updated since the base revision are returned,
+    so that a pull request check takes a handful of lookups rather than a scan of the whole dependency graph.
     """
 
     @staticmethod
-    def create(arguments: ActionArguments):
+    def create(arguments: ActionArguments, github_client: GitHubClient):
         """
         Create new packages retriever from arguments
 
         :param arguments: action arguments to supplied to the action.
+        :param github_client: client to fetch SBOM from GitHub API.
         :return: constructed packages retriever.
         """
         packages_ignore_filter = PackagesIgnoreFilter.create(arguments)
@@ -33,6 +43,12 @@ class PackagesRetriever:
             name=arguments.github_repository_name,
             token=arguments.github_token,
             packages_ignore_filter=packages_ignore_filter,
+            github_client=github_client,
+            sbom_streaming=arguments.sbom_streaming,
+            diff_base_ref=arguments.diff_base_ref,
+            diff_head_ref=arguments.diff_head_ref,
+            sbom_file=SbomFile.create(arguments),
+            lockfiles=Lockfiles.create(arguments),
         )
 
     def __init__(
@@ -41,54 +57,99 @@ class PackagesRetriever:
         name: str,
         token: Optional[str],
         packages_ignore_filter: PackagesIgnoreFilter,
+        github_client: GitHubClient,
+        sbom_streaming: bool = False,
+        diff_base_ref: Optional[str] = None,
+        diff_head_ref: Optional[str] = None,
+        sbom_file: Optional[SbomFile] = None,
+        lockfiles: Optional[Lockfiles] = None,
     ):
         self._owner = owner
         self._name = name
         self._token = token
-        self._packages_ignore_filter = packages_ignore_filter
+        self._sbom_packages_extractor = SbomPackagesExtractor(packages_ignore_filter)
+        self._github_client = github_client
+        self._sbom_streaming = sbom_streaming
+        self._diff_base_ref = diff_base_ref
+        self._diff_head_ref = diff_head_ref
+        self._sbom_file = sbom_file
+        self._lockfiles = lockfiles
 
     def get_packages_urls_to_check(self) -> List["PackageURL"]:
         """
         Get list of packages URLs to check for maintenance scores based on SBOM and action arguments.
         :return: list of package URLs to check
         """
-        sbom = fetch_github_sbom(
+        if self._diff_base_ref:
+            return self.get_packages_diff().packages_urls_to_check()
+        if self._sbom_streaming or self._sbom_file or self._lockfiles:
+            packages_urls = list(self.iter_packages_urls_to_check())
+        else:
+            sbom = self._github_client.fetch_github_sbom(
+                owner=self._owner,
+                repo=self._name,
+                token=self._token,
+                response_model=SBOMResponseProjection,
+            )
+            packages_urls = self._sbom_packages_extractor.get_packages_urls(sbom)
+        logger.info(f"Found {len(packages_urls)} packages to check.")
+        return packages_urls
+
+    def iter_packages_urls_to_check(self) -> Iterator["PackageURL"]:
+        """
+        Iterate over packages URLs to check for maintenance scores while SBOM is streamed, so that neither the whole
+        SBOM document nor its model are held in memory. If SBOM file or lockfiles are given, they are read instead.
+        :return: iterator over package URLs to check
+        """
+        if self._lockfiles:
+            return self._sbom_packages_extractor.filter_packages_urls(self._lockfiles.iter_packages_urls())
+        if self._sbom_file:
+            return iter_sbom_file_packages_urls(self._sbom_file, self._sbom_packages_extractor)
+        packages = self._github_client.stream_github_sbom_packages(
             owner=self._owner,
             repo=self._name,
             token=self._token,
         )
+        return self._sbom_packages_extractor.iter_raw_packages_urls(packages)
 
-        packages_urls = self._get_packages_urls_to_check(sbom)
-        logger.info(f"Found {len(packages_urls)} packages to check.")
-        return packages_urls
-
-    def _get_packages_urls_to_check(self, sbom: SBOMResponse) -> List["PackageURL"]:
-        sbom_all_packages_urls: List["PackageURL"] = []
-        for package in sbom.sbom.packages:
-            packages_urls = self._get_package_external_refs(package)
-            sbom_all_packages_urls.extend(packages_urls)
-        return sbom_all_packages_urls
-
-    def _get_package_external_refs(self, package: Package) -> List["PackageURL"]:
-        packages_urls: List["PackageURL"] = []
-        external_refs = package.externalRefs or []
-        for external_ref in external_refs:
-            package_url = self._get_package_url_from_external_ref(package, external_ref)
-            if package_url:
-                packages_urls.append(package_url)
-        return packages_urls
+    def get_packages_diff(self) -> PackagesDiff:
+        """
+        Get packages added, updated and removed between the base and the head revisions. GitHub exports SBOM of
+        the default branch only, so the revisions are compared with the dependency graph compare API instead.
+        :return: packages diff, with ignored packages and packages without package URL filtered out
+        """
+        if not self._diff_base_ref or not self._diff_head_ref:
+            raise ValueError("Both base and head revisions are required to compare dependencies.")
 
-    def _get_package_url_from_external_ref(self, package: Package, external_ref: ExternalRef) -> Optional["PackageURL"]:
-        if external_ref.referenceType != "purl":
-            logger.info(
-                f"Package '{package.name}' has an unsupported reference type '{external_ref.referenceType}'. Skipping..."
-            )
-            return None
+        changes = self._github_client.fetch_dependency_changes(
+            owner=self._owner,
+            repo=self._name,
+            base_ref=self._diff_base_ref,
+            head_ref=self._diff_head_ref,
+            token=self._token,
+        )
+        packages_diff = self._sbom_packages_extractor.get_packages_diff(
+            self._diff_base_ref, self._diff_head_ref, changes
+        )
+        logger.info(
+            f"Found {len(packages_diff.packages_urls_to_check())} added or updated packages "
+            f"between '{self._diff_base_ref}' and '{self._diff_head_ref}'."
+        )
+        return packages_diff
 
-        purl = PackageURL.from_string(external_ref.referenceLocator)
-        ignore = self._packages_ignore_filter.ignore(purl)
-        if ignore:
-            logger.info(f"Package '{package.name}' is ignored. Skipping...")
-            return None
 
-        return purl
+def iter_sbom_file_packages_urls(
+    sbom_file: SbomFile, sbom_packages_extractor: SbomPackagesExtractor
+) -> Iterator["PackageURL"]:
+    """
+    Iterate over packages URLs to check read from SBOM file, either SPDX packages or CycloneDX components.
+    It is shared by synchronous and asynchronous packages retrievers, since the file is read locally.
+    :param sbom_file: SBOM file to read packages from
+    :param sbom_packages_extractor: extractor of packages URLs to check
+    :return: iterator over package URLs to check
+    """
+    sbom_format = sbom_file.detect_format()
+    packages = sbom_file.iter_packages(sbom_format)
+    if sbom_format == SbomFileFormat.CYCLONEDX:
+        return sbom_packages_extractor.iter_raw_components_urls(packages)
+    return sbom_packages_extractor.iter_raw_packages_urls(packages)
@@ -0,0 +1,197 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from packageurl import PackageURL
+
+from src.arguments.action_arguments import ActionArguments
+from src.clients.github.client import GitHubClient
+from src.clients.package_maintenance.model import PackageMetadataProjection
+from src.models.compact_package_metadata import CompactPackageMetadata, compact_package_metadata
+from src.models.commons import PackageKey, canonical_package_key, group_packages_urls_by_key
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+from src.models.repositories_maintenance_report import RepositoriesMaintenanceReport
+from src.models.threshold_evaluator import ThresholdEvaluator
+from src.service.packages_maintenance_retriever import (
+    PackagesMaintenanceRetriever,
+    PackagesMaintenanceRetrievalError,
+)
+from src.service.packages_retriever import PackagesRetriever
+
+# Result of the retrieval of packages of a repository: either package URLs to check or an error.
+RepositoryPackagesUrls = Tuple[str, Optional[List[PackageURL]], Optional[Exception]]
+
+logger = logging.getLogger(__name__)
+
+
+class RepositoriesScanError(Exception):
+    """
+    Raised when maintenance metadata of some packages failed to be retrieved during the scan of repositories, or when
+    none of the repositories was scanned. The report on the retrieved packages and the failed repositories is
+    preserved, so the caller is still able to write it.
+
+    :param report: report on the repositories, excluding packages that failed to be retrieved.
+    :param cause: error of the retrieval of packages maintenance metadata, or of the retrieval of packages of the
+        first failed repository.
+    :param message: error message, the message of the cause by default.
+    """
+
+    def __init__(self, report: RepositoriesMaintenanceReport, cause: Exception, message: Optional[str] = None):
+        super().__init__(message or str(cause))
+        self.report = report
+        self.cause = cause
+
+
+class RepositoriesScanner:
+    """
+    Scans several repositories at once, for instance all repositories of an organization. SBOMs of up to
+    `max_concurrency` repositories are fetched at the same time, then packages of all repositories are deduplicated
+    and maintenance metadata is retrieved once per unique package, however many repositories depend on it.
+    A repository whose SBOM fails to be fetched is reported as failed, without failing the whole scan, unless all
+    repositories failed.
+    """
+
+    @staticmethod
+    def create(
+        arguments: ActionArguments,
+        github_client: GitHubClient,
+        packages_maintenance_retriever: PackagesMaintenanceRetriever,
+    ):
+        """
+        Create new repositories scanner from arguments
+
+        :param arguments: action arguments to supplied to the action.
+        :param github_client: client to fetch SBOMs and list organization repositories from GitHub API.
+        :param packages_maintenance_retriever: retriever of the maintenance metadata of all scanned packages.
+        :return: constructed repositories scanner.
+        """
+        return RepositoriesScanner(
+            arguments=arguments,
+            github_client=github_client,
+            packages_maintenance_retriever=packages_maintenance_retriever,
+            max_concurrency=arguments.max_concurrency,
+        )
+
+    def __init__(
+        self,
+        arguments: ActionArguments,
+        github_client: GitHubClient,
+        packages_maintenance_retriever: PackagesMaintenanceRetriever,
+        max_concurrency: int,
+    ):
+        self._arguments = arguments
+        self._github_client = github_client
+        self._packages_maintenance_retriever = packages_maintenance_retriever
+        self._max_concurrency = max_concurrency
+
+    def scan(self) -> RepositoriesMaintenanceReport:
+        """
+        Scan repositories and create the report on them.
+
+        :return: report on the scanned repositories.
+        :raises RepositoriesScanError: if maintenance metadata of any package failed to be retrieved, or if packages of
+            none of the repositories were retrieved.
+        """
+        repositories = self.get_repositories()
+        logger.info(f"Scanning {len(repositories)} repositories...")
+
+        max_workers = max(1, min(self._max_concurrency, len(repositories)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="repositories-scanner") as executor:
+            results = list(executor.map(self._get_repository_packages_urls, repositories))
+
+        packages_urls_by_repository: Dict[str, List[PackageURL]] = {}
+        failed_repositories: Dict[str, str] = {}
+        repositories_errors: List[Exception] = []
+        for repository, packages_urls, error in results:
+            if packages_urls is not None:
+                packages_urls_by_repository[repository] = packages_urls
+            elif error is not None:
+                failed_repositories[repository] = str(error)
+                repositories_errors.append(error)
+
+        all_packages_urls = [url for packages_urls in packages_urls_by_repository.values() for url in packages_urls]
+        retrieval_error: Optional[PackagesMaintenanceRetrievalError] = None
+        try:
+            packages_maintenance = self._packages_maintenance_retriever.get_packages_maintenance(all_packages_urls)
+        except PackagesMaintenanceRetrievalError as error:
+            logger.error(f"{error}. Reporting on {len(error.packages_maintenance)} retrieved packages only.")
+            retrieval_error = error
+            packages_maintenance = error.packages_maintenance
+            failed_packages_urls = set(error.failed_packages_urls)
+            packages_urls_by_repository = {
+                repository: [url for url in packages_urls if url not in failed_packages_urls]
+                for repository, packages_urls in packages_urls_by_repository.items()
+            }
+
+        report = self._create_report(packages_urls_by_repository, packages_maintenance, failed_repositories)
+        if repositories_errors and not packages_urls_by_repository:
+            raise RepositoriesScanError(
+                report,
+                repositories_errors[0],
+                f"Failed to retrieve packages of all {len(repositories_errors)} repositories: {repositories_errors[0]}",
+            )
+        if retrieval_error:
+            raise RepositoriesScanError(report, retrieval_error)
+        return report
+
+    def get_repositories(self) -> List[Tuple[str, str]]:
+        """
+        Get repositories to scan: the listed repositories followed by the repositories of the organization, if any.
+        :return: unique repositories to scan as (owner, name) pairs.
+        """
+        repositories = list(self._arguments.github_repositories)
+        organization = self._arguments.github_organization
+        if organization:
+            names = self._github_client.list_organization_repositories(organization, self._arguments.github_token)
+            logger.info(f"Found {len(names)} repositories in organization '{organization}'.")
+            repositories.extend((organization, name) for name in names if (organization, name) not in repositories)
+        return repositories
+
+    def _get_repository_packages_urls(self, repository: Tuple[str, str]) -> RepositoryPackagesUrls:
+        owner, name = repository
+        # Revisions of the diff mode belong to the current repository, so all dependencies of others are scanned.
+        repository_arguments = self._arguments.model_copy(
+            update={
+                "github_repository_owner": owner,
+                "github_repository_name": name,
+                "diff_base_ref": None,
+                "diff_head_ref": None,
+                "sbom_file": None,
+                "lockfiles": [],
+            }
+        )
+        try:
+            packages_retriever = PackagesRetriever.create(repository_arguments, self._github_client)
+            return f"{owner}/{name}", packages_retriever.get_packages_urls_to_check(), None
+        except Exception as error:
+            logger.error(f"Failed to retrieve packages of repository '{owner}/{name}': {error}")
+            return f"{owner}/{name}", None, error
+
+    def _create_report(
+        self,
+        packages_urls_by_repository: Dict[str, List[PackageURL]],
+        packages_maintenance: List[PackageMetadataProjection],
+        failed_repositories: Dict[str, str],
+    ) -> RepositoriesMaintenanceReport:
+        # Metadata is compacted once, so that reports of repositories sharing packages share the records as well.
+        packages_maintenance_by_key: Dict[PackageKey, CompactPackageMetadata] = {
+            canonical_package_key(package.binary_repository.type, package.binary_repository.id): (
+                compact_package_metadata(package)
+            )
+            for package in packages_maintenance
+        }
+        threshold_evaluator = ThresholdEvaluator.create(self._arguments)
+        repositories_reports: Dict[str, PackagesMaintenanceReport] = {}
+        for repository, packages_urls in packages_urls_by_repository.items():
+            repository_packages_maintenance = [
+                packages_maintenance_by_key[key]
+                for key in group_packages_urls_by_key(packages_urls)
+                if key in packages_maintenance_by_key
+            ]
+            repositories_reports[repository] = PackagesMaintenanceReport.create(
+                packages=packages_urls,
+                packages_maintenance=repository_packages_maintenance,
+                action_arguments=self._arguments,
+                threshold_evaluator=threshold_evaluator,
+            )
+        return RepositoriesMaintenanceReport(repositories_reports, failed_repositories)
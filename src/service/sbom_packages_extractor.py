@@ -0,0 +1,170 @@
+import logging
+from typing import Any, Iterable, Iterator, Optional, List
+
+from packageurl import PackageURL
+
+from src.clients.github.model import (
+    DependencyChange,
+    ExternalRefProjection,
+    PackageProjection,
+    SBOMResponseProjection,
+)
+from src.models.commons import SUPPORTED_PACKAGE_TYPES, is_supported_package_url, parse_package_url
+from src.models.packages_diff import PackagesDiff
+from src.models.packages_ignore_filter import PackagesIgnoreFilter
+
+logger = logging.getLogger(__name__)
+
+
+class SbomPackagesExtractor:
+    """
+    Extracts packages URLs to check from SBOM. Packages are filtered out based on external reference
+    type (purl), package type and `packages_ignore` action argument. Package types are checked before package URLs
+    are parsed, so references to packages of unsupported types cost little.
+    It does not perform any I/O, so it is shared by synchronous and asynchronous packages retrievers.
+    """
+
+    def __init__(self, packages_ignore_filter: PackagesIgnoreFilter):
+        self._packages_ignore_filter = packages_ignore_filter
+
+    def get_packages_urls(self, sbom: SBOMResponseProjection) -> List["PackageURL"]:
+        """
+        Get list of packages URLs to check from SBOM.
+        :param sbom: SBOM to extract packages URLs from
+        :return: list of package URLs to check
+        """
+        sbom_all_packages_urls: List["PackageURL"] = []
+        for package in sbom.sbom.packages:
+            packages_urls = self._get_package_external_refs(package)
+            sbom_all_packages_urls.extend(packages_urls)
+        return sbom_all_packages_urls
+
+    def iter_raw_packages_urls(self, packages: Iterable[Any]) -> Iterator["PackageURL"]:
+        """
+        Get package URLs to check from raw SPDX packages, as they are streamed from SBOM. Only package name and
+        external references are read, other package fields are neither parsed nor validated.
+        :param packages: SPDX packages as parsed JSON objects
+        :return: iterator over package URLs to check
+        """
+        for package in packages:
+            if not isinstance(package, dict):
+                logger.warning(f"SBOM package {package!r} is malformed. Skipping...")
+                continue
+            package_name = package.get("name")
+            external_refs = package.get("externalRefs") or []
+            if not isinstance(external_refs, list):
+                logger.warning(f"Package '{package_name}' has malformed external references. Skipping...")
+                continue
+            for external_ref in external_refs:
+                reference_type = external_ref.get("referenceType") if isinstance(external_ref, dict) else None
+                reference_locator = external_ref.get("referenceLocator") if isinstance(external_ref, dict) else None
+                if not isinstance(reference_type, str) or not isinstance(reference_locator, str):
+                    logger.warning(
+                        f"Package '{package_name}' has a malformed external reference {external_ref!r}. Skipping..."
+                    )
+                    continue
+                package_url = self._get_package_url(package_name, reference_type, reference_locator)
+                if package_url:
+                    yield package_url
+
+    def iter_raw_components_urls(self, components: Iterable[Any]) -> Iterator["PackageURL"]:
+        """
+        Get package URLs to check from raw CycloneDX components, including their nested components. Only component
+        name and package URL are read, other component fields are neither parsed nor validated.
+        :param components: CycloneDX components as parsed JSON objects
+        :return: iterator over package URLs to check
+        """
+        for component in components:
+            if not isinstance(component, dict):
+                logger.warning(f"SBOM component {component!r} is malformed. Skipping...")
+                continue
+            component_name = component.get("name")
+            component_purl = component.get("purl")
+            if component_purl and not isinstance(component_purl, str):
+                logger.warning(
+                    f"Component '{component_name}' has a malformed package URL {component_purl!r}. Skipping..."
+                )
+            elif component_purl:
+                package_url = self._get_package_url(component_name, "purl", component_purl)
+                if package_url:
+                    yield package_url
+            else:
+                logger.info(f"Component '{component_name}' has no package URL. Skipping...")
+            nested_components = component.get("components")
+            if isinstance(nested_components, list):
+                yield from self.iter_raw_components_urls(nested_components)
+
+    def filter_packages_urls(self, packages_urls: Iterable["PackageURL"]) -> Iterator["PackageURL"]:
+        """
+        Filter package URLs read from other sources than SBOM, for instance lockfiles, the same way as SBOM packages.
+        :param packages_urls: package URLs to filter
+        :return: iterator over package URLs to check
+        """
+        for package_url in packages_urls:
+            if package_url.type not in SUPPORTED_PACKAGE_TYPES:
+                logger.info(f"Package '{package_url}' has an unsupported package type. Skipping...")
+            elif self._packages_ignore_filter.ignore(package_url):
+                logger.info(f"Package '{package_url}' is ignored. Skipping...")
+            else:
+                yield package_url
+
+    def get_packages_diff(self, base_ref: str, head_ref: str, changes: Iterable[DependencyChange]) -> PackagesDiff:
+        """
+        Get packages diff from dependency changes between two revisions. Packages without package URL and ignored
+        packages are filtered out, and packages declared in several manifests are reported once.
+        :param base_ref: base revision the changes are compared against
+        :param head_ref: head revision the changes are compared to the base revision
+        :param changes: dependency changes between the revisions
+        :return: packages diff
+        """
+        added_packages_urls: List["PackageURL"] = []
+        removed_packages_urls: List["PackageURL"] = []
+        for change in changes:
+            if not change.package_url:
+                logger.info(f"Package '{change.name}' has no package URL. Skipping...")
+                continue
+            # Changed packages of unsupported types are kept, so they are listed in the report of changes.
+            package_url = self._get_package_url(change.name, "purl", change.package_url, supported_only=False)
+            if package_url is None:
+                continue
+            packages_urls = added_packages_urls if change.change_type == "added" else removed_packages_urls
+            if package_url not in packages_urls:
+                packages_urls.append(package_url)
+        return PackagesDiff(base_ref, head_ref, added_packages_urls, removed_packages_urls)
+
+    def _get_package_external_refs(self, package: PackageProjection) -> List["PackageURL"]:
+        packages_urls: List["PackageURL"] = []
+        external_refs = package.externalRefs or []
+        for external_ref in external_refs:
+            package_url = self._get_package_url_from_external_ref(package, external_ref)
+            if package_url:
+                packages_urls.append(package_url)
+        return packages_urls
+
+    def _get_package_url_from_external_ref(
+        self, package: PackageProjection, external_ref: ExternalRefProjection
+    ) -> Optional["PackageURL"]:
+        return self._get_package_url(package.name, external_ref.referenceType, external_ref.referenceLocator)
+
+    def _get_package_url(
+        self, package_name: Optional[str], reference_type: str, reference_locator: str, supported_only: bool = True
+    ) -> Optional["PackageURL"]:
+        if reference_type != "purl":
+            logger.info(f"Package '{package_name}' has an unsupported reference type '{reference_type}'. Skipping...")
+            return None
+
+        if supported_only and not is_supported_package_url(reference_locator):
+            logger.info(f"Package '{package_name}' has an unsupported package type. Skipping...")
+            return None
+
+        try:
+            purl = parse_package_url(reference_locator)
+        except ValueError as error:
+            logger.warning(f"Package '{package_name}' has an invalid package URL: {error}. Skipping...")
+            return None
+        ignore = self._packages_ignore_filter.ignore(purl)
+        if ignore:
+            logger.info(f"Package '{package_name}' is ignored. Skipping...")
+            return None
+
+        return purl
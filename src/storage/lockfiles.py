@@ -0,0 +1,175 @@
+"""
+Module containing the reader of package URLs from lockfiles of the checked-out repository.
+"""
+
+import fnmatch
+import glob
+import json
+import logging
+import os
+import re
+import sys
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+
+from packageurl import PackageURL
+
+from src.arguments.action_arguments import ActionArguments
+from src.models.commons import MAVEN_PACKAGE_TYPE, PYPI_PACKAGE_TYPE
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+# Function parsing content of a lockfile into package URLs.
+LockfileParser = Callable[[str], Iterator[PackageURL]]
+
+# Requirement of a package, optionally with extras and pinned version, e.g. `requests[socks]==2.32.3`.
+_REQUIREMENT = re.compile(
+    r"^(?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(?:\[[^\]]*\])?\s*(?:===?\s*(?P<version>[^\s;,]+))?"
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_poetry_lock(content: str) -> Iterator[PackageURL]:
+    """
+    Parse `poetry.lock` file: each `[[package]]` table is a resolved PyPI package.
+    """
+    for package in tomllib.loads(content).get("package", []):
+        yield PackageURL(type=PYPI_PACKAGE_TYPE, name=package["name"], version=package.get("version"))
+
+
+def parse_pipfile_lock(content: str) -> Iterator[PackageURL]:
+    """
+    Parse `Pipfile.lock` file: packages of both `default` and `develop` sections, with versions pinned as `==1.0`.
+    """
+    lock = json.loads(content)
+    for section in ("default", "develop"):
+        for name, package in (lock.get(section) or {}).items():
+            version = (package.get("version") or "").removeprefix("==") or None
+            yield PackageURL(type=PYPI_PACKAGE_TYPE, name=name, version=version)
+
+
+def parse_requirements(content: str) -> Iterator[PackageURL]:
+    """
+    Parse pip requirements file. Requirements pinned with `==` are reported with their version, other requirements
+    without version. Options, such as `-r other.txt` or `--hash`, and requirements referenced by URL are skipped.
+    """
+    for line in content.replace("\\\n", " ").splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith(("#", "-")) or "://" in line or " @ " in line:
+            continue
+        match = _REQUIREMENT.match(line)
+        if match:
+            yield PackageURL(type=PYPI_PACKAGE_TYPE, name=match["name"], version=match["version"])
+
+
+def parse_gradle_lockfile(content: str) -> Iterator[PackageURL]:
+    """
+    Parse Gradle dependency lockfile: lines of `group:name:version=configurations`.
+    """
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("empty="):
+            continue
+        coordinates = line.split("=", 1)[0].split(":")
+        if len(coordinates) == 3:
+            group, name, version = coordinates
+            yield PackageURL(type=MAVEN_PACKAGE_TYPE, namespace=group, name=name, version=version)
+
+
+def parse_maven_dependency_list(content: str) -> Iterator[PackageURL]:
+    """
+    Parse listing of resolved dependencies written by `mvn dependency:list -DoutputFile=...`: lines of
+    `group:artifact:type[:classifier]:version:scope`, optionally followed by ` -- module ...`.
+    """
+    for line in content.splitlines():
+        coordinates = line.split(" -- ", 1)[0].strip().split(":")
+        if len(coordinates) not in (5, 6):
+            continue
+        group, artifact, version = coordinates[0], coordinates[1], coordinates[-2]
+        yield PackageURL(type=MAVEN_PACKAGE_TYPE, namespace=group, name=artifact, version=version)
+
+
+# Lockfile parsers by file name pattern, the first matching pattern is used.
+LOCKFILE_PARSERS: List[Tuple[str, LockfileParser]] = [
+    ("poetry.lock", parse_poetry_lock),
+    ("Pipfile.lock", parse_pipfile_lock),
+    ("requirements*.txt", parse_requirements),
+    ("*.lockfile", parse_gradle_lockfile),
+    ("dependencies*.txt", parse_maven_dependency_list),
+]
+
+
+def get_lockfile_parser(path: str) -> Optional[LockfileParser]:
+    """
+    Get parser of the lockfile based on its file name, or None if the lockfile is not supported.
+    """
+    file_name = os.path.basename(path)
+    for pattern, parser in LOCKFILE_PARSERS:
+        if fnmatch.fnmatchcase(file_name, pattern):
+            return parser
+    return None
+
+
+class Lockfiles:
+    """
+    Lockfiles of the checked-out repository to read package URLs from instead of the GitHub dependency graph, so
+    that packages reflect the exact commit under test and no GitHub API requests are needed. Lockfiles are matched by
+    glob patterns, `**` matching any number of directories, and parsed based on their file names, see
+    `LOCKFILE_PARSERS`. The same package URL listed by several lockfiles is reported once.
+    """
+
+    @staticmethod
+    def create(arguments: ActionArguments) -> Optional["Lockfiles"]:
+        """
+        Create new lockfiles from arguments.
+
+        :param arguments: action arguments to supplied to the action.
+        :return: lockfiles, or None if lockfiles are not configured.
+        """
+        if not arguments.lockfiles:
+            return None
+        return Lockfiles(arguments.lockfiles)
+
+    def __init__(self, patterns: List[str], root_dir: str = "."):
+        self._patterns = patterns
+        self._root_dir = root_dir
+
+    def find_paths(self) -> List[str]:
+        """
+        Find lockfiles matching the patterns, relative to the root directory, in the order of the patterns.
+
+        :return: paths of the matching lockfiles.
+        :raises ValueError: if no lockfiles match the patterns.
+        """
+        paths: List[str] = []
+        for pattern in self._patterns:
+            for path in sorted(glob.glob(pattern, root_dir=self._root_dir, recursive=True)):
+                if path not in paths and os.path.isfile(os.path.join(self._root_dir, path)):
+                    paths.append(path)
+        if not paths:
+            raise ValueError(f"No lockfiles found matching: {', '.join(self._patterns)}")
+        return paths
+
+    def iter_packages_urls(self) -> Iterator[PackageURL]:
+        """
+        Iterate over package URLs of the packages listed in the lockfiles. Lockfiles of unsupported types are skipped.
+
+        :return: iterator over unique package URLs.
+        :raises ValueError: if no lockfiles match the patterns.
+        """
+        seen_packages_urls: Set[PackageURL] = set()
+        for path in self.find_paths():
+            parser = get_lockfile_parser(path)
+            if parser is None:
+                logger.warning(f"Lockfile '{path}' is not supported. Skipping...")
+                continue
+            logger.info(f"Reading packages from lockfile '{path}'...")
+            with open(os.path.join(self._root_dir, path), "r", encoding="utf-8") as f:
+                content = f.read()
+            for package_url in parser(content):
+                if package_url not in seen_packages_urls:
+                    seen_packages_urls.add(package_url)
+                    yield package_url
@@ -0,0 +1,171 @@
+"""
+Module containing the persistent on-disk cache of packages maintenance metadata.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.arguments.action_arguments import ActionArguments
+from src.clients.package_maintenance.model import PackageMetadataProjection
+from src.models.commons import PackageKey, canonical_package_key
+from src.utils.file_utils import write_file_atomically
+
+CACHE_FILE_NAME = "packages-metadata.json"
+CACHE_FORMAT_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry:
+    """
+    Cached maintenance metadata of a single package. `package` is None for packages that are missing in the
+    package-maintenance.dev index, so that they are not requested again until the entry expires.
+    """
+
+    __slots__ = ("package", "fetched_at", "accessed_at")
+
+    def __init__(self, package: Optional[dict], fetched_at: float, accessed_at: float):
+        self.package = package
+        self.fetched_at = fetched_at
+        self.accessed_at = accessed_at
+
+
+class PackagesMetadataCache:
+    """
+    Persistent cache of packages maintenance metadata fetched from package-maintenance.dev API, keyed by binary
+    repository type and id. The cache is stored as a single JSON file in the given directory, so the directory can be
+    persisted between workflow runs, for instance with `actions/cache`.
+
+    Entries are considered fresh for `ttl_seconds` after they were fetched. When the cache is saved, expired entries are
+    dropped, and if more than `max_entries` remain, the least recently used ones are evicted.
+    The cache is safe to use from multiple threads.
+    """
+
+    @staticmethod
+    def create(arguments: ActionArguments) -> Optional["PackagesMetadataCache"]:
+        """
+        Create new cache from arguments
+
+        :param arguments: action arguments to supplied to the action.
+        :return: loaded cache, or None if cache is not configured.
+        """
+        if not arguments.cache_dir:
+            return None
+        return PackagesMetadataCache.load(
+            cache_dir=arguments.cache_dir,
+            ttl_seconds=arguments.cache_ttl_seconds,
+            max_entries=arguments.cache_max_entries,
+        )
+
+    @staticmethod
+    def load(
+        cache_dir: str,
+        ttl_seconds: int,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ) -> "PackagesMetadataCache":
+        """
+        Load cache from the given directory. A missing or unreadable cache file results in an empty cache.
+        """
+        path = os.path.join(cache_dir, CACHE_FILE_NAME)
+        entries: Dict[PackageKey, _CacheEntry] = {}
+        try:
+            with open(path, "r") as f:
+                content = json.load(f)
+            if content.get("version") == CACHE_FORMAT_VERSION:
+                for package_type, package_id, package, fetched_at, accessed_at in content["entries"]:
+                    entries[(package_type, package_id)] = _CacheEntry(package, fetched_at, accessed_at)
+        except FileNotFoundError:
+            logger.info(f"Packages metadata cache '{path}' does not exist. Starting with empty cache.")
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            logger.warning(f"Failed to load packages metadata cache '{path}': {error}. Starting with empty cache.")
+            entries = {}
+        logger.info(f"Loaded {len(entries)} entries from packages metadata cache '{path}'.")
+        return PackagesMetadataCache(path, entries, ttl_seconds, max_entries, clock)
+
+    def __init__(
+        self,
+        path: str,
+        entries: Dict[PackageKey, _CacheEntry],
+        ttl_seconds: int,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._path = path
+        self._entries = entries
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def split_cached(self, keys: Iterable[PackageKey]) -> Tuple[List[PackageMetadataProjection], List[PackageKey]]:
+        """
+        Splits packages into the ones with fresh cached maintenance metadata and the ones to be fetched.
+
+        :param keys: unique keys of packages to look up in the cache.
+        :return: cached maintenance metadata of found packages, and keys of packages that are missing in the cache.
+        """
+        now = self._clock()
+        cached_packages_maintenance: List[PackageMetadataProjection] = []
+        missing_keys: List[PackageKey] = []
+        hits = 0
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None or now - entry.fetched_at > self._ttl_seconds:
+                    missing_keys.append(key)
+                    continue
+                hits += 1
+                entry.accessed_at = now
+                if entry.package is not None:
+                    cached_packages_maintenance.append(PackageMetadataProjection.model_validate(entry.package))
+        logger.info(f"Packages metadata cache hits: {hits}, misses: {len(missing_keys)}.")
+        return cached_packages_maintenance, missing_keys
+
+    def put(self, keys: Iterable[PackageKey], packages_maintenance: Iterable[PackageMetadataProjection]):
+        """
+        Puts fetched maintenance metadata into the cache. Requested packages that are absent in the fetched
+        maintenance metadata are cached as missing in the index.
+
+        :param keys: keys of packages maintenance metadata was requested for.
+        :param packages_maintenance: fetched maintenance metadata.
+        """
+        now = self._clock()
+        with self._lock:
+            for key in keys:
+                self._entries[key] = _CacheEntry(None, now, now)
+            for package in packages_maintenance:
+                key = canonical_package_key(package.binary_repository.type, package.binary_repository.id)
+                self._entries[key] = _CacheEntry(package.model_dump(), now, now)
+
+    def save(self):
+        """
+        Saves the cache to disk, dropping expired entries and evicting the least recently used ones over the limit.
+        The cache file is replaced atomically, so an interrupted save does not corrupt it.
+        """
+        now = self._clock()
+        with self._lock:
+            entries = [
+                (key, entry) for key, entry in self._entries.items() if now - entry.fetched_at <= self._ttl_seconds
+            ]
+            if len(entries) > self._max_entries:
+                entries.sort(key=lambda key_entry: key_entry[1].accessed_at, reverse=True)
+                entries = entries[: self._max_entries]
+            self._entries = dict(entries)
+            content = {
+                "version": CACHE_FORMAT_VERSION,
+                "entries": [
+                    [key[0], key[1], entry.package, entry.fetched_at, entry.accessed_at] for key, entry in entries
+                ],
+            }
+        write_file_atomically(self._path, json.dumps(content).encode())
+        logger.info(f"Saved {len(entries)} entries to packages metadata cache '{self._path}'.")
+
+    def close(self):
+        """
+        Does nothing, the cache holds no resources besides memory. Unsaved entries are not saved.
+        """
@@ -0,0 +1,41 @@
+"""
+Module containing the interface of packages maintenance metadata caches and the factory selecting the configured one.
+"""
+
+from typing import Iterable, List, Optional, Protocol, Tuple
+
+from src.arguments.action_arguments import ActionArguments, CacheBackend
+from src.clients.package_maintenance.model import PackageMetadataProjection
+from src.models.commons import PackageKey
+from src.storage.packages_metadata_cache import PackagesMetadataCache
+from src.storage.sqlite_packages_metadata_cache import SqlitePackagesMetadataCache
+
+
+class PackagesMetadataStore(Protocol):
+    """
+    Cache of packages maintenance metadata consulted by the retrievers before packages are batched, and updated with
+    every fetched batch. The store is closed once the action is done with it. See `PackagesMetadataCache` for the
+    semantics of the methods.
+    """
+
+    def split_cached(self, keys: Iterable[PackageKey]) -> Tuple[List[PackageMetadataProjection], List[PackageKey]]: ...
+
+    def put(self, keys: Iterable[PackageKey], packages_maintenance: Iterable[PackageMetadataProjection]): ...
+
+    def save(self): ...
+
+    def close(self): ...
+
+
+def create_packages_metadata_store(arguments: ActionArguments) -> Optional[PackagesMetadataStore]:
+    """
+    Create cache of the configured backend from arguments.
+
+    :param arguments: action arguments to supplied to the action.
+    :return: cache, or None if cache is not configured.
+    """
+    match arguments.cache_backend:
+        case CacheBackend.sqlite:
+            return SqlitePackagesMetadataCache.create(arguments)
+        case _:
+            return PackagesMetadataCache.create(arguments)
@@ -0,0 +1,116 @@
+"""
+Module containing the persistent on-disk cache of GitHub SBOM documents used for conditional requests.
+"""
+
+import logging
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from src.arguments.action_arguments import ActionArguments
+from src.utils.file_utils import atomic_writer, iter_file_chunks, write_file_atomically
+
+SBOM_CACHE_DIR_NAME = "sbom"
+
+logger = logging.getLogger(__name__)
+
+
+class CachedSbom(NamedTuple):
+    """
+    SBOM document as it was returned by the GitHub API along with its entity tag.
+
+    :param etag: value of the `ETag` response header.
+    :param body: raw response body.
+    """
+
+    etag: str
+    body: bytes
+
+
+class SbomCache:
+    """
+    Persistent cache of the latest SBOM document fetched for each repository, stored as raw response body next to its
+    `ETag`. It allows to revalidate SBOM with `If-None-Match` request header and reuse the stored document if GitHub
+    responds with `304 Not Modified`, which does not count against the GitHub API rate limit.
+    """
+
+    @staticmethod
+    def create(arguments: ActionArguments) -> Optional["SbomCache"]:
+        """
+        Create new cache from arguments. SBOM documents are stored in the `sbom` subdirectory of the cache directory.
+
+        :param arguments: action arguments to supplied to the action.
+        :return: cache, or None if cache is not configured.
+        """
+        if not arguments.cache_dir:
+            return None
+        return SbomCache(os.path.join(arguments.cache_dir, SBOM_CACHE_DIR_NAME))
+
+    def __init__(self, cache_dir: str):
+        self._cache_dir = cache_dir
+
+    def get(self, owner: str, repo: str) -> Optional[CachedSbom]:
+        """
+        Get cached SBOM document of the repository.
+
+        :return: cached SBOM document, or None if there is no readable cached document.
+        """
+        body_path, etag_path = self._paths(owner, repo)
+        try:
+            with open(etag_path, "r") as f:
+                etag = f.read().strip()
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as error:
+            logger.warning(f"Failed to read cached SBOM of '{owner}/{repo}': {error}.")
+            return None
+        if not etag:
+            return None
+        return CachedSbom(etag=etag, body=body)
+
+    def put(self, owner: str, repo: str, sbom: CachedSbom) -> None:
+        """
+        Store SBOM document of the repository, replacing the previously cached one.
+        """
+        body_path, etag_path = self._paths(owner, repo)
+        # The body is written first: a body without matching ETag is re-downloaded, but not the other way around.
+        write_file_atomically(body_path, sbom.body)
+        write_file_atomically(etag_path, sbom.etag.encode())
+
+    def get_etag(self, owner: str, repo: str) -> Optional[str]:
+        """
+        Get `ETag` of the cached SBOM document of the repository, without reading the document itself.
+
+        :return: entity tag, or None if there is no cached document.
+        """
+        body_path, etag_path = self._paths(owner, repo)
+        try:
+            with open(etag_path, "r") as f:
+                etag = f.read().strip()
+        except OSError:
+            return None
+        return etag if etag and os.path.exists(body_path) else None
+
+    def iter_body(self, owner: str, repo: str, chunk_size: int) -> Iterator[bytes]:
+        """
+        Read cached SBOM document of the repository in chunks, without loading it whole.
+        """
+        body_path, _ = self._paths(owner, repo)
+        return iter_file_chunks(body_path, chunk_size)
+
+    @contextmanager
+    def body_writer(self, owner: str, repo: str, etag: str) -> Iterator[BinaryIO]:
+        """
+        Open SBOM document of the repository for writing in chunks. The document replaces the previously cached one
+        only when the context exits without an error.
+        """
+        body_path, etag_path = self._paths(owner, repo)
+        with atomic_writer(body_path) as f:
+            yield f
+        write_file_atomically(etag_path, etag.encode())
+
+    def _paths(self, owner: str, repo: str) -> tuple[str, str]:
+        base_path = os.path.join(self._cache_dir, f"{owner}__{repo}")
+        return f"{base_path}.json", f"{base_path}.etag"
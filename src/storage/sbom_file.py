@@ -0,0 +1,96 @@
+"""
+Module containing the reader of SBOM documents generated earlier in the workflow and stored in local files.
+"""
+
+import logging
+import mmap
+import re
+from enum import Enum
+from typing import Any, Iterator, Optional
+
+from src.arguments.action_arguments import ActionArguments
+from src.utils.json_stream import iter_json_array_items
+
+SBOM_FILE_CHUNK_SIZE = 64 * 1024
+# Size of the beginning of the document the format is detected from.
+SBOM_FILE_HEAD_SIZE = 64 * 1024
+
+_GITHUB_SBOM_HEAD = re.compile(r'^\s*\{\s*"sbom"\s*:')
+
+logger = logging.getLogger(__name__)
+
+
+class SbomFileFormat(Enum):
+    """
+    Supported formats of SBOM files, with the path to the array of packages in the document.
+    """
+
+    # SPDX JSON wrapped the same way as the GitHub dependency graph SBOM response.
+    GITHUB_SPDX = ("sbom", "packages")
+    SPDX = ("packages",)
+    CYCLONEDX = ("components",)
+
+
+class SbomFile:
+    """
+    SBOM document stored in a local file, in SPDX JSON or CycloneDX JSON format. The format is detected from
+    the beginning of the document. The file is memory-mapped and parsed incrementally, so only the packages are kept
+    in memory, regardless of the file size.
+    """
+
+    @staticmethod
+    def create(arguments: ActionArguments) -> Optional["SbomFile"]:
+        """
+        Create new SBOM file from arguments.
+
+        :param arguments: action arguments to supplied to the action.
+        :return: SBOM file, or None if SBOM file is not configured.
+        """
+        if not arguments.sbom_file:
+            return None
+        return SbomFile(arguments.sbom_file)
+
+    def __init__(self, path: str, chunk_size: int = SBOM_FILE_CHUNK_SIZE):
+        self._path = path
+        self._chunk_size = chunk_size
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def detect_format(self) -> SbomFileFormat:
+        """
+        Detect format of the document from its beginning.
+
+        :return: format of the document.
+        :raises ValueError: if the document is neither SPDX JSON nor CycloneDX JSON.
+        """
+        with open(self._path, "rb") as file:
+            head = file.read(SBOM_FILE_HEAD_SIZE).decode("utf-8", errors="ignore")
+        if _GITHUB_SBOM_HEAD.match(head):
+            return SbomFileFormat.GITHUB_SPDX
+        if '"bomFormat"' in head:
+            return SbomFileFormat.CYCLONEDX
+        if '"spdxVersion"' in head or '"SPDXID"' in head:
+            return SbomFileFormat.SPDX
+        raise ValueError(f"Unsupported format of SBOM file '{self._path}'. Only SPDX and CycloneDX JSON are supported.")
+
+    def iter_packages(self, sbom_format: SbomFileFormat) -> Iterator[Any]:
+        """
+        Iterate over packages of the document as raw JSON objects without validation: SPDX packages, or top-level
+        CycloneDX components.
+
+        :param sbom_format: format of the document, see `detect_format`.
+        :return: iterator over packages of the document.
+        """
+        logger.info(f"Reading {sbom_format.name} SBOM from file '{self._path}'...")
+        return iter_json_array_items(self._iter_chunks(), sbom_format.value)
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        with open(self._path, "rb") as file:
+            # Empty files cannot be mapped, the parser reports them as truncated documents.
+            if file.seek(0, 2) == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, len(mapped), self._chunk_size):
+                    yield mapped[start : start + self._chunk_size]  # noqa: E203
@@ -0,0 +1,260 @@
+"""
+Module containing the SQLite store of packages maintenance metadata shared by processes on the same host.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.arguments.action_arguments import ActionArguments
+from src.clients.package_maintenance.model import PackageMetadataProjection
+from src.models.commons import PackageKey, canonical_package_key
+from src.utils.list_utils import grouped
+
+SQLITE_CACHE_FILE_NAME = "packages-metadata.sqlite3"
+# Time to wait for locks held by other processes before giving up on a statement.
+SQLITE_BUSY_TIMEOUT_SECONDS = 30.0
+# Keys looked up or updated by a single statement, two parameters each, within the default limit of 999 parameters.
+SQLITE_KEYS_PER_STATEMENT = 400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages_metadata (
+    type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    package TEXT,
+    fetched_at REAL NOT NULL,
+    ttl_seconds INTEGER NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (type, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS packages_metadata_accessed_at ON packages_metadata (accessed_at);
+"""
+
+_UPSERT = """
+INSERT INTO packages_metadata (type, id, package, fetched_at, ttl_seconds, accessed_at) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (type, id) DO UPDATE SET
+    package = excluded.package,
+    fetched_at = excluded.fetched_at,
+    ttl_seconds = excluded.ttl_seconds,
+    accessed_at = excluded.accessed_at
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class SqlitePackagesMetadataCache:
+    """
+    Persistent cache of packages maintenance metadata in an SQLite database, with the same interface as
+    `PackagesMetadataCache`. It is meant for self-hosted runners, where every process on the host shares the same
+    database: fetched packages are written as soon as they are fetched, so concurrent runs see each other's results.
+
+    Packages are keyed by binary repository type and id. A batch of keys is looked up with a few `IN` queries
+    rather than one query per package. Each row records when it was fetched and for how long it stays fresh.
+    Entries are fresh while both the TTL of the writer and the TTL of the reader hold. When the cache is saved,
+    expired entries are deleted, and the least recently used ones are evicted over `max_entries`.
+
+    The database is opened in WAL mode, so readers do not block writers. Writes take the write lock up front and
+    wait for other writers up to `SQLITE_BUSY_TIMEOUT_SECONDS`. Database errors are logged and treated as cache
+    misses, so a busy or broken database never fails the action. The cache is safe to use from multiple threads.
+    """
+
+    @staticmethod
+    def create(arguments: ActionArguments) -> Optional["SqlitePackagesMetadataCache"]:
+        """
+        Create new cache from arguments. The database is stored in the cache directory.
+
+        :param arguments: action arguments to supplied to the action.
+        :return: opened cache, or None if cache is not configured or the database can not be opened.
+        """
+        if not arguments.cache_dir:
+            return None
+        path = os.path.join(arguments.cache_dir, SQLITE_CACHE_FILE_NAME)
+        try:
+            return SqlitePackagesMetadataCache.open(path, arguments.cache_ttl_seconds, arguments.cache_max_entries)
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to open packages metadata database '{path}': {error}. Cache is disabled.")
+            return None
+
+    @staticmethod
+    def open(
+        path: str,
+        ttl_seconds: int,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ) -> "SqlitePackagesMetadataCache":
+        """
+        Open the database at the given path, creating it if it does not exist.
+
+        :raises sqlite3.Error: if the database can not be opened.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        connection = sqlite3.connect(
+            path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False
+        )
+        try:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.executescript(_SCHEMA)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        logger.info(f"Opened packages metadata database '{path}'.")
+        return SqlitePackagesMetadataCache(connection, ttl_seconds, max_entries, clock)
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        ttl_seconds: int,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._connection = connection
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def split_cached(self, keys: Iterable[PackageKey]) -> Tuple[List[PackageMetadataProjection], List[PackageKey]]:
+        """
+        Splits packages into the ones with fresh cached maintenance metadata and the ones to be fetched.
+        See `PackagesMetadataCache.split_cached`.
+
+        :param keys: unique keys of packages to look up in the cache.
+        :return: cached maintenance metadata of found packages, and keys of packages that are missing in the cache.
+        """
+        keys = list(keys)
+        now = self._clock()
+        try:
+            rows = self._select_fresh(keys, now)
+            if rows:
+                # The write lock is taken only if there are entries to touch, so lookups missing the cache do not
+                # wait for other writers.
+                with self._lock, self._transaction():
+                    for keys_chunk in grouped([key for key in keys if key in rows], SQLITE_KEYS_PER_STATEMENT):
+                        self._connection.execute(
+                            f"UPDATE packages_metadata SET accessed_at = ? WHERE (type, id) IN ({_values(keys_chunk)})",
+                            [now, *_flatten(keys_chunk)],
+                        )
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to look up packages metadata database: {error}. Fetching all packages.")
+            return [], keys
+
+        cached_packages_maintenance: List[PackageMetadataProjection] = []
+        missing_keys: List[PackageKey] = []
+        for key in keys:
+            if key not in rows:
+                missing_keys.append(key)
+                continue
+            package = rows[key]
+            if package is not None:
+                cached_packages_maintenance.append(PackageMetadataProjection.model_validate_json(package))
+        logger.info(f"Packages metadata cache hits: {len(keys) - len(missing_keys)}, misses: {len(missing_keys)}.")
+        return cached_packages_maintenance, missing_keys
+
+    def put(self, keys: Iterable[PackageKey], packages_maintenance: Iterable[PackageMetadataProjection]):
+        """
+        Upserts fetched maintenance metadata into the database. See `PackagesMetadataCache.put`.
+
+        :param keys: keys of packages maintenance metadata was requested for.
+        :param packages_maintenance: fetched maintenance metadata.
+        """
+        now = self._clock()
+        rows: Dict[PackageKey, Optional[str]] = {key: None for key in keys}
+        for package in packages_maintenance:
+            key = canonical_package_key(package.binary_repository.type, package.binary_repository.id)
+            rows[key] = package.model_dump_json()
+        try:
+            with self._lock, self._transaction():
+                self._connection.executemany(
+                    _UPSERT,
+                    (
+                        (package_type, package_id, package, now, self._ttl_seconds, now)
+                        for (package_type, package_id), package in rows.items()
+                    ),
+                )
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to store {len(rows)} packages in packages metadata database: {error}")
+
+    def save(self):
+        """
+        Deletes expired entries and evicts the least recently used ones over the limit. Fetched packages are already
+        stored by `put`, so nothing is lost if the process is interrupted before.
+        """
+        now = self._clock()
+        try:
+            with self._lock, self._transaction():
+                self._connection.execute("DELETE FROM packages_metadata WHERE fetched_at + ttl_seconds < ?", [now])
+                (count,) = self._connection.execute("SELECT COUNT(*) FROM packages_metadata").fetchone()
+                if count > self._max_entries:
+                    self._connection.execute(
+                        "DELETE FROM packages_metadata WHERE (type, id) IN "
+                        "(SELECT type, id FROM packages_metadata ORDER BY accessed_at LIMIT ?)",
+                        [count - self._max_entries],
+                    )
+                    count = self._max_entries
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to clean up packages metadata database: {error}")
+            return
+        logger.info(f"Packages metadata database holds {count} entries.")
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _select_fresh(self, keys: List[PackageKey], now: float) -> Dict[PackageKey, Optional[str]]:
+        rows: Dict[PackageKey, Optional[str]] = {}
+        with self._lock:
+            for keys_chunk in grouped(keys, SQLITE_KEYS_PER_STATEMENT):
+                cursor = self._connection.execute(
+                    f"SELECT type, id, package FROM packages_metadata "
+                    f"WHERE (type, id) IN ({_values(keys_chunk)}) AND fetched_at + MIN(ttl_seconds, ?) >= ?",
+                    [*_flatten(keys_chunk), self._ttl_seconds, now],
+                )
+                for package_type, package_id, package in cursor:
+                    rows[(package_type, package_id)] = package
+        return rows
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._connection)
+
+
+class _Transaction:
+    """
+    Transaction taking the database write lock when it begins rather than on the first write, so that concurrent
+    writers wait for each other instead of failing with a deadlock.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def __enter__(self):
+        self._connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self._connection.execute("ROLLBACK")
+            return
+        try:
+            self._connection.execute("COMMIT")
+        except sqlite3.Error:
+            # A failed commit, e.g. when the database stays busy, leaves the transaction open, which would fail
+            # every following transaction.
+            if self._connection.in_transaction:
+                self._connection.execute("ROLLBACK")
+            raise
+
+
+def _values(keys: List[PackageKey]) -> str:
+    return "VALUES " + ", ".join(["(?, ?)"] * len(keys))
+
+
+def _flatten(keys: List[PackageKey]) -> Iterator[str]:
+    for package_type, package_id in keys:
+        yield package_type
+        yield package_id
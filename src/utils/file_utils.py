@@ -0,0 +1,47 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+
+@contextmanager
+def atomic_writer(path: str) -> Iterator[BinaryIO]:
+    """
+    Open a file for atomic writing: the content is written to a temporary file in the same directory first,
+    and the temporary file replaces the target one only when the context exits without an error.
+    An interrupted write never leaves a partially written file. Missing parent directories are created.
+    :param path: path of the file to write
+    :return: context manager of the binary file to write the content to
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}-")
+    try:
+        with os.fdopen(file_descriptor, "wb") as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def write_file_atomically(path: str, content: bytes) -> None:
+    """
+    Write content to a file atomically. See `atomic_writer` for more details.
+    :param path: path of the file to write
+    :param content: content to write
+    """
+    with atomic_writer(path) as f:
+        f.write(content)
+
+
+def iter_file_chunks(path: str, chunk_size: int) -> Iterator[bytes]:
+    """
+    Read a file in chunks of the given size.
+    :param path: path of the file to read
+    :param chunk_size: maximum size of a chunk in bytes
+    :return: iterator over the file chunks
+    """
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
@@ -0,0 +1,273 @@
+"""
+Module containing the incremental parser of JSON documents, to process large documents without loading them whole.
+"""
+
+import codecs
+import json
+import re
+from enum import Enum
+from typing import Any, Iterable, Iterator, List, Sequence
+
+_WHITESPACE = " \t\n\r"
+# Characters ending a string or escaping the next character within it.
+_STRING_SPECIAL = re.compile(r'["\\]')
+# Characters opening or closing a string, an object or an array within a composite value.
+_COMPOSITE_SPECIAL = re.compile(r'["{}\[\]]')
+# Characters following a number, `true`, `false` or `null`.
+_SCALAR_END = re.compile(r"[\s,:}\]]")
+
+
+class _State(Enum):
+    OBJECT_START = 0
+    KEY = 1
+    COLON = 2
+    VALUE = 3
+    OBJECT_NEXT = 4
+    ARRAY_START = 5
+    ARRAY_ITEM = 6
+    ARRAY_NEXT = 7
+    DONE = 8
+
+
+class JsonArrayStreamParser:
+    """
+    Incremental parser that extracts items of a single array nested in JSON objects, for instance `packages` of
+    `{"sbom": {"name": "...", "packages": [...]}}` with path `("sbom", "packages")`. The document is fed in chunks of
+    bytes, and the parser keeps in memory only the unparsed remainder of the fed data, so memory usage is bounded by
+    the size of the largest array item rather than by the size of the document.
+
+    Values of other keys on the path are scanned for their end without being decoded or buffered. The end of each
+    value is found before it is decoded, so values split across chunks are decoded once. Parsing stops as soon as
+    the array is closed, the rest of the document is not read. If the path is not found in the document, no items
+    are returned.
+
+    Notes:
+    - The parser is lenient and does not validate the document structure beyond what is needed to find the array.
+    - The parser does not perform any I/O, so it can be driven by both synchronous and asynchronous readers.
+    """
+
+    def __init__(self, path: Sequence[str]):
+        if not path:
+            raise ValueError("Path must contain at least one key")
+        self._path = path
+        self._depth = 0
+        self._key: Any = None
+        self._value: Any = None
+        self._state = _State.OBJECT_START
+        self._buffer = ""
+        self._pos = 0
+        # State of the scan of the value at the current position, see `_scan_value`.
+        self._scan_started = False
+        self._scan_end = 0
+        self._scan_depth = 0
+        self._scan_in_string = False
+        self._eof = False
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the array was fully parsed or the path was not found, so no more data is needed.
+        """
+        return self._state == _State.DONE
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Feed next chunk of the document.
+        :param chunk: next chunk of the document.
+        :return: array items completed by the chunk.
+        """
+        if self.done:
+            return []
+        self._trim_buffer()
+        self._buffer += self._text_decoder.decode(chunk)
+        return self._parse()
+
+    def close(self) -> List[Any]:
+        """
+        Signal the end of the document.
+        :return: array items completed by the end of the document.
+        :raises ValueError: if the document is malformed or truncated.
+        """
+        self._trim_buffer()
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._eof = True
+        items = self._parse() if not self.done else []
+        if not self.done:
+            raise ValueError("Unexpected end of JSON document")
+        return items
+
+    def _parse(self) -> List[Any]:
+        items: List[Any] = []
+        while self._state != _State.DONE:
+            if not self._skip_whitespace():
+                break
+            char = self._buffer[self._pos]
+            match self._state:
+                case _State.OBJECT_START:
+                    self._consume(char, "{", _State.KEY)
+                case _State.KEY:
+                    if char == "}":
+                        # The object is closed before the path was found.
+                        self._pos += 1
+                        self._state = _State.DONE
+                        continue
+                    if not self._decode_value():
+                        break
+                    self._key = self._value
+                    self._state = _State.COLON
+                case _State.COLON:
+                    self._consume(char, ":", _State.VALUE)
+                case _State.VALUE:
+                    if self._key != self._path[self._depth]:
+                        if not self._skip_value():
+                            break
+                        self._state = _State.OBJECT_NEXT
+                    elif self._depth == len(self._path) - 1:
+                        self._state = _State.ARRAY_START
+                    else:
+                        self._depth += 1
+                        self._state = _State.OBJECT_START
+                case _State.OBJECT_NEXT:
+                    if char == "}":
+                        self._pos += 1
+                        self._state = _State.DONE
+                    else:
+                        self._consume(char, ",", _State.KEY)
+                case _State.ARRAY_START:
+                    self._consume(char, "[", _State.ARRAY_ITEM)
+                case _State.ARRAY_ITEM:
+                    if char == "]":
+                        self._pos += 1
+                        self._state = _State.DONE
+                        continue
+                    if not self._decode_value():
+                        break
+                    items.append(self._value)
+                    self._state = _State.ARRAY_NEXT
+                case _State.ARRAY_NEXT:
+                    if char == "]":
+                        self._pos += 1
+                        self._state = _State.DONE
+                    else:
+                        self._consume(char, ",", _State.ARRAY_ITEM)
+        return items
+
+    def _skip_whitespace(self) -> bool:
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buffer)
+
+    def _consume(self, char: str, expected: str, next_state: _State) -> None:
+        if char != expected:
+            raise ValueError(f"Expected '{expected}' but found '{char}' at position {self._pos} of JSON document")
+        self._pos += 1
+        self._state = next_state
+
+    def _trim_buffer(self) -> None:
+        self._buffer = self._buffer[self._pos :]  # noqa: E203
+        self._scan_end -= self._pos
+        self._pos = 0
+
+    def _decode_value(self) -> bool:
+        """
+        Decodes value at the current position into `self._value`, once its end is found.
+        :return: True if the value was decoded, False if more data is needed.
+        """
+        if not self._scan_value():
+            return False
+        value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+        if end != self._scan_end:
+            raise ValueError(f"Invalid value at position {self._pos} of JSON document")
+        self._value = value
+        self._pos = end
+        return True
+
+    def _skip_value(self) -> bool:
+        """
+        Skips value at the current position. The scanned part of the value is dropped from the buffer, so skipped
+        values take no memory regardless of their size.
+        :return: True if the value was skipped, False if more data is needed.
+        """
+        completed = self._scan_value()
+        self._pos = self._scan_end
+        return completed
+
+    def _scan_value(self) -> bool:
+        """
+        Scans value at the current position for its end, resuming the scan where it stopped on the previous chunk.
+        Only strings and brackets are tracked, the value is validated when it is decoded.
+        :return: True if the end of the value was found at `self._scan_end`, False if more data is needed.
+        """
+        buffer = self._buffer
+        if not self._scan_started:
+            self._scan_started = True
+            self._scan_end = self._pos
+            self._scan_depth = 0
+            self._scan_in_string = False
+            char = buffer[self._pos]
+            if char == '"':
+                self._scan_in_string = True
+                self._scan_end += 1
+            elif char in "{[":
+                self._scan_depth = 1
+                self._scan_end += 1
+        pos = self._scan_end
+        depth = self._scan_depth
+        in_string = self._scan_in_string
+        completed = False
+        if depth == 0 and not in_string:
+            # Number or literal, which might continue in the next chunk unless it is followed by a delimiter.
+            match = _SCALAR_END.search(buffer, pos)
+            pos = match.start() if match else len(buffer)
+            completed = match is not None or self._eof
+        else:
+            while True:
+                match = (_STRING_SPECIAL if in_string else _COMPOSITE_SPECIAL).search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                pos = match.start()
+                char = buffer[pos]
+                if char == "\\":
+                    if pos + 1 == len(buffer):
+                        # The escaped character is in the next chunk.
+                        break
+                    pos += 2
+                    continue
+                pos += 1
+                if char == '"':
+                    in_string = not in_string
+                elif char in "{[":
+                    depth += 1
+                else:
+                    depth -= 1
+                if depth == 0 and not in_string:
+                    completed = True
+                    break
+        self._scan_end = pos
+        self._scan_depth = depth
+        self._scan_in_string = in_string
+        self._scan_started = not completed
+        return completed
+
+
+def iter_json_array_items(chunks: Iterable[bytes], path: Sequence[str]) -> Iterator[Any]:
+    """
+    Incrementally parse JSON document from chunks and yield items of the array at the given path.
+    Chunks are not read any further once the array is parsed.
+    See `JsonArrayStreamParser` for more details.
+    :param chunks: chunks of the JSON document.
+    :param path: keys of the nested objects leading to the array.
+    :return: iterator over the array items.
+    """
+    parser = JsonArrayStreamParser(path)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    yield from parser.close()
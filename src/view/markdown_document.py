@@ -1,3 +1,21 @@
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, NamedTuple, Optional, TextIO
+
+
+class OmittedContent(NamedTuple):
+    """
+    Content of a document left out to keep it within the max size.
+
+    :param rows: number of table rows left out.
+    :param sections: number of sections left out as a whole, e.g. reports of repositories.
+    :param fragments: number of other fragments left out, e.g. headings and text following the last fitting section.
+    """
+
+    rows: int = 0
+    sections: int = 0
+    fragments: int = 0
+
+
 class MarkdownDocument:
     """
     This is a mutable class for building Markdown documents.
@@ -6,45 +24,132 @@ class MarkdownDocument:
     - This class implements only a subset of the markdown specification for project purposes.
     - Full markdown specification can be found at: https://www.markdownguide.org/cheat-sheet/
     - Each method returns the current instance, so calls can be chained.
+    - Fragments are collected in a list and joined once, so building a document takes linear time in its size.
+    - If a sink is given, fragments are written to it as they are produced instead, so the document is never held
+      in memory as a whole. The content of such a document is empty.
+    - If a max size is given, the document is kept within it. Table rows that would grow the document over it are
+      left out, and the following rows are written if they still fit. Once any other fragment does not fit, it is
+      left out along with everything following it. Fragments written within a section are written all at once
+      if they all fit, or left out as a whole. Everything left out is counted, see `omitted`.
     """
 
-    def __init__(self, content: str = ""):
-        self._content = content
+    def __init__(self, content: str = "", sink: Optional[TextIO] = None, max_size: Optional[int] = None):
+        self._fragments: List[str] = []
+        self._sink = sink
+        self._max_size = max_size
+        self._size = 0
+        self._omitted = OmittedContent()
+        # Whether a fragment did not fit into the max size, so that nothing is written anymore.
+        self._full = False
+        # Fragments of the current section, written once the section is complete.
+        self._section: Optional[List[str]] = None
+        if content:
+            self._write(content)
 
     def get_content(self) -> str:
-        return self._content
+        return "".join(self._fragments)
+
+    @property
+    def size(self) -> int:
+        """
+        Size of the document written so far in bytes, as encoded in UTF-8.
+        """
+        return self._size
+
+    @property
+    def size_limited(self) -> bool:
+        """
+        Whether table rows are left out to keep the document within the max size.
+        """
+        return self._max_size is not None
+
+    @property
+    def omitted(self) -> OmittedContent:
+        """
+        Content left out to keep the document within the max size.
+        """
+        return self._omitted
+
+    @contextmanager
+    def section(self) -> Iterator["MarkdownDocument"]:
+        """
+        Groups fragments written within the context into a section, which is written as a whole if it fits into the
+        max size, or left out as a whole otherwise. Table rows within the section are left out as usual.
+        Sections cannot be nested.
+        """
+        if self._section is not None:
+            raise ValueError("Sections cannot be nested")
+        size = self._size
+        omitted = self._omitted
+        self._section = []
+        try:
+            yield self
+        finally:
+            fragments, self._section = self._section, None
+        if self._full:
+            # Rows left out of the section are counted as part of it.
+            self._size = size
+            self._omitted = omitted._replace(sections=omitted.sections + 1)
+        else:
+            self._write_out("".join(fragments))
 
     def heading(self, text: str, level: int = 1) -> "MarkdownDocument":
         if not (1 <= level <= 6):
             raise ValueError("Heading level must be between 1 and 6")
-        self._content += f"{'#' * level} {text}\n"
+        self._write(f"{'#' * level} {text}\n")
         return self
 
     def bold(self, text: str) -> "MarkdownDocument":
-        self._content += f"**{text}**\n"
+        self._write(f"**{text}**\n")
         return self
 
     def italic(self, text: str) -> "MarkdownDocument":
-        self._content += f"*{text}*\n"
+        self._write(f"*{text}*\n")
         return self
 
-    def table(self, headers: list[str], rows: list[list[str]]) -> "MarkdownDocument":
-        # Validate the number of columns in each row
+    def table(self, headers: list[str], rows: Iterable[list[str]]) -> "MarkdownDocument":
+        """
+        Appends a table. Rows may be produced lazily, e.g. by a generator, and each row is written as it is produced.
+        Rows not fitting into the max size are left out, and the following rows are written if they still fit.
+        """
         column_count = len(headers)
+        self._write("| " + " | ".join(headers) + " |\n")
+        self._write("| " + " | ".join(["---"] * column_count) + " |\n")
         for row in rows:
+            # Validate the number of columns in each row
             if len(row) != column_count:
                 raise ValueError("Each row must have the same number of columns as the headers")
-
-        # Create the table
-        self._content += "| " + " | ".join(headers) + " |\n"
-        self._content += "| " + " | ".join(["---"] * column_count) + " |\n"
-        for row in rows:
-            self._content += "| " + " | ".join(row) + " |\n"
+            line = "| " + " | ".join(row) + " |\n"
+            if self._full or not self._fits(line):
+                self._omitted = self._omitted._replace(rows=self._omitted.rows + 1)
+                continue
+            self._write(line)
         return self
 
     def empty_line(self) -> "MarkdownDocument":
         return self.text("")
 
     def text(self, text: str) -> "MarkdownDocument":
-        self._content += f"{text}\n"
+        self._write(f"{text}\n")
         return self
+
+    def _fits(self, fragment: str) -> bool:
+        return self._max_size is None or self._size + len(fragment.encode()) <= self._max_size
+
+    def _write(self, fragment: str) -> None:
+        if self._full or not self._fits(fragment):
+            self._full = True
+            if self._section is None:
+                self._omitted = self._omitted._replace(fragments=self._omitted.fragments + 1)
+            return
+        self._size += len(fragment.encode())
+        if self._section is not None:
+            self._section.append(fragment)
+        else:
+            self._write_out(fragment)
+
+    def _write_out(self, fragment: str) -> None:
+        if self._sink is not None:
+            self._sink.write(fragment)
+        else:
+            self._fragments.append(fragment)
@@ -1,6 +1,16 @@
+import html
+
+
 def render_code(text: str):
     return f"<code>{text}</code>"
 
 
 def render_url(name: str, url: str):
     return f"[{name}]({url})"
+
+
+def render_table_cell(text: str):
+    """
+    Renders arbitrary text, for instance an error message, so that it stays within a single table cell.
+    """
+    return html.escape(text, quote=False).replace("|", "\\|").replace("\r\n", "<br>").replace("\n", "<br>")
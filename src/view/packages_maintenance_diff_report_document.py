@@ -0,0 +1,88 @@
+from typing import List, Optional, TextIO
+
+from packageurl import PackageURL
+
+from src.models.packages_diff import PackagesDiff
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+from src.view.markdown_document import MarkdownDocument, OmittedContent
+from src.view.markdown_utils import render_code
+from src.view.packages_maintenance_report_document import NA, PackagesMaintenanceReportDocument, render_footer
+
+NEW_CHANGE = "new"
+UPDATED_CHANGE = "updated"
+REMOVED_CHANGE = "removed"
+
+
+class PackagesMaintenanceDiffReportDocument:
+    """
+    Represents a markdown document for a package maintenance report on dependency changes, for instance of
+    a pull request: the changed packages, followed by the maintenance data of new and updated packages.
+    """
+
+    def __init__(self, report: PackagesMaintenanceReport, diff: PackagesDiff):
+        self._report = report
+        self._diff = diff
+
+    def render(self) -> str:
+        """
+        Renders the report as a markdown string.
+        """
+        report = MarkdownDocument()
+        self._render(report)
+
+        content = report.get_content()
+        return content
+
+    def write(self, sink: TextIO, max_size: Optional[int] = None) -> OmittedContent:
+        """
+        Writes the report as markdown to the given sink as it is rendered, without holding the whole report.
+
+        :param sink: file-like object to write the report to.
+        :param max_size: size in bytes the report is kept within, if any. Content not fitting is left out.
+        :return: content left out to keep the report within the max size.
+        """
+        report = MarkdownDocument(sink=sink, max_size=max_size)
+        self._render(report)
+        return report.omitted
+
+    def _render(self, report: MarkdownDocument) -> None:
+        self._render_header(report)
+        self._render_changed_packages(report)
+        PackagesMaintenanceReportDocument(self._report).render_packages(report)
+        render_footer(report)
+
+    def _render_header(self, report: MarkdownDocument) -> None:
+        report.heading("Package maintenance report of dependency changes", level=3)
+        report.text(
+            f"This report provides brief information about maintenance status of dependencies changed between "
+            f"{render_code(self._diff.base_ref())} and {render_code(self._diff.head_ref())}. "
+            f"Only new and updated packages are checked.\n"
+        )
+
+    def _render_changed_packages(self, report: MarkdownDocument) -> None:
+        report.heading("Changed packages", level=3)
+        report.text("")
+        rows = [
+            *self._render_changed_packages_rows(NEW_CHANGE, self._diff.new_packages_urls()),
+            *self._render_changed_packages_rows(UPDATED_CHANGE, self._diff.updated_packages_urls()),
+            *self._render_changed_packages_rows(REMOVED_CHANGE, self._diff.removed_packages_urls()),
+        ]
+        if not rows:
+            report.text("No packages are changed.")
+            report.empty_line()
+            return
+        headers = ["Change", "Type", "Namespace", "Name", "Version"]
+        report.table(headers=headers, rows=rows)
+        report.empty_line()
+
+    def _render_changed_packages_rows(self, change: str, packages_urls: List[PackageURL]) -> List[List[str]]:
+        return [
+            [
+                change,
+                package_url.type,
+                package_url.namespace or NA,
+                package_url.name,
+                render_code(package_url.version) if package_url.version else NA,
+            ]
+            for package_url in packages_urls
+        ]
@@ -0,0 +1,53 @@
+import csv
+from typing import List, Mapping, TextIO
+
+from src.arguments.action_arguments import MaintenanceMetricSlug
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+from src.models.packages_maintenance_report_row import PackagesMaintenanceReportRow
+from src.models.threshold_evaluator import METRIC_ACCESSORS
+
+METRICS = list(MaintenanceMetricSlug)
+HEADERS = [
+    "repository",
+    "type",
+    "id",
+    "latest_version",
+    "binary_url",
+    "source_url",
+    *(f"{metric.value}_{field}" for metric in METRICS for field in ("value", "score")),
+    "below_threshold_metrics",
+]
+
+
+def write_found_packages_csv(sink: TextIO, reports: Mapping[str, PackagesMaintenanceReport]) -> None:
+    """
+    Writes found packages of the given reports as CSV, one row per package and repository, with the value and
+    the score of each metric in separate columns, so the complete table can be processed by other tools.
+
+    :param sink: file-like object to write CSV to, opened with `newline=""`.
+    :param reports: reports to write, by repository in the form of owner/repo.
+    """
+    writer = csv.writer(sink)
+    writer.writerow(HEADERS)
+    for repository, report in reports.items():
+        writer.writerows(_render_row(repository, row) for row in report.found_packages())
+
+
+def _render_row(repository: str, row: PackagesMaintenanceReportRow) -> List[str]:
+    binary_repository = row.package.binary_repository
+    source_repository = row.package.source_repository
+    metrics: List[str] = []
+    for metric in METRICS:
+        package_metric = METRIC_ACCESSORS[metric](row.package)
+        metrics.extend([str(package_metric.value), package_metric.score] if package_metric else ["", ""])
+    below_threshold_metrics = " ".join(sorted(metric.value for metric in row.below_threshold_metrics))
+    return [
+        repository,
+        binary_repository.type,
+        binary_repository.id,
+        binary_repository.latest_version,
+        binary_repository.url,
+        source_repository.url if source_repository else "",
+        *metrics,
+        below_threshold_metrics,
+    ]
@@ -1,10 +1,10 @@
-from typing import Optional, List, Set
+from typing import Optional, List, Set, TextIO
 
 from src.arguments.action_arguments import MaintenanceMetricSlug
-from src.clients.package_maintenance.model import MaintenanceMetric
+from src.models.compact_package_metadata import CompactMetric
 from src.models.packages_maintenance_report import PackagesMaintenanceReport
 from src.models.packages_maintenance_report_row import PackagesMaintenanceReportRow
-from src.view.markdown_document import MarkdownDocument
+from src.view.markdown_document import MarkdownDocument, OmittedContent
 from src.view.markdown_utils import render_url, render_code
 
 NA = "`*`"
@@ -25,25 +25,60 @@ METRIC_SCORE_MARKS = {
 class PackagesMaintenanceReportDocument:
     """
     Represents a markdown document for a package maintenance report.
+    If the repository is given, the report is titled with it, to tell reports of several repositories apart.
     """
 
-    def __init__(self, report: PackagesMaintenanceReport):
+    def __init__(self, report: PackagesMaintenanceReport, repository: Optional[str] = None):
         self._report = report
+        self._repository = repository
 
     def render(self) -> str:
         """
         Renders the report as a markdown string.
         """
         report = MarkdownDocument()
-        self._render_header(report)
-        self._render_found_packages(report)
-        self._render_missing_packages(report)
-        self._report_footer(report)
+        self._render(report)
 
         content = report.get_content()
         return content
 
+    def write(self, sink: TextIO, max_size: Optional[int] = None) -> OmittedContent:
+        """
+        Writes the report as markdown to the given sink as it is rendered, without holding the whole report.
+
+        :param sink: file-like object to write the report to.
+        :param max_size: size in bytes the report is kept within, if any. Content not fitting is left out.
+        :return: content left out to keep the report within the max size.
+        """
+        report = MarkdownDocument(sink=sink, max_size=max_size)
+        self._render(report)
+        return report.omitted
+
+    def _render(self, report: MarkdownDocument) -> None:
+        self.render_sections(report)
+        render_footer(report)
+
+    def render_sections(self, report: MarkdownDocument) -> None:
+        """
+        Renders the report sections without the footer into the given document, to embed them into another report.
+        """
+        self._render_header(report)
+        self.render_packages(report)
+
+    def render_packages(self, report: MarkdownDocument) -> None:
+        """
+        Renders the found and missing packages sections into the given document, to embed them under another header.
+        """
+        self._render_found_packages(report)
+        self._render_missing_packages(report)
+
     def _render_header(self, report: MarkdownDocument) -> None:
+        if self._repository:
+            report.heading(f"Package maintenance report of {render_code(self._repository)}", level=3)
+            report.text(
+                "This report provides brief information about the repository dependencies maintenance status.\n"
+            )
+            return
         report.heading("Package maintenance report", level=3)
         report.text(
             "This report provides brief information about current repository dependencies maintenance status.\n"
@@ -66,7 +101,14 @@ class PackagesMaintenanceReportDocument:
             "Pull requests open percentage",
         ]
 
-        rows = [self._render_found_packages_row(package) for package in self._report.found_packages()]
+        found_packages = self._report.found_packages()
+        if report.size_limited:
+            # Packages below the threshold are listed first, so that they are the last to be left out.
+            below_threshold_packages = self._report.below_threshold_packages()
+            found_packages = below_threshold_packages + [
+                row for row in found_packages if not row.is_maintenance_below_threshold()
+            ]
+        rows = (self._render_found_packages_row(package) for package in found_packages)
 
         report.table(headers=headers, rows=rows)
         report.empty_line()
@@ -166,7 +208,7 @@ class PackagesMaintenanceReportDocument:
 
     def _render_maintenance_metric(
         self,
-        metric: Optional[MaintenanceMetric],
+        metric: Optional[CompactMetric],
         slug: MaintenanceMetricSlug,
         below_threshold_metrics: Set[MaintenanceMetricSlug],
     ) -> str:
@@ -182,8 +224,8 @@ class PackagesMaintenanceReportDocument:
         return rendered_metric
 
     def _render_missing_packages(self, report):
-        missing_data_packages = self._report.missing_data_packages()
-        if not missing_data_packages:
+        missing_data_packages_by_key = self._report.missing_data_packages_by_key()
+        if not missing_data_packages_by_key:
             return
 
         report.empty_line()
@@ -191,12 +233,20 @@ class PackagesMaintenanceReportDocument:
         report.text("The following packages are missing maintenance data in the package-maintenance.dev index")
         report.empty_line()
         headers = ["Type", "Namespace", "Name"]
-        rows = list(set((package.type, package.namespace or NA, package.name) for package in missing_data_packages))
+        # A package is listed once, as it is first referenced, however many versions or spellings of it are referenced.
+        rows = [
+            [package.type, package.namespace or NA, package.name]
+            for package, *_ in missing_data_packages_by_key.values()
+        ]
         report.table(headers=headers, rows=rows)
 
-    def _report_footer(self, report: MarkdownDocument) -> None:
-        report.empty_line()
-        report.text("This report was generated by the Package Maintenance Report Action.")
-        report.text(
-            "For more information, visit [action documentation](https://github.com/package-maintenance-dev/github-action)."
-        )
+
+def render_footer(report: MarkdownDocument) -> None:
+    """
+    Renders the footer shared by all reports.
+    """
+    report.empty_line()
+    report.text("This report was generated by the Package Maintenance Report Action.")
+    report.text(
+        "For more information, visit [action documentation](https://github.com/package-maintenance-dev/github-action)."
+    )
@@ -0,0 +1,114 @@
+import datetime
+import json
+import os
+from typing import Any, Dict, Iterator, List, Mapping, Optional, TextIO
+
+from packageurl import PackageURL
+
+from src.arguments.action_arguments import ActionArguments, MaintenanceMetricScore, MaintenanceMetricSlug
+from src.models.commons import PackageKey, canonical_package_key
+from src.models.packages_diff import PackagesDiff
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+from src.models.packages_maintenance_report_row import PackagesMaintenanceReportRow
+from src.models.threshold_evaluator import METRIC_ACCESSORS
+
+# Version of the records format, increased on incompatible changes.
+JSONL_FORMAT_VERSION = 1
+RUN_RECORD_TYPE = "run"
+PACKAGE_RECORD_TYPE = "package"
+
+METRICS = list(MaintenanceMetricSlug)
+
+# Encoder is created once, compact separators keep the records small.
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def create_run_metadata(arguments: ActionArguments, packages_diff: Optional[PackagesDiff] = None) -> Dict[str, Any]:
+    """
+    Creates metadata of the action run, written as the first record. GitHub Actions run details are taken from
+    the environment variables, if available.
+    """
+    thresholds = {
+        metric.value: MaintenanceMetricScore(score).value
+        for metric, score in arguments.packages_scores_thresholds.items()
+    }
+    return {
+        "type": RUN_RECORD_TYPE,
+        "version": JSONL_FORMAT_VERSION,
+        "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "github_repository": os.getenv("GITHUB_REPOSITORY"),
+        "github_run_id": os.getenv("GITHUB_RUN_ID"),
+        "github_sha": os.getenv("GITHUB_SHA"),
+        "packages_scores_thresholds": thresholds,
+        "diff": (
+            {"base_ref": packages_diff.base_ref(), "head_ref": packages_diff.head_ref()} if packages_diff else None
+        ),
+    }
+
+
+def write_packages_jsonl(
+    sink: TextIO, reports: Mapping[str, PackagesMaintenanceReport], run_metadata: Dict[str, Any]
+) -> None:
+    """
+    Writes reports as JSON Lines: the run metadata record followed by a record per package and repository,
+    both found and missing in the package-maintenance.dev index. Records are written as they are serialized.
+
+    :param sink: file-like object to write records to.
+    :param reports: reports to write, by repository in the form of owner/repo.
+    :param run_metadata: metadata of the run, see `create_run_metadata`.
+    """
+    sink.write(_ENCODER.encode(run_metadata) + "\n")
+    for repository, report in reports.items():
+        for record in _iter_package_records(repository, report):
+            sink.write(_ENCODER.encode(record) + "\n")
+
+
+def _iter_package_records(repository: str, report: PackagesMaintenanceReport) -> Iterator[Dict[str, Any]]:
+    for row in report.found_packages():
+        yield _found_package_record(repository, row)
+    for key, packages_urls in report.missing_data_packages_by_key().items():
+        yield _missing_package_record(repository, key, packages_urls)
+
+
+def _found_package_record(repository: str, row: PackagesMaintenanceReportRow) -> Dict[str, Any]:
+    package = row.package
+    binary_repository = package.binary_repository
+    source_repository = package.source_repository
+    metrics: Dict[str, Optional[Dict[str, Any]]] = {}
+    for metric in METRICS:
+        package_metric = METRIC_ACCESSORS[metric](package)
+        metrics[metric.value] = (
+            {"value": package_metric.value, "score": package_metric.score} if package_metric else None
+        )
+    return {
+        "type": PACKAGE_RECORD_TYPE,
+        "repository": repository,
+        # Same canonical key as of missing packages, so that a package is identified the same way in every record.
+        "key": list(canonical_package_key(binary_repository.type, binary_repository.id)),
+        "packages_urls": _render_packages_urls(row.packages_urls),
+        "missing_data": False,
+        "latest_version": binary_repository.latest_version,
+        "binary_url": binary_repository.url,
+        "source_url": source_repository.url if source_repository else None,
+        "metrics": metrics,
+        "below_threshold_metrics": sorted(metric.value for metric in row.below_threshold_metrics),
+    }
+
+
+def _missing_package_record(repository: str, key: PackageKey, packages_urls: List[PackageURL]) -> Dict[str, Any]:
+    return {
+        "type": PACKAGE_RECORD_TYPE,
+        "repository": repository,
+        "key": list(key),
+        "packages_urls": _render_packages_urls(packages_urls),
+        "missing_data": True,
+        "latest_version": None,
+        "binary_url": None,
+        "source_url": None,
+        "metrics": {metric.value: None for metric in METRICS},
+        "below_threshold_metrics": [],
+    }
+
+
+def _render_packages_urls(packages_urls: List[PackageURL]) -> List[str]:
+    return [package_url.to_string() for package_url in packages_urls]
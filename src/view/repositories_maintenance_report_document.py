@@ -0,0 +1,117 @@
+from typing import List, Optional, TextIO
+
+from src.models.repositories_maintenance_report import BelowThresholdPackageUsage, RepositoriesMaintenanceReport
+from src.view.markdown_document import MarkdownDocument, OmittedContent
+from src.view.markdown_utils import render_code, render_table_cell
+from src.view.packages_maintenance_report_document import (
+    ERROR_SIGN,
+    PackagesMaintenanceReportDocument,
+    render_footer,
+)
+
+# Number of repositories listed for a package below the threshold, the rest are only counted.
+MAX_LISTED_REPOSITORIES = 5
+
+
+class RepositoriesMaintenanceReportDocument:
+    """
+    Represents a markdown document for a rollup of several repositories maintenance reports:
+    a summary of the repositories, packages below the threshold across them, and the report of each repository.
+    """
+
+    def __init__(self, report: RepositoriesMaintenanceReport):
+        self._report = report
+
+    def render(self) -> str:
+        """
+        Renders the report as a markdown string.
+        """
+        report = MarkdownDocument()
+        self._render(report)
+
+        content = report.get_content()
+        return content
+
+    def write(self, sink: TextIO, max_size: Optional[int] = None) -> OmittedContent:
+        """
+        Writes the report as markdown to the given sink as it is rendered, without holding the whole report.
+
+        :param sink: file-like object to write the report to.
+        :param max_size: size in bytes the report is kept within, if any. Content not fitting is left out.
+        :return: content left out to keep the report within the max size.
+        """
+        report = MarkdownDocument(sink=sink, max_size=max_size)
+        self._render(report)
+        return report.omitted
+
+    def _render(self, report: MarkdownDocument) -> None:
+        self._render_header(report)
+        self._render_repositories(report)
+        self._render_failed_repositories(report)
+        self._render_below_threshold_packages(report)
+        self._render_repositories_reports(report)
+        render_footer(report)
+
+    def _render_header(self, report: MarkdownDocument) -> None:
+        report.heading("Repositories package maintenance report", level=2)
+        report.text(
+            "This report provides brief information about several repositories dependencies maintenance status.\n"
+        )
+
+    def _render_repositories(self, report: MarkdownDocument) -> None:
+        report.heading("Repositories", level=3)
+        report.text("")
+        headers = ["Repository", "Packages", "Below threshold", "Missing data"]
+        rows = [
+            [
+                render_code(summary.repository),
+                str(summary.packages_count),
+                f"{ERROR_SIGN} {summary.below_threshold_count}" if summary.below_threshold_count else "0",
+                str(summary.missing_data_count),
+            ]
+            for summary in self._report.repositories_summaries()
+        ]
+        report.table(headers=headers, rows=rows)
+
+    def _render_failed_repositories(self, report: MarkdownDocument) -> None:
+        failed_repositories = self._report.failed_repositories()
+        if not failed_repositories:
+            return
+
+        report.empty_line()
+        report.heading("Failed repositories", level=3)
+        report.text("The following repositories failed to be scanned")
+        report.empty_line()
+        rows = [
+            [render_code(repository), render_table_cell(error)] for repository, error in failed_repositories.items()
+        ]
+        report.table(headers=["Repository", "Error"], rows=rows)
+
+    def _render_below_threshold_packages(self, report: MarkdownDocument) -> None:
+        below_threshold_packages = self._report.below_threshold_packages()
+        if not below_threshold_packages:
+            return
+
+        report.empty_line()
+        report.heading("Packages below threshold", level=3)
+        report.text("The following packages have maintenance scores below the threshold in scanned repositories")
+        report.empty_line()
+        headers = ["Type", "Id", "Below threshold metrics", "Repositories"]
+        rows = (self._render_below_threshold_package_row(usage) for usage in below_threshold_packages)
+        report.table(headers=headers, rows=rows)
+
+    def _render_below_threshold_package_row(self, usage: BelowThresholdPackageUsage) -> List[str]:
+        binary_repository = usage.package.binary_repository
+        metrics = ", ".join(sorted(render_code(metric.value) for metric in usage.below_threshold_metrics))
+        repositories = ", ".join(render_code(repository) for repository in usage.repositories[:MAX_LISTED_REPOSITORIES])
+        not_listed_count = len(usage.repositories) - MAX_LISTED_REPOSITORIES
+        if not_listed_count > 0:
+            repositories += f" and {not_listed_count} more"
+        return [binary_repository.type, binary_repository.id, metrics, f"{len(usage.repositories)}: {repositories}"]
+
+    def _render_repositories_reports(self, report: MarkdownDocument) -> None:
+        for repository, repository_report in self._report.repositories_reports().items():
+            # The report of a repository is either written whole or left out, to keep the rollup within the max size.
+            with report.section():
+                report.empty_line()
+                PackagesMaintenanceReportDocument(repository_report, repository).render_sections(report)
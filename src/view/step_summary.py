@@ -0,0 +1,119 @@
+"""
+Module containing the writer of reports to the GitHub step summary.
+"""
+
+import logging
+import os
+import sys
+from typing import Callable, Mapping, Optional, TextIO
+
+from src.arguments.action_arguments import ActionArguments
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+from src.view.markdown_document import MarkdownDocument, OmittedContent
+from src.view.markdown_utils import render_code, render_url
+from src.view.packages_maintenance_report_csv import write_found_packages_csv
+
+# GitHub rejects step summaries larger than 1 MiB.
+STEP_SUMMARY_MAX_SIZE = 1024 * 1024
+OVERFLOW_MARKDOWN_FILE = "package-maintenance-report.md"
+OVERFLOW_CSV_FILE = "package-maintenance-report.csv"
+
+# Function writing a rendered report to the given sink within the given size, returning content left out,
+# e.g. `PackagesMaintenanceReportDocument.write`.
+WriteReport = Callable[[TextIO, Optional[int]], OmittedContent]
+# Largest count rendered into the overflow notice, to reserve room for the notice before the report is written.
+_MAX_NOTICE_COUNT = 10**12
+
+logger = logging.getLogger(__name__)
+
+
+class StepSummaryWriter:
+    """
+    Writes reports to the GitHub step summary, or to stdout if the summary is not available. Reports are written to
+    the summary as they are rendered, and they are kept within the summary size limit: content not fitting is left
+    out, see `MarkdownDocument`, and the complete report is written to the report directory as Markdown and CSV
+    instead, to be uploaded as a workflow artifact. The summary then links to the artifacts of the workflow run.
+    """
+
+    @staticmethod
+    def create(arguments: ActionArguments) -> "StepSummaryWriter":
+        """
+        Create new step summary writer from arguments and GitHub Actions environment variables
+
+        :param arguments: action arguments to supplied to the action.
+        :return: constructed step summary writer.
+        """
+        server_url = os.getenv("GITHUB_SERVER_URL")
+        repository = os.getenv("GITHUB_REPOSITORY")
+        run_id = os.getenv("GITHUB_RUN_ID")
+        artifacts_url = (
+            f"{server_url}/{repository}/actions/runs/{run_id}" if server_url and repository and run_id else None
+        )
+        return StepSummaryWriter(
+            summary_file=os.getenv("GITHUB_STEP_SUMMARY"),
+            report_dir=arguments.report_dir,
+            artifacts_url=artifacts_url,
+        )
+
+    def __init__(
+        self,
+        summary_file: Optional[str],
+        report_dir: str,
+        artifacts_url: Optional[str] = None,
+        max_size: int = STEP_SUMMARY_MAX_SIZE,
+    ):
+        self._summary_file = summary_file
+        self._report_dir = report_dir
+        self._artifacts_url = artifacts_url
+        self._max_size = max_size
+
+    def write(self, write_report: WriteReport, reports: Mapping[str, PackagesMaintenanceReport]) -> None:
+        """
+        Write report to the step summary, and the complete report to the report directory if it does not fit.
+
+        :param write_report: function writing the rendered report.
+        :param reports: reports the rendered report is based on, by repository, to write the complete table as CSV.
+        """
+        if not self._summary_file:
+            print("GITHUB_STEP_SUMMARY is not set. Printing the report to stdout: ")
+            write_report(sys.stdout, None)
+            return
+
+        written_size = os.path.getsize(self._summary_file) if os.path.exists(self._summary_file) else 0
+        # Room is left for the overflow notice, which is written after the report if anything is left out.
+        max_notice = OmittedContent(_MAX_NOTICE_COUNT, _MAX_NOTICE_COUNT, _MAX_NOTICE_COUNT)
+        notice_size = len(self._render_overflow_notice(max_notice).encode())
+        max_size = max(0, self._max_size - notice_size - written_size)
+        with open(self._summary_file, "a", encoding="utf-8") as summary:
+            omitted = write_report(summary, max_size)
+            if any(omitted):
+                logger.warning(
+                    f"{omitted.rows} table rows and {omitted.sections} repository reports did not fit into the step "
+                    f"summary. Writing the complete report..."
+                )
+                self._write_complete_report(write_report, reports)
+                summary.write(self._render_overflow_notice(omitted))
+
+    def _write_complete_report(self, write_report: WriteReport, reports: Mapping[str, PackagesMaintenanceReport]):
+        os.makedirs(self._report_dir, exist_ok=True)
+        with open(os.path.join(self._report_dir, OVERFLOW_MARKDOWN_FILE), "w", encoding="utf-8") as markdown:
+            write_report(markdown, None)
+        with open(os.path.join(self._report_dir, OVERFLOW_CSV_FILE), "w", encoding="utf-8", newline="") as csv:
+            write_found_packages_csv(csv, reports)
+
+    def _render_overflow_notice(self, omitted: OmittedContent) -> str:
+        notice = MarkdownDocument()
+        notice.empty_line()
+        notice.heading("Truncated report", level=3)
+        notice.text(
+            f"The report is truncated to fit the step summary size limit: {omitted.rows} table rows and "
+            f"{omitted.sections} repository reports were left out, packages below the threshold are listed first. "
+            f"The complete report is written to {render_code(self._report_dir)} as "
+            f"{render_code(OVERFLOW_MARKDOWN_FILE)} and {render_code(OVERFLOW_CSV_FILE)}."
+        )
+        if self._artifacts_url:
+            notice.text(
+                f"If the directory is uploaded as an artifact, find it among "
+                f"{render_url('the workflow run artifacts', self._artifacts_url)}."
+            )
+        return notice.get_content()
@@ -1,9 +1,12 @@
+import json
 import pytest
 from argparse import Namespace
 from packageurl import PackageURL
-from src.arguments.action_arguments import MaintenanceMetricSlug, MaintenanceMetricScore, ActionArguments
+from src.arguments.action_arguments import MaintenanceMetricSlug, MaintenanceMetricScore, ActionArguments, \
+    DEFAULT_MAX_CONCURRENCY, CacheBackend
 from src.arguments.parse_action_arguments import _parse_github_repository, _parse_packages_ignore, \
-    _parse_packages_scores_thresholds, parse_action_arguments
+    _parse_packages_scores_thresholds, parse_action_arguments, _parse_max_concurrency, _parse_boolean, _parse_sbom_file, _parse_lockfiles, \
+    _parse_cache_backend
 
 
 def test_parse_github_repository():
@@ -50,3 +53,117 @@ def test_parse_action_arguments():
     assert result.github_repository_name == "repo"
     assert len(result.packages_ignore) == 2
     assert result.packages_scores_thresholds[MaintenanceMetricSlug("source_commit_frequency")] == MaintenanceMetricScore("A")
+
+def test_parse_max_concurrency():
+    assert _parse_max_concurrency(None) == DEFAULT_MAX_CONCURRENCY
+    assert _parse_max_concurrency("") == DEFAULT_MAX_CONCURRENCY
+    assert _parse_max_concurrency("8") == 8
+
+    with pytest.raises(ValueError, match="Invalid max concurrency"):
+        _parse_max_concurrency("0")
+    with pytest.raises(ValueError, match="Invalid max concurrency"):
+        _parse_max_concurrency("many")
+
+
+def test_parse_boolean():
+    assert _parse_boolean(None, False, "flag") is False
+    assert _parse_boolean("", True, "flag") is True
+    assert _parse_boolean("True", False, "flag") is True
+    assert _parse_boolean("false", True, "flag") is False
+
+    with pytest.raises(ValueError, match="Invalid flag"):
+        _parse_boolean("yes", False, "flag")
+
+
+def test_parse_multi_repository_scan_arguments(monkeypatch):
+    monkeypatch.delenv("GITHUB_REPOSITORY", raising=False)
+    args = Namespace(
+        github_repository=None,
+        github_token="token",
+        packages_ignore=None,
+        packages_scores_thresholds=None,
+        github_repositories="owner/repo-a\n owner/repo-b , owner/repo-a\n",
+        github_organization=" organization ",
+    )
+    result = parse_action_arguments(args)
+    assert result.github_repositories == [("owner", "repo-a"), ("owner", "repo-b")]
+    assert result.github_organization == "organization"
+    assert result.is_multi_repository_scan()
+
+    with pytest.raises(ValueError, match="Invalid format for GitHub repository"):
+        parse_action_arguments(Namespace(**{**vars(args), "github_repositories": "owner"}))
+
+
+def test_parse_diff_refs(monkeypatch):
+    monkeypatch.setenv("GITHUB_SHA", "abc123")
+    monkeypatch.delenv("GITHUB_EVENT_PATH", raising=False)
+    args = Namespace(
+        github_repository="owner/repo",
+        github_token="token",
+        packages_ignore=None,
+        packages_scores_thresholds=None,
+        diff_base_ref=" main ",
+        diff_head_ref="",
+    )
+    result = parse_action_arguments(args)
+    assert (result.diff_base_ref, result.diff_head_ref) == ("main", "abc123")
+    assert result.is_diff()
+
+    result = parse_action_arguments(Namespace(**{**vars(args), "diff_base_ref": ""}))
+    assert (result.diff_base_ref, result.diff_head_ref) == (None, None)
+    assert not result.is_diff()
+
+    monkeypatch.delenv("GITHUB_SHA")
+    with pytest.raises(ValueError, match="Invalid diff head revision"):
+        parse_action_arguments(args)
+
+
+def test_diff_head_ref_defaults_to_pull_request_head(monkeypatch, tmp_path):
+    event_path = tmp_path / "event.json"
+    event_path.write_text(json.dumps({"pull_request": {"head": {"sha": "head123"}, "base": {"sha": "base123"}}}))
+    monkeypatch.setenv("GITHUB_SHA", "merge123")
+    monkeypatch.setenv("GITHUB_EVENT_PATH", str(event_path))
+    args = Namespace(
+        github_repository="owner/repo",
+        github_token="token",
+        packages_ignore=None,
+        packages_scores_thresholds=None,
+        diff_base_ref="base123",
+        diff_head_ref="",
+    )
+
+    assert parse_action_arguments(args).diff_head_ref == "head123"
+    assert parse_action_arguments(Namespace(**{**vars(args), "diff_head_ref": "feature"})).diff_head_ref == "feature"
+
+    # Events other than pull requests have no pull request head.
+    event_path.write_text(json.dumps({"ref": "refs/heads/main"}))
+    assert parse_action_arguments(args).diff_head_ref == "merge123"
+
+    event_path.write_text("not json")
+    assert parse_action_arguments(args).diff_head_ref == "merge123"
+
+
+def test_parse_sbom_file(tmp_path):
+    sbom_file = tmp_path / "bom.json"
+    sbom_file.write_text("{}")
+
+    assert _parse_sbom_file(f" {sbom_file} ") == str(sbom_file)
+    assert _parse_sbom_file("") is None
+    assert _parse_sbom_file(None) is None
+    with pytest.raises(ValueError, match="Invalid SBOM file"):
+        _parse_sbom_file(str(tmp_path / "missing.json"))
+
+
+def test_parse_lockfiles():
+    assert _parse_lockfiles("**/poetry.lock\n\n  requirements.txt  \n") == ["**/poetry.lock", "requirements.txt"]
+    assert _parse_lockfiles("") == []
+    assert _parse_lockfiles(None) == []
+
+
+def test_parse_cache_backend():
+    assert _parse_cache_backend(" SQLite ") == CacheBackend.sqlite
+    assert _parse_cache_backend("json") == CacheBackend.json
+    assert _parse_cache_backend("") == CacheBackend.json
+    assert _parse_cache_backend(None) == CacheBackend.json
+    with pytest.raises(ValueError, match="Invalid cache backend"):
+        _parse_cache_backend("redis")
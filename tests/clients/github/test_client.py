@@ -1,9 +1,16 @@
-from unittest.mock import patch
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+from unittest.mock import MagicMock
 
+import httpx
 import pytest
 
-from src.clients.github.client import fetch_github_sbom
-from src.clients.github.model import SBOMResponse
+from src.clients.github.async_client import AsyncGitHubClient
+from src.clients.github.client import GitHubClient
+from src.clients.github.model import SBOMResponse, SBOMResponseProjection
+from src.storage.sbom_cache import SbomCache, CachedSbom
 
 
 @pytest.fixture
@@ -40,18 +47,202 @@ def mock_github_response():
         }
     }
 
-@patch('requests.get')
-def test_fetch_github_sbom(mock_get, mock_github_response):
-    # Mock the response from requests.get
-    mock_get.return_value.status_code = 200
-    mock_get.return_value.json.return_value = mock_github_response
+def test_fetch_github_sbom(mock_github_response):
+    # Mock the response from session.get
+    session = MagicMock()
+    session.get.return_value.status_code = 200
+    session.get.return_value.content = json.dumps(mock_github_response).encode()
 
     # Call the function
-    sbom_response = fetch_github_sbom('github', 'example', 'your-token')
+    sbom_response = GitHubClient(session).fetch_github_sbom('github', 'example', 'your-token')
 
     # Assert that the response is correctly parsed into the SBOMResponse model
     assert isinstance(sbom_response, SBOMResponse)
     assert sbom_response.sbom.name == "github/example"
     assert sbom_response.sbom.packages[0].name == "rubygems:rails"
     assert sbom_response.sbom.packages[0].licenseConcluded == "MIT"
+    assert session.get.call_args.kwargs["headers"]["Authorization"] == "Bearer your-token"
 
+
+def test_fetch_github_sbom_projection_skips_unused_fields(mock_github_response):
+    del mock_github_response["sbom"]["creationInfo"]
+    del mock_github_response["sbom"]["packages"][0]["SPDXID"]
+    session = MagicMock()
+    session.get.return_value.status_code = 200
+    session.get.return_value.content = json.dumps(mock_github_response).encode()
+
+    sbom_response = GitHubClient(session).fetch_github_sbom('github', 'example', response_model=SBOMResponseProjection)
+
+    assert type(sbom_response) is SBOMResponseProjection
+    assert sbom_response.sbom.packages[0].name == "rubygems:rails"
+    assert not hasattr(sbom_response.sbom.packages[0], "licenseConcluded")
+
+
+def test_fetch_github_sbom_async(mock_github_response):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/repos/github/example/dependency-graph/sbom"
+        assert request.headers["Authorization"] == "Bearer your-token"
+        return httpx.Response(200, json=mock_github_response)
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await AsyncGitHubClient(client).fetch_github_sbom("github", "example", "your-token")
+
+    sbom_response = asyncio.run(fetch())
+
+    assert isinstance(sbom_response, SBOMResponse)
+    assert sbom_response.sbom.name == "github/example"
+    assert sbom_response.sbom.packages[0].name == "rubygems:rails"
+
+
+def test_fetch_github_sbom_revalidates_cached_sbom(tmp_path, mock_github_response):
+    sbom_cache = SbomCache(str(tmp_path))
+    body = json.dumps(mock_github_response).encode()
+    session = MagicMock()
+    session.get.return_value.status_code = 200
+    session.get.return_value.headers = {"ETag": 'W/"abc"'}
+    session.get.return_value.content = body
+    client = GitHubClient(session, sbom_cache)
+
+    client.fetch_github_sbom('github', 'example')
+
+    assert "If-None-Match" not in session.get.call_args.kwargs["headers"]
+    assert sbom_cache.get('github', 'example') == CachedSbom(etag='W/"abc"', body=body)
+
+    session.get.return_value.status_code = 304
+    session.get.return_value.json.side_effect = AssertionError("Not modified response has no body")
+
+    sbom_response = client.fetch_github_sbom('github', 'example')
+
+    assert session.get.call_args.kwargs["headers"]["If-None-Match"] == 'W/"abc"'
+    assert sbom_response.sbom.name == "github/example"
+
+
+def test_stream_github_sbom_packages(tmp_path, mock_github_response):
+    sbom_cache = SbomCache(str(tmp_path))
+    body = json.dumps(mock_github_response).encode()
+    session = MagicMock()
+    response = session.get.return_value.__enter__.return_value
+    response.status_code = 200
+    response.headers = {"ETag": '"abc"'}
+    response.iter_content.return_value = iter([body[:100], body[100:]])
+    client = GitHubClient(session, sbom_cache)
+
+    packages = list(client.stream_github_sbom_packages('github', 'example'))
+
+    assert session.get.call_args.kwargs["stream"]
+    assert [package["name"] for package in packages] == ["rubygems:rails"]
+    # The whole document is cached, not only the part up to the packages.
+    assert sbom_cache.get('github', 'example') == CachedSbom(etag='"abc"', body=body)
+
+    response.status_code = 304
+    response.iter_content.side_effect = AssertionError("Not modified response has no body")
+
+    packages = list(client.stream_github_sbom_packages('github', 'example'))
+
+    assert session.get.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
+    assert [package["name"] for package in packages] == ["rubygems:rails"]
+
+
+def test_stream_github_sbom_packages_async(mock_github_response):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=mock_github_response)
+
+    async def stream():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [package async for package in AsyncGitHubClient(client).stream_github_sbom_packages("github", "example")]
+
+    packages = asyncio.run(stream())
+
+    assert [package["name"] for package in packages] == ["rubygems:rails"]
+
+
+class _ThreadRecordingSbomCache(SbomCache):
+    def __init__(self, cache_dir: str):
+        super().__init__(cache_dir)
+        self.threads = set()
+
+    def get_etag(self, owner, repo):
+        self.threads.add(threading.get_ident())
+        return super().get_etag(owner, repo)
+
+    def iter_body(self, owner, repo, chunk_size):
+        for chunk in super().iter_body(owner, repo, chunk_size):
+            self.threads.add(threading.get_ident())
+            yield chunk
+
+    @contextmanager
+    def body_writer(self, owner, repo, etag):
+        self.threads.add(threading.get_ident())
+        with super().body_writer(owner, repo, etag) as body:
+            yield body
+        self.threads.add(threading.get_ident())
+
+
+def test_stream_github_sbom_packages_async_with_cache(tmp_path, mock_github_response):
+    sbom_cache = _ThreadRecordingSbomCache(str(tmp_path))
+    body = json.dumps(mock_github_response).encode()
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"abc"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=body, headers={"ETag": '"abc"'})
+
+    async def stream():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            github_client = AsyncGitHubClient(client, sbom_cache)
+            return [package async for package in github_client.stream_github_sbom_packages("github", "example")]
+
+    assert [package["name"] for package in asyncio.run(stream())] == ["rubygems:rails"]
+    assert sbom_cache.get("github", "example") == CachedSbom(etag='"abc"', body=body)
+
+    assert [package["name"] for package in asyncio.run(stream())] == ["rubygems:rails"]
+    assert requests[-1].headers["If-None-Match"] == '"abc"'
+    # Files are read and written in worker threads, not on the event loop.
+    assert sbom_cache.threads and threading.get_ident() not in sbom_cache.threads
+
+
+def test_list_organization_repositories_follows_pagination():
+    pages = [
+        [{"name": f"repo-{i}", "archived": i == 1} for i in range(100)],
+        [{"name": "repo-100"}],
+    ]
+    session = MagicMock()
+    session.get.side_effect = [
+        MagicMock(status_code=200, content=json.dumps(page).encode()) for page in pages
+    ]
+
+    names = GitHubClient(session).list_organization_repositories("organization", "your-token")
+
+    assert len(names) == 100
+    assert "repo-1" not in names
+    assert names[-1] == "repo-100"
+    assert [call.kwargs["params"]["page"] for call in session.get.call_args_list] == [1, 2]
+    assert session.get.call_args.args[0] == "https://api.github.com/orgs/organization/repos"
+
+
+def test_fetch_dependency_changes_async():
+    changes = [
+        {"change_type": "added", "manifest": "pom.xml", "ecosystem": "maven", "name": "com.example:example",
+         "version": "2.0.0", "package_url": "pkg:maven/com.example/example@2.0.0", "license": None,
+         "source_repository_url": None, "vulnerabilities": []},
+        {"change_type": "removed", "manifest": "pom.xml", "ecosystem": "maven", "name": "com.example:example",
+         "version": "1.0.0", "package_url": None, "license": None, "source_repository_url": None,
+         "vulnerabilities": []},
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/repos/github/example/dependency-graph/compare/main...feature"
+        return httpx.Response(200, json=changes)
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await AsyncGitHubClient(client).fetch_dependency_changes("github", "example", "main", "feature")
+
+    result = asyncio.run(fetch())
+
+    assert [change.change_type for change in result] == ["added", "removed"]
+    assert result[0].package_url == "pkg:maven/com.example/example@2.0.0"
+    assert result[1].package_url is None
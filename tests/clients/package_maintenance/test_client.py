@@ -1,8 +1,14 @@
+import asyncio
+import json
+
+import httpx
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock
 
-from src.clients.package_maintenance.client import fetch_packages
-from src.clients.package_maintenance.model import PackagesRequest, PackagesResponse
+from src.clients.package_maintenance.async_client import AsyncPackageMaintenanceClient
+from src.clients.package_maintenance.client import PackageMaintenanceClient
+from src.clients.package_maintenance.model import PackagesRequest, PackagesResponse, PackagesResponseProjection
+from src.clients.request_scheduler import AsyncRequestScheduler
 
 
 @pytest.fixture
@@ -33,18 +39,81 @@ def mock_packages_response():
     }
 
 
-@patch('requests.post')
-def test_fetch_packages_success(mock_post, mock_packages_response):
-    mock_post.return_value.status_code = 200
-    mock_post.return_value.json.return_value = mock_packages_response
+def test_fetch_packages_success(mock_packages_response):
+    session = MagicMock()
+    session.post.return_value.status_code = 200
+    session.post.return_value.content = json.dumps(mock_packages_response).encode()
 
     payload = PackagesRequest(
         packages=[{"binary_repository_type": "maven", "binary_repository_id": "example-package-id"}]
     )
 
-    response = fetch_packages(payload)
+    response = PackageMaintenanceClient(session).fetch_packages(payload)
 
     assert isinstance(response, PackagesResponse)
     assert response.packages[0].binary_repository.name == "example-package"
     assert response.packages[0].binary_repository.release_recency.score == "A"
     assert response.packages[0].binary_repository.release_recency.value == 10
+
+
+def test_fetch_packages_projection_skips_unused_fields(mock_packages_response):
+    del mock_packages_response["packages"][0]["binary_repository"]["latest_version_published_at"]
+    session = MagicMock()
+    session.post.return_value.status_code = 200
+    session.post.return_value.content = json.dumps(mock_packages_response).encode()
+
+    payload = PackagesRequest(
+        packages=[{"binary_repository_type": "maven", "binary_repository_id": "example-package-id"}]
+    )
+
+    response = PackageMaintenanceClient(session).fetch_packages(payload, PackagesResponseProjection)
+
+    assert type(response) is PackagesResponseProjection
+    assert response.packages[0].binary_repository.id == "example-package-id"
+    assert response.packages[0].binary_repository.release_recency.score == "A"
+    assert not hasattr(response.packages[0].binary_repository, "name")
+
+
+def _fetch_packages_async(handler) -> PackagesResponse:
+    payload = PackagesRequest(
+        packages=[{"binary_repository_type": "maven", "binary_repository_id": "example-package-id"}]
+    )
+
+    async def no_sleep(delay: float):
+        pass
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            scheduler = AsyncRequestScheduler(max_retries=2, sleep=no_sleep)
+            return await AsyncPackageMaintenanceClient(client, scheduler).fetch_packages(payload)
+
+    return asyncio.run(fetch())
+
+
+def test_fetch_packages_async_success(mock_packages_response):
+    response = _fetch_packages_async(lambda request: httpx.Response(200, json=mock_packages_response))
+
+    assert isinstance(response, PackagesResponse)
+    assert response.packages[0].binary_repository.name == "example-package"
+    assert response.packages[0].binary_repository.release_recency.score == "A"
+
+
+def test_fetch_packages_async_failure():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(502, text="Bad Gateway")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _fetch_packages_async(handler)
+    assert len(requests) == 3
+
+
+def test_fetch_packages_async_retries_transient_failure(mock_packages_response):
+    responses = [httpx.Response(503, text="Service Unavailable"), httpx.Response(200, json=mock_packages_response)]
+
+    response = _fetch_packages_async(lambda request: responses.pop(0))
+
+    assert response.packages[0].binary_repository.name == "example-package"
+    assert not responses
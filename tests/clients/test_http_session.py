@@ -0,0 +1,11 @@
+from src.clients.http_session import create_http_session
+
+
+def test_create_http_session():
+    with create_http_session(pool_maxsize=8) as session:
+        adapter = session.get_adapter("https://package-maintenance.dev/api/v0/packages")
+
+        assert adapter._pool_maxsize == 8
+        assert adapter._pool_block
+        assert session.get_adapter("https://api.github.com") is adapter
+        assert session.headers["Accept-Encoding"] == "gzip"
@@ -0,0 +1,158 @@
+import asyncio
+
+import httpx
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+from unittest.mock import MagicMock
+
+from src.clients.request_scheduler import AsyncRequestScheduler, RequestScheduler, RequestSchedulerStats
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, delay: float):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def _response(status_code: int, headers: dict = None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    return response
+
+
+def _scheduler(clock: FakeClock, **kwargs) -> RequestScheduler:
+    return RequestScheduler(clock=clock, sleep=clock.sleep, jitter=lambda: 1.0, **kwargs)
+
+
+def test_transient_failure_is_retried_with_backoff():
+    clock = FakeClock()
+    responses = [_response(502), _response(503), _response(200)]
+    scheduler = _scheduler(clock)
+
+    response = scheduler.send(lambda: responses.pop(0))
+
+    assert response.status_code == 200
+    assert clock.sleeps == [1.0, 2.0]
+    assert scheduler.stats == RequestSchedulerStats(requests=3, retries=2, throttles=0, throttled_seconds=0.0)
+
+
+def test_last_response_is_returned_when_retries_are_exhausted():
+    clock = FakeClock()
+    scheduler = _scheduler(clock, max_retries=2)
+
+    response = scheduler.send(lambda: _response(500))
+
+    assert response.status_code == 500
+    assert len(clock.sleeps) == 2
+
+
+def test_not_retryable_response_is_returned_immediately():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+
+    response = scheduler.send(lambda: _response(404))
+
+    assert response.status_code == 404
+    assert clock.sleeps == []
+
+
+def test_retry_after_is_respected():
+    clock = FakeClock()
+    responses = [_response(429, {"Retry-After": "7"}), _response(200)]
+    scheduler = _scheduler(clock)
+
+    assert scheduler.send(lambda: responses.pop(0)).status_code == 200
+    assert clock.sleeps == [7.0]
+
+
+def test_exhausted_github_rate_limit_waits_for_reset():
+    clock = FakeClock()
+    reset = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(clock.now) + 30)}
+    responses = [_response(403, reset), _response(200)]
+    scheduler = _scheduler(clock)
+
+    assert scheduler.send(lambda: responses.pop(0)).status_code == 200
+    assert clock.sleeps == [30.0]
+
+
+def test_forbidden_without_rate_limit_is_not_retried():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+
+    assert scheduler.send(lambda: _response(403, {"X-RateLimit-Remaining": "10"})).status_code == 403
+    assert clock.sleeps == []
+
+
+def test_too_long_rate_limit_reset_is_not_waited_for():
+    clock = FakeClock()
+    scheduler = _scheduler(clock, max_throttle_seconds=60)
+
+    assert scheduler.send(lambda: _response(429, {"Retry-After": "3600"})).status_code == 429
+    assert clock.sleeps == []
+
+
+def test_requests_are_throttled_when_rate_limit_is_exhausted():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    headers = {"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": str(int(clock.now) + 60)}
+
+    scheduler.send(lambda: _response(200, headers))
+    scheduler.send(lambda: _response(200))
+    assert clock.sleeps == []
+
+    scheduler.send(lambda: _response(200))
+    assert clock.sleeps == [60.0]
+    assert scheduler.stats.throttles == 1
+    assert scheduler.stats.throttled_seconds == 60.0
+
+
+def test_too_long_rate_limit_reset_is_not_waited_for_before_request():
+    clock = FakeClock()
+    scheduler = _scheduler(clock, max_throttle_seconds=300)
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(clock.now) + 3500)}
+
+    scheduler.send(lambda: _response(200, headers))
+    response = scheduler.send(lambda: _response(429, headers))
+
+    assert response.status_code == 429
+    assert clock.sleeps == []
+    assert scheduler.stats.throttles == 0
+
+
+def test_connection_error_is_retried():
+    clock = FakeClock()
+    scheduler = _scheduler(clock, max_retries=1)
+    send_request = MagicMock(side_effect=requests.ConnectionError("Connection reset"))
+
+    with pytest.raises(requests.ConnectionError):
+        scheduler.send(send_request)
+    assert send_request.call_count == 2
+    assert scheduler.stats.retries == 1
+
+
+def test_async_transient_failure_is_retried():
+    sleeps = []
+
+    async def sleep(delay: float):
+        sleeps.append(delay)
+
+    responses = [httpx.Response(502), httpx.Response(200)]
+
+    async def send_request() -> httpx.Response:
+        return responses.pop(0)
+
+    scheduler = AsyncRequestScheduler(sleep=sleep, jitter=lambda: 1.0)
+    response = asyncio.run(scheduler.send_async(send_request))
+
+    assert response.status_code == 200
+    assert sleeps == [1.0]
+    assert scheduler.stats.retries == 1
@@ -0,0 +1,117 @@
+import pytest
+
+from src.service.adaptive_batching import AdaptiveBatchSizer, PackagesBatch, PackagesBatchQueue
+
+
+def _keys(count: int):
+    return [("maven", f"com.example:package-{i}") for i in range(count)]
+
+
+def test_batch_size_decreases_on_slow_batch_and_grows_back():
+    sizer = AdaptiveBatchSizer(max_size=100, target_latency_seconds=5, increase_step=10)
+
+    sizer.on_success(100, latency_seconds=12)
+    assert sizer.size == 50
+
+    sizer.on_success(50, latency_seconds=1)
+    assert sizer.size == 60
+
+    for _ in range(10):
+        sizer.on_success(60, latency_seconds=1)
+    assert sizer.size == 100
+
+
+def test_batch_size_never_drops_below_one():
+    sizer = AdaptiveBatchSizer(max_size=100)
+
+    for _ in range(10):
+        sizer.on_failure(1)
+    assert sizer.size == 1
+
+
+def test_queue_splits_failed_batch_in_halves():
+    keys = _keys(150)
+    queue = PackagesBatchQueue(keys, AdaptiveBatchSizer(max_size=100))
+
+    batch = queue.take()
+    assert batch == PackagesBatch(0, keys[:100])
+    assert queue.fail(batch)
+
+    assert queue.take() == PackagesBatch(0, keys[:50])
+    assert queue.take() == PackagesBatch(50, keys[50:100])
+    assert queue.take() == PackagesBatch(100, keys[100:150])
+
+
+def test_queue_is_exhausted_when_no_batches_are_pending_or_in_flight():
+    keys = _keys(1)
+    queue = PackagesBatchQueue(keys, AdaptiveBatchSizer(max_size=100))
+
+    batch = queue.take()
+    assert queue.take() is None
+    assert not queue.exhausted
+
+    assert not queue.fail(batch)
+    assert queue.exhausted
+
+
+def test_open_queue_accepts_keys_until_closed():
+    keys = _keys(150)
+    queue = PackagesBatchQueue([], AdaptiveBatchSizer(max_size=100), closed=False)
+    assert queue.take() is None
+    assert not queue.exhausted
+
+    queue.add(keys[:100])
+    queue.add(keys[100:])
+    assert queue.pending_size == 150
+
+    first = queue.take()
+    assert first == PackagesBatch(0, keys[:100])
+    assert queue.fail(first)
+    assert queue.pending_size == 150
+
+    queue.close()
+    with pytest.raises(ValueError):
+        queue.add(keys)
+    batches = [queue.take(), queue.take(), queue.take()]
+    assert batches == [PackagesBatch(0, keys[:50]), PackagesBatch(50, keys[50:100]), PackagesBatch(100, keys[100:])]
+    assert queue.pending_size == 0
+    for batch in batches:
+        queue.complete(batch, latency_seconds=1)
+    assert queue.exhausted
+
+
+def test_queue_is_aborted_on_error_not_worth_splitting():
+    keys = _keys(250)
+    queue = PackagesBatchQueue(keys, AdaptiveBatchSizer(max_size=100))
+
+    first, second = queue.take(), queue.take()
+    assert not queue.fail(first, split=False)
+    assert queue.aborted
+    assert queue.take() is None
+    # Batch in flight is not split after the queue is aborted.
+    assert not queue.fail(second)
+    assert queue.exhausted
+    assert queue.take_dropped() == [PackagesBatch(200, keys[200:])]
+    assert queue.take_dropped() == []
+
+
+def test_queue_is_aborted_when_too_many_batches_failed():
+    keys = _keys(100)
+    queue = PackagesBatchQueue(keys, AdaptiveBatchSizer(max_size=100), max_failures=1)
+
+    assert queue.fail(queue.take())
+    assert not queue.fail(queue.take())
+    assert queue.aborted
+    assert queue.take_dropped() == [PackagesBatch(50, keys[50:])]
+
+
+def test_aborted_open_queue_drops_added_keys():
+    keys = _keys(150)
+    queue = PackagesBatchQueue([], AdaptiveBatchSizer(max_size=100), closed=False)
+    queue.add(keys[:100])
+    queue.fail(queue.take(), split=False)
+
+    queue.add(keys[100:])
+
+    assert queue.pending_size == 0
+    assert queue.take_dropped() == [PackagesBatch(100, keys[100:])]
@@ -0,0 +1,72 @@
+from packageurl import PackageURL
+
+from src.models.commons import (
+    canonical_package_key,
+    group_packages_urls_by_key,
+    is_supported_package_url,
+    normalize_pypi_name,
+    package_url_to_repository_id,
+    package_url_type,
+    parse_package_url,
+)
+
+
+def test_normalize_pypi_name():
+    assert normalize_pypi_name("Django") == "django"
+    assert normalize_pypi_name("zope.interface") == "zope-interface"
+    assert normalize_pypi_name("typing_extensions") == "typing-extensions"
+    assert normalize_pypi_name("Foo__Bar-.baz") == "foo-bar-baz"
+
+
+def test_canonical_package_key():
+    assert canonical_package_key("pypi", "Typing_Extensions") == ("pypi", "typing-extensions")
+    # Maven coordinates are case-sensitive.
+    assert canonical_package_key("maven", "com.Example:Package") == ("maven", "com.Example:Package")
+
+
+def test_package_url_to_repository_id():
+    assert package_url_to_repository_id(PackageURL.from_string("pkg:pypi/PyYAML@6.0")) == ("pypi", "pyyaml")
+    assert package_url_to_repository_id(PackageURL.from_string("pkg:maven/com.example/package@1.0")) == (
+        "maven",
+        "com.example:package",
+    )
+    assert package_url_to_repository_id(PackageURL.from_string("pkg:npm/express@4.0.0")) is None
+
+
+def test_group_packages_urls_by_key():
+    packages_urls = [
+        PackageURL.from_string("pkg:pypi/typing_extensions@4.12.0"),
+        PackageURL.from_string("pkg:maven/com.example/package@1.0"),
+        PackageURL.from_string("pkg:pypi/Typing-Extensions@4.11.0"),
+        PackageURL.from_string("pkg:npm/express@4.0.0"),
+        PackageURL.from_string("pkg:maven/com.example/package@2.0"),
+    ]
+
+    packages_urls_by_key = group_packages_urls_by_key(packages_urls)
+
+    assert list(packages_urls_by_key) == [("pypi", "typing-extensions"), ("maven", "com.example:package")]
+    assert packages_urls_by_key[("pypi", "typing-extensions")] == [packages_urls[0], packages_urls[2]]
+    assert packages_urls_by_key[("maven", "com.example:package")] == [packages_urls[1], packages_urls[4]]
+
+
+def test_package_url_type():
+    assert package_url_type("pkg:maven/com.example/package@1.0") == "maven"
+    assert package_url_type("pkg:PyPI/django@5.0") == "pypi"
+    assert package_url_type("pkg://npm/express@4.0.0") == "npm"
+    assert package_url_type("pkg:maven") is None
+    assert package_url_type("https://example.com/maven/package") is None
+    assert package_url_type("maven/com.example/package") is None
+
+
+def test_is_supported_package_url():
+    assert is_supported_package_url("pkg:maven/com.example/package@1.0")
+    assert is_supported_package_url("pkg:pypi/django@5.0")
+    assert not is_supported_package_url("pkg:npm/express@4.0.0")
+    assert not is_supported_package_url("pkg:golang/github.com/example/package@v1.0.0")
+
+
+def test_parse_package_url_is_cached():
+    package_url = parse_package_url("pkg:maven/com.example/cached-package@1.0")
+
+    assert package_url == PackageURL.from_string("pkg:maven/com.example/cached-package@1.0")
+    assert parse_package_url("pkg:maven/com.example/cached-package@1.0") is package_url
@@ -1,3 +1,4 @@
+import pytest
 from packageurl import PackageURL
 
 from src.models.packages_ignore_filter import PackagesIgnoreFilter
@@ -79,3 +80,75 @@ def test_version_has_no_effect():
     purl_with_different_version = PackageURL(type="maven", namespace="com.example", name="example-package",
                                              version="2.0.0")
     assert filter_instance.ignore(purl_with_different_version)
+
+
+def test_ignore_packages_without_namespace():
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="name",
+        packages_ignore=[PackageURL.from_string("pkg:pypi/django")]
+    )
+    filter_instance = PackagesIgnoreFilter.create(args)
+
+    assert filter_instance.ignore(PackageURL.from_string("pkg:pypi/django@5.0.0"))
+    assert not filter_instance.ignore(PackageURL.from_string("pkg:pypi/flask@3.0.0"))
+
+
+def test_ignore_packages_matching_namespace_prefix():
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="name",
+        packages_ignore=[PackageURL.from_string("pkg:maven/com.example.*/*")]
+    )
+    filter_instance = PackagesIgnoreFilter.create(args)
+
+    assert filter_instance.ignore(PackageURL.from_string("pkg:maven/com.example.internal/package@1.0.0"))
+    assert filter_instance.ignore(PackageURL.from_string("pkg:maven/com.example.internal.core/package@1.0.0"))
+    assert not filter_instance.ignore(PackageURL.from_string("pkg:maven/com.example/package@1.0.0"))
+    assert not filter_instance.ignore(PackageURL.from_string("pkg:maven/com.other/package@1.0.0"))
+    assert not filter_instance.ignore(PackageURL.from_string("pkg:gradle/com.example.internal/package@1.0.0"))
+
+
+def test_ignore_packages_matching_name_prefix():
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="name",
+        packages_ignore=[
+            PackageURL.from_string("pkg:pypi/example-*"),
+            PackageURL.from_string("pkg:maven/com.example/core-*"),
+        ]
+    )
+    filter_instance = PackagesIgnoreFilter.create(args)
+
+    assert filter_instance.ignore(PackageURL.from_string("pkg:pypi/example-client@1.0.0"))
+    assert not filter_instance.ignore(PackageURL.from_string("pkg:pypi/example@1.0.0"))
+    assert filter_instance.ignore(PackageURL.from_string("pkg:maven/com.example/core-api@1.0.0"))
+    assert not filter_instance.ignore(PackageURL.from_string("pkg:maven/com.example/api@1.0.0"))
+    assert not filter_instance.ignore(PackageURL.from_string("pkg:maven/com.other/core-api@1.0.0"))
+
+
+def test_ignore_packages_matching_any_of_nested_prefixes():
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="name",
+        packages_ignore=[
+            PackageURL.from_string("pkg:maven/com.*/api"),
+            PackageURL.from_string("pkg:maven/com.example.*/core"),
+        ]
+    )
+    filter_instance = PackagesIgnoreFilter.create(args)
+
+    assert filter_instance.ignore(PackageURL.from_string("pkg:maven/com.example.internal/api@1.0.0"))
+    assert filter_instance.ignore(PackageURL.from_string("pkg:maven/com.example.internal/core@1.0.0"))
+    assert not filter_instance.ignore(PackageURL.from_string("pkg:maven/com.other/core@1.0.0"))
+
+
+def test_asterisk_within_value_is_rejected():
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="name",
+        packages_ignore=[PackageURL.from_string("pkg:maven/com.*.internal/*")]
+    )
+
+    with pytest.raises(ValueError, match="Invalid package to ignore"):
+        PackagesIgnoreFilter.create(args)
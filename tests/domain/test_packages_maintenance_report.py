@@ -4,7 +4,14 @@ from packageurl import PackageURL
 
 from src.arguments.action_arguments import MaintenanceMetricSlug, MaintenanceMetricScore, ActionArguments
 from src.clients.package_maintenance.model import PackageMetadata, MaintenanceMetric, BinaryRepository
+from src.models.compact_package_metadata import (
+    METRICS_CACHE_SIZE,
+    _shared_metric,
+    compact_metric,
+    compact_package_metadata,
+)
 from src.models.packages_maintenance_report import PackagesMaintenanceReport
+from src.models.threshold_evaluator import get_package_metric
 
 
 def test_missing_data_packages():
@@ -85,7 +92,6 @@ def test_below_threshold_packages():
 
 
 def test_get_package_metric_none():
-    packages = [PackageURL(type="maven", namespace="com.example", name="example-package")]
     maintenance_metric = MaintenanceMetric(score="C", value=75)
     package_metadata = PackageMetadata(
         binary_repository=BinaryRepository(
@@ -105,6 +111,32 @@ def test_get_package_metric_none():
         source_repository=None
     )
 
+    assert get_package_metric(package_metadata, MaintenanceMetricSlug.issues_lifetime) is None
+    assert get_package_metric(package_metadata, MaintenanceMetricSlug.binary_release_recency) == maintenance_metric
+
+
+def test_rows_list_all_originating_packages_urls():
+    packages = [
+        PackageURL(type="pypi", name="Typing_Extensions", version="4.11.0"),
+        PackageURL(type="pypi", name="typing-extensions", version="4.12.0"),
+    ]
+    package_metadata = PackageMetadata(
+        binary_repository=BinaryRepository(
+            type="pypi",
+            id="typing-extensions",
+            latest_version="4.12.0",
+            latest_version_published_at="2021-11-03T00:00:00Z",
+            name=None,
+            description=None,
+            url="https://pypi.org/project/typing-extensions",
+            source_repository_original_url=None,
+            source_repository_normal_url=None,
+            source_repository_id=None,
+            source_repository_type=None,
+            release_recency=MaintenanceMetric(score="A", value=1)
+        ),
+        source_repository=None
+    )
     action_arguments = ActionArguments(
         github_repository_owner="owner",
         github_repository_name="repo",
@@ -112,4 +144,102 @@ def test_get_package_metric_none():
     )
 
     report = PackagesMaintenanceReport.create(packages, [package_metadata], action_arguments)
-    assert report._get_package_metric(package_metadata, MaintenanceMetricSlug.issues_lifetime) is None
+
+    assert report.missing_data_packages() == set()
+    found_packages = report.found_packages()
+    assert len(found_packages) == 1
+    assert found_packages[0].packages_urls == packages
+
+
+def test_report_index_accessors():
+    below_threshold_url = PackageURL(type="maven", namespace="com.example", name="below", version="1.0.0")
+    missing_urls = [
+        PackageURL(type="pypi", name="Private_Package", version="1.0"),
+        PackageURL(type="pypi", name="private-package", version="2.0"),
+    ]
+    package_metadata = PackageMetadata(
+        binary_repository=BinaryRepository(
+            type="maven",
+            id="com.example:below",
+            latest_version="1.0.0",
+            latest_version_published_at="2021-11-03T00:00:00Z",
+            name=None,
+            description=None,
+            url="https://repo.example.com/package",
+            source_repository_original_url=None,
+            source_repository_normal_url=None,
+            source_repository_id=None,
+            source_repository_type=None,
+            release_recency=MaintenanceMetric(score="C", value=75)
+        ),
+        source_repository=None
+    )
+    action_arguments = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        packages_scores_thresholds={
+            MaintenanceMetricSlug.binary_release_recency: MaintenanceMetricScore("B")
+        }
+    )
+
+    report = PackagesMaintenanceReport.create(
+        [below_threshold_url, *missing_urls], [package_metadata], action_arguments
+    )
+
+    key = report.package_key(below_threshold_url)
+    assert key == ("maven", "com.example:below")
+    assert report.package_row(key).package == compact_package_metadata(package_metadata)
+    assert report.below_threshold_metrics(key) == {MaintenanceMetricSlug.binary_release_recency}
+    assert [row.package for row in report.below_threshold_packages()] == [compact_package_metadata(package_metadata)]
+    assert report.missing_data_packages_by_key() == {("pypi", "private-package"): missing_urls}
+    assert report.missing_data_packages() == set(missing_urls)
+    assert report.package_row(("pypi", "private-package")) is None
+    assert report.below_threshold_metrics(("pypi", "private-package")) == set()
+    # Accessors are views over the index built once.
+    assert report.found_packages() is report.found_packages()
+
+
+def test_report_holds_compact_metadata():
+    metric = MaintenanceMetric(score="B", value=3)
+    packages_maintenance = [
+        PackageMetadata(
+            binary_repository=BinaryRepository(
+                type="maven",
+                id=f"com.example:package-{i}",
+                latest_version="1.0.0",
+                latest_version_published_at="2021-11-03T00:00:00Z",
+                name=None,
+                description=None,
+                url="https://repo.example.com/package",
+                source_repository_original_url=None,
+                source_repository_normal_url=None,
+                source_repository_id=None,
+                source_repository_type=None,
+                release_recency=metric
+            ),
+            source_repository=None
+        )
+        for i in range(2)
+    ]
+    action_arguments = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        packages_scores_thresholds={}
+    )
+
+    report = PackagesMaintenanceReport.create([], packages_maintenance, action_arguments)
+
+    first, second = (row.package for row in report.found_packages())
+    assert first.binary_repository.id == "com.example:package-0"
+    assert first.binary_repository.release_recency == (3, "B")
+    # Equal metrics are shared by all packages.
+    assert first.binary_repository.release_recency is second.binary_repository.release_recency
+    assert compact_package_metadata(first) is first
+
+
+def test_shared_metrics_are_bounded():
+    for value in range(METRICS_CACHE_SIZE * 2):
+        compact_metric(MaintenanceMetric(score="A", value=value))
+
+    assert _shared_metric.cache_info().currsize <= METRICS_CACHE_SIZE
+    assert compact_metric(MaintenanceMetric(score="A", value=1)) == (1, "A")
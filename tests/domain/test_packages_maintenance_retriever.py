@@ -0,0 +1,397 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from packageurl import PackageURL
+
+from src.clients.package_maintenance.model import (
+    PackagesRequest,
+    PackagesResponse,
+    PackageMetadata,
+    BinaryRepository,
+    MaintenanceMetric,
+)
+from src.service.async_packages_maintenance_retriever import AsyncPackagesMaintenanceRetriever
+from src.service.packages_maintenance_retriever import (
+    PackagesMaintenanceRetriever,
+    PackagesMaintenanceRetrievalError,
+)
+from src.service.adaptive_batching import MAX_BATCH_FAILURES
+from src.storage.packages_metadata_cache import PackagesMetadataCache
+
+
+def _package_metadata(binary_repository_id: str) -> PackageMetadata:
+    return PackageMetadata(
+        binary_repository=BinaryRepository(
+            type="maven",
+            id=binary_repository_id,
+            latest_version="1.0.0",
+            latest_version_published_at="2021-11-03T00:00:00Z",
+            name=None,
+            description=None,
+            url="https://repo.example.com/package",
+            source_repository_original_url=None,
+            source_repository_normal_url=None,
+            source_repository_id=None,
+            source_repository_type=None,
+            release_recency=MaintenanceMetric(score="A", value=1),
+        ),
+        source_repository=None,
+    )
+
+
+def _packages_urls(count: int):
+    return [PackageURL(type="maven", namespace="com.example", name=f"package-{i}") for i in range(count)]
+
+
+def _echo_response(payload: PackagesRequest, response_model=PackagesResponse) -> PackagesResponse:
+    return PackagesResponse(
+        packages=[_package_metadata(package.binary_repository_id) for package in payload.packages]
+    )
+
+
+def test_results_are_merged_in_order():
+    client = MagicMock()
+
+    def fetch_packages_slow_first(payload: PackagesRequest, response_model=PackagesResponse) -> PackagesResponse:
+        # The first group completes last.
+        if payload.packages[0].binary_repository_id == "com.example:package-0":
+            time.sleep(0.05)
+        return _echo_response(payload)
+
+    client.fetch_packages.side_effect = fetch_packages_slow_first
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=3)
+
+    packages_maintenance = retriever.get_packages_maintenance(_packages_urls(250))
+
+    assert client.fetch_packages.call_count == 3
+    assert [package.binary_repository.id for package in packages_maintenance] == [
+        f"com.example:package-{i}" for i in range(250)
+    ]
+
+
+def test_concurrency_is_bounded():
+    client = MagicMock()
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def fetch_packages_counting(payload: PackagesRequest, response_model=PackagesResponse) -> PackagesResponse:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return _echo_response(payload)
+
+    client.fetch_packages.side_effect = fetch_packages_counting
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=2)
+
+    retriever.get_packages_maintenance(_packages_urls(1000))
+
+    assert client.fetch_packages.call_count == 10
+    assert max_in_flight <= 2
+
+
+def _fetch_packages_failing_on(binary_repository_id: str):
+    def fetch_packages(payload: PackagesRequest, response_model=PackagesResponse) -> PackagesResponse:
+        if any(package.binary_repository_id == binary_repository_id for package in payload.packages):
+            raise RuntimeError("502 Bad Gateway")
+        return _echo_response(payload)
+
+    return fetch_packages
+
+
+def test_failed_group_is_split_until_failing_package_is_isolated():
+    client = MagicMock()
+    client.fetch_packages.side_effect = _fetch_packages_failing_on("com.example:package-100")
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=4)
+    packages_urls = _packages_urls(250)
+
+    with pytest.raises(PackagesMaintenanceRetrievalError) as error_info:
+        retriever.get_packages_maintenance(packages_urls)
+
+    error = error_info.value
+    assert [package.binary_repository.id for package in error.packages_maintenance] == [
+        f"com.example:package-{i}" for i in range(250) if i != 100
+    ]
+    assert error.failed_packages_urls == [packages_urls[100]]
+    assert len(error.errors) == 1
+
+
+def test_batch_size_shrinks_after_failure():
+    client = MagicMock()
+    client.fetch_packages.side_effect = _fetch_packages_failing_on("com.example:package-0")
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=1)
+
+    with pytest.raises(PackagesMaintenanceRetrievalError):
+        retriever.get_packages_maintenance(_packages_urls(300))
+
+    batch_sizes = [len(call.args[0].packages) for call in client.fetch_packages.call_args_list]
+    # The failing group is split in halves down to the failing package, then the size grows back gradually.
+    assert batch_sizes[:7] == [100, 50, 25, 12, 6, 3, 1]
+    assert batch_sizes[-3:] == [71, 81, 48]
+    assert sum(batch_sizes[7:]) == 299
+
+
+def test_unreachable_api_fails_remaining_groups_without_requesting_them():
+    client = MagicMock()
+    client.fetch_packages.side_effect = requests.ConnectionError("Connection refused")
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=4)
+    packages_urls = _packages_urls(1000)
+
+    with pytest.raises(PackagesMaintenanceRetrievalError) as error_info:
+        retriever.get_packages_maintenance(packages_urls)
+
+    # Only the groups already in flight when the first one failed are requested.
+    assert client.fetch_packages.call_count <= 4
+    assert error_info.value.failed_packages_urls == packages_urls
+    assert all(isinstance(error, requests.ConnectionError) for error in error_info.value.errors)
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+@pytest.mark.parametrize("status, split", [(401, False), (403, False), (503, False), (504, True), (422, True)])
+def test_only_errors_caused_by_packages_split_groups(status, split):
+    client = MagicMock()
+    client.fetch_packages.side_effect = _http_error(status)
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=1)
+
+    with pytest.raises(PackagesMaintenanceRetrievalError) as error_info:
+        retriever.get_packages_maintenance(_packages_urls(1000))
+
+    # Groups are split a bounded number of times, regardless of the number of packages.
+    assert client.fetch_packages.call_count == (MAX_BATCH_FAILURES + 1 if split else 1)
+    assert len(error_info.value.failed_packages_urls) == 1000
+
+
+def test_pipelined_unreachable_api_fails_discovered_packages():
+    client = MagicMock()
+    client.fetch_packages.side_effect = requests.ConnectionError("Connection refused")
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=2)
+    packages_urls = _packages_urls(1000)
+
+    with pytest.raises(PackagesMaintenanceRetrievalError) as error_info:
+        retriever.get_packages_maintenance_pipelined(iter(packages_urls))
+
+    assert client.fetch_packages.call_count <= 2
+    assert error_info.value.packages_urls == packages_urls
+    assert error_info.value.failed_packages_urls == packages_urls
+
+
+def test_no_packages():
+    client = MagicMock()
+    retriever = PackagesMaintenanceRetriever(client)
+
+    assert retriever.get_packages_maintenance([]) == []
+    client.fetch_packages.assert_not_called()
+
+
+def test_pipelined_packages_are_requested_while_discovered():
+    client = MagicMock()
+    client.fetch_packages.side_effect = _echo_response
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=2)
+    packages_urls = _packages_urls(250)
+    first_request_discovered = threading.Event()
+
+    def discover_packages():
+        for i, package_url in enumerate(packages_urls):
+            if i == 150:
+                # The first group of 100 packages is requested before the rest of packages are discovered.
+                for _ in range(100):
+                    if client.fetch_packages.call_count:
+                        first_request_discovered.set()
+                        break
+                    time.sleep(0.01)
+            yield package_url
+        # Duplicates are requested once.
+        yield packages_urls[0]
+
+    all_packages_urls, packages_maintenance = retriever.get_packages_maintenance_pipelined(discover_packages())
+
+    assert first_request_discovered.is_set()
+    assert all_packages_urls == [*packages_urls, packages_urls[0]]
+    assert [len(call.args[0].packages) for call in client.fetch_packages.call_args_list] == [100, 100, 50]
+    assert [package.binary_repository.id for package in packages_maintenance] == [
+        f"com.example:package-{i}" for i in range(250)
+    ]
+
+
+def test_pipelined_failed_group_keeps_discovered_packages():
+    client = MagicMock()
+    client.fetch_packages.side_effect = _fetch_packages_failing_on("com.example:package-100")
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=4)
+    packages_urls = _packages_urls(250)
+
+    with pytest.raises(PackagesMaintenanceRetrievalError) as error_info:
+        retriever.get_packages_maintenance_pipelined(iter(packages_urls))
+
+    error = error_info.value
+    assert error.packages_urls == packages_urls
+    assert error.failed_packages_urls == [packages_urls[100]]
+    assert len(error.packages_maintenance) == 249
+
+
+def test_pipelined_discovery_error_stops_workers():
+    client = MagicMock()
+    client.fetch_packages.side_effect = _echo_response
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=2)
+
+    def discover_packages():
+        yield from _packages_urls(100)
+        raise RuntimeError("SBOM stream interrupted")
+
+    with pytest.raises(RuntimeError, match="SBOM stream interrupted"):
+        retriever.get_packages_maintenance_pipelined(discover_packages())
+
+
+def test_async_results_are_merged_in_order():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fetch_packages(payload: PackagesRequest, response_model=PackagesResponse) -> PackagesResponse:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # The first group completes last.
+        first_group = payload.packages[0].binary_repository_id == "com.example:package-0"
+        await asyncio.sleep(0.02 if first_group else 0.01)
+        in_flight -= 1
+        return _echo_response(payload)
+
+    client = MagicMock()
+    client.fetch_packages.side_effect = fetch_packages
+    retriever = AsyncPackagesMaintenanceRetriever(client, max_concurrency=2)
+
+    packages_maintenance = asyncio.run(retriever.get_packages_maintenance(_packages_urls(450)))
+
+    assert [package.binary_repository.id for package in packages_maintenance] == [
+        f"com.example:package-{i}" for i in range(450)
+    ]
+    assert max_in_flight == 2
+
+
+def test_async_failed_group_keeps_retrieved_packages():
+    async def fetch_packages(payload: PackagesRequest, response_model=PackagesResponse) -> PackagesResponse:
+        if any(package.binary_repository_id == "com.example:package-0" for package in payload.packages):
+            raise RuntimeError("502 Bad Gateway")
+        return _echo_response(payload)
+
+    client = MagicMock()
+    client.fetch_packages.side_effect = fetch_packages
+    retriever = AsyncPackagesMaintenanceRetriever(client)
+
+    with pytest.raises(PackagesMaintenanceRetrievalError) as error_info:
+        asyncio.run(retriever.get_packages_maintenance(_packages_urls(150)))
+
+    assert len(error_info.value.packages_maintenance) == 149
+    assert len(error_info.value.failed_packages_urls) == 1
+
+
+def test_only_cache_misses_are_fetched(tmp_path):
+    client = MagicMock()
+    client.fetch_packages.side_effect = _echo_response
+    packages_urls = _packages_urls(150)
+    cache = PackagesMetadataCache.load(str(tmp_path), ttl_seconds=60, max_entries=1000)
+    cache.put([], [_package_metadata(f"com.example:package-{i}") for i in range(120)])
+    retriever = PackagesMaintenanceRetriever(client, cache=cache)
+
+    packages_maintenance = retriever.get_packages_maintenance(packages_urls)
+
+    assert client.fetch_packages.call_count == 1
+    fetched_ids = [package.binary_repository_id for package in client.fetch_packages.call_args.args[0].packages]
+    assert fetched_ids == [f"com.example:package-{i}" for i in range(120, 150)]
+    assert len(packages_maintenance) == 150
+
+    # Second run is served from the cache saved by the first one.
+    cache = PackagesMetadataCache.load(str(tmp_path), ttl_seconds=60, max_entries=1000)
+    retriever = PackagesMaintenanceRetriever(client, cache=cache)
+    assert len(retriever.get_packages_maintenance(packages_urls)) == 150
+    assert client.fetch_packages.call_count == 1
+
+
+def test_duplicate_packages_are_requested_once():
+    client = MagicMock()
+    client.fetch_packages.side_effect = _echo_response
+    packages_urls = [
+        PackageURL(type="maven", namespace="com.example", name=f"package-{i % 50}", version=f"{i}.0")
+        for i in range(150)
+    ]
+    retriever = PackagesMaintenanceRetriever(client)
+
+    packages_maintenance = retriever.get_packages_maintenance(packages_urls)
+
+    assert client.fetch_packages.call_count == 1
+    assert len(client.fetch_packages.call_args.args[0].packages) == 50
+    assert len(packages_maintenance) == 50
+
+
+def test_async_cache_is_accessed_off_event_loop():
+    event_loop_threads = set()
+    cache_threads = set()
+
+    async def fetch_packages(payload: PackagesRequest, response_model=PackagesResponse) -> PackagesResponse:
+        event_loop_threads.add(threading.get_ident())
+        return _echo_response(payload)
+
+    def split_cached(keys):
+        cache_threads.add(threading.get_ident())
+        return [], list(keys)
+
+    client = MagicMock()
+    client.fetch_packages.side_effect = fetch_packages
+    cache = MagicMock()
+    cache.split_cached.side_effect = split_cached
+    cache.put.side_effect = lambda keys, packages: cache_threads.add(threading.get_ident())
+    cache.save.side_effect = lambda: cache_threads.add(threading.get_ident())
+    retriever = AsyncPackagesMaintenanceRetriever(client, cache=cache)
+
+    assert len(asyncio.run(retriever.get_packages_maintenance(_packages_urls(150)))) == 150
+
+    assert cache.put.call_count == 2
+    cache.save.assert_called_once()
+    assert cache_threads and not cache_threads & event_loop_threads
+
+
+class _WorkerCrash(BaseException):
+    pass
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_crashed_worker_error_is_raised_without_waiting_for_others(pipelined):
+    def fetch_packages(payload: PackagesRequest, response_model=PackagesResponse) -> PackagesResponse:
+        if payload.packages[0].binary_repository_id == "com.example:package-0":
+            raise _WorkerCrash()
+        time.sleep(0.01)
+        return _echo_response(payload)
+
+    client = MagicMock()
+    client.fetch_packages.side_effect = fetch_packages
+    retriever = PackagesMaintenanceRetriever(client, max_concurrency=2)
+    errors = []
+
+    def retrieve():
+        try:
+            if pipelined:
+                retriever.get_packages_maintenance_pipelined(iter(_packages_urls(5000)))
+            else:
+                retriever.get_packages_maintenance(_packages_urls(5000))
+        except _WorkerCrash as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=retrieve, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert len(errors) == 1
+    assert client.fetch_packages.call_count < 50
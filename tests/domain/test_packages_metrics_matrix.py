@@ -0,0 +1,81 @@
+import importlib.util
+import math
+
+import pytest
+
+from src.arguments.action_arguments import MaintenanceMetricScore, MaintenanceMetricSlug
+from src.clients.package_maintenance.model import (
+    BinaryRepositoryProjection,
+    MaintenanceMetric,
+    PackageMetadataProjection,
+    PackagesResponseProjection,
+    SourceRepositoryProjection,
+)
+from src.models.packages_metrics_matrix import PackagesMetricsMatrix
+
+NUMPY_INSTALLED = importlib.util.find_spec("numpy") is not None
+
+
+def _package(id, release_recency, commits_frequency=None) -> PackageMetadataProjection:
+    source_repository = None
+    if commits_frequency:
+        source_repository = SourceRepositoryProjection(
+            url="https://github.com/example/example",
+            commits_frequency=MaintenanceMetric(score=commits_frequency[0], value=commits_frequency[1]),
+            commits_recency=None,
+            issues_lifetime=None,
+            issues_open_percentage=None,
+            pull_requests_lifetime=None,
+            pull_requests_open_percentage=None,
+        )
+    return PackageMetadataProjection(
+        binary_repository=BinaryRepositoryProjection(
+            id=id,
+            type="maven",
+            latest_version="1.0.0",
+            url="https://repo.example.com/package",
+            release_recency=MaintenanceMetric(score=release_recency[0], value=release_recency[1]),
+        ),
+        source_repository=source_repository,
+    )
+
+
+PACKAGES = [
+    _package("com.example:a", ("A", 1), ("A", 100)),
+    _package("com.example:b", ("B", 6), ("C", 2)),
+    _package("com.example:c", ("D", 48)),
+]
+THRESHOLDS = {
+    MaintenanceMetricSlug.binary_release_recency: MaintenanceMetricScore.B,
+    MaintenanceMetricSlug.source_commit_frequency: MaintenanceMetricScore.B,
+}
+
+
+@pytest.mark.skipif(NUMPY_INSTALLED, reason="NumPy is installed")
+def test_create_requires_numpy():
+    with pytest.raises(ImportError, match="NumPy is required"):
+        PackagesMetricsMatrix.create(PACKAGES)
+
+
+@pytest.mark.skipif(not NUMPY_INSTALLED, reason="NumPy is not installed")
+def test_below_threshold():
+    matrix = PackagesMetricsMatrix.from_response(PackagesResponseProjection(packages=PACKAGES))
+
+    assert matrix.keys == [("maven", "com.example:a"), ("maven", "com.example:b"), ("maven", "com.example:c")]
+    assert matrix.values.shape == matrix.scores.shape == (3, len(MaintenanceMetricSlug))
+    assert matrix.mask.sum(axis=1).tolist() == [2, 2, 1]
+    assert matrix.below_threshold(THRESHOLDS).any(axis=1).tolist() == [False, True, True]
+    assert matrix.below_threshold_count(THRESHOLDS) == 2
+    assert matrix.below_threshold_count_if(THRESHOLDS, MaintenanceMetricSlug.binary_release_recency, "A") == 2
+    assert matrix.below_threshold_count_if(THRESHOLDS, MaintenanceMetricSlug.source_commit_frequency, "C") == 1
+
+
+@pytest.mark.skipif(not NUMPY_INSTALLED, reason="NumPy is not installed")
+def test_hit_rates_and_percentiles():
+    matrix = PackagesMetricsMatrix.create(PACKAGES)
+
+    rates = matrix.hit_rates(THRESHOLDS)
+    assert rates[MaintenanceMetricSlug.binary_release_recency] == pytest.approx(1 / 3)
+    assert rates[MaintenanceMetricSlug.source_commit_frequency] == pytest.approx(1 / 2)
+    assert matrix.percentiles(MaintenanceMetricSlug.binary_release_recency, [0, 50, 100]) == [1.0, 6.0, 48.0]
+    assert all(math.isnan(value) for value in matrix.percentiles(MaintenanceMetricSlug.issues_lifetime, [50]))
@@ -1,8 +1,9 @@
+import json
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock
 from packageurl import PackageURL
 from src.arguments.action_arguments import ActionArguments
-from src.clients.github.model import SBOMResponse, Package, SBOM, CreationInfo, ExternalRef
+from src.clients.github.model import SBOMResponse, Package, SBOM, CreationInfo, ExternalRef, DependencyChange
 from src.service.packages_retriever import PackagesRetriever
 
 
@@ -44,9 +45,9 @@ def mock_sbom_response() -> SBOMResponse:
     )
 
 
-@patch('src.service.packages_retriever.fetch_github_sbom')
-def test_get_packages_urls_to_check(fetch_github_sbom, mock_sbom_response: SBOMResponse):
-    fetch_github_sbom.return_value = mock_sbom_response
+def test_get_packages_urls_to_check(mock_sbom_response: SBOMResponse):
+    github_client = MagicMock()
+    github_client.fetch_github_sbom.return_value = mock_sbom_response
 
     args = ActionArguments(
         github_repository_owner="owner",
@@ -54,7 +55,7 @@ def test_get_packages_urls_to_check(fetch_github_sbom, mock_sbom_response: SBOMR
         github_token="token",
         packages_ignore=[]
     )
-    retriever = PackagesRetriever.create(args)
+    retriever = PackagesRetriever.create(args, github_client)
     packages_urls = retriever.get_packages_urls_to_check()
 
     assert len(packages_urls) == 1
@@ -66,9 +67,9 @@ def test_get_packages_urls_to_check(fetch_github_sbom, mock_sbom_response: SBOMR
     assert packages_urls[0].version == "1.0.0"
 
 
-@patch('src.service.packages_retriever.fetch_github_sbom')
-def test_ignore_packages(fetch_github_sbom, mock_sbom_response: SBOMResponse):
-    fetch_github_sbom.return_value = mock_sbom_response
+def test_ignore_packages(mock_sbom_response: SBOMResponse):
+    github_client = MagicMock()
+    github_client.fetch_github_sbom.return_value = mock_sbom_response
 
     args = ActionArguments(
         github_repository_owner="owner",
@@ -76,8 +77,191 @@ def test_ignore_packages(fetch_github_sbom, mock_sbom_response: SBOMResponse):
         github_token="token",
         packages_ignore=[PackageURL(type="maven", namespace="com.example", name="example-package")]
     )
-    retriever = PackagesRetriever.create(args)
+    retriever = PackagesRetriever.create(args, github_client)
 
     packages_urls = retriever.get_packages_urls_to_check()
 
     assert len(packages_urls) == 0
+
+
+def test_get_packages_urls_to_check_streaming(mock_sbom_response: SBOMResponse):
+    github_client = MagicMock()
+    github_client.stream_github_sbom_packages.return_value = iter(
+        mock_sbom_response.model_dump()["sbom"]["packages"]
+    )
+
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        github_token="token",
+        packages_ignore=[],
+        sbom_streaming=True,
+    )
+    retriever = PackagesRetriever.create(args, github_client)
+    packages_urls = retriever.get_packages_urls_to_check()
+
+    github_client.fetch_github_sbom.assert_not_called()
+    assert packages_urls == [PackageURL.from_string("pkg:maven/com.example/example-package@1.0.0")]
+
+
+def test_skip_packages_of_unsupported_types():
+    github_client = MagicMock()
+    github_client.stream_github_sbom_packages.return_value = iter([
+        {"name": "express", "externalRefs": [{"referenceType": "purl", "referenceLocator": "pkg:npm/express@4.0.0"}]},
+        # Package URLs of unsupported types are not parsed, so malformed ones do not fail the action.
+        {"name": "invalid", "externalRefs": [{"referenceType": "purl", "referenceLocator": "pkg:golang/@v1"}]},
+        {"name": "django", "externalRefs": [{"referenceType": "purl", "referenceLocator": "pkg:pypi/django@5.0"}]},
+    ])
+
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        github_token="token",
+        sbom_streaming=True,
+    )
+    retriever = PackagesRetriever.create(args, github_client)
+
+    assert retriever.get_packages_urls_to_check() == [PackageURL.from_string("pkg:pypi/django@5.0")]
+
+
+def test_skip_malformed_external_references():
+    github_client = MagicMock()
+    github_client.stream_github_sbom_packages.return_value = iter([
+        {"name": "no-locator", "externalRefs": [{"referenceType": "purl"}]},
+        {"name": "no-type", "externalRefs": [{"referenceLocator": "pkg:maven/com.example/no-type@1.0"}]},
+        {"name": "number", "externalRefs": [{"referenceType": "purl", "referenceLocator": 42}]},
+        {"name": "string", "externalRefs": ["pkg:maven/com.example/string@1.0"]},
+        {"name": "object", "externalRefs": {"referenceType": "purl"}},
+        {"name": "no-name", "externalRefs": [{"referenceType": "purl", "referenceLocator": "pkg:maven/"}]},
+        "package",
+        {"name": "django", "externalRefs": [{"referenceType": "purl", "referenceLocator": "pkg:pypi/django@5.0"}]},
+    ])
+
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        github_token="token",
+        sbom_streaming=True,
+    )
+    retriever = PackagesRetriever.create(args, github_client)
+
+    assert retriever.get_packages_urls_to_check() == [PackageURL.from_string("pkg:pypi/django@5.0")]
+
+
+def test_get_packages_urls_from_cyclonedx_file(tmp_path):
+    sbom_file = tmp_path / "bom.json"
+    sbom_file.write_text(json.dumps({
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.5",
+        "components": [
+            {
+                "type": "library",
+                "name": "package",
+                "purl": "pkg:maven/com.example/package@1.0.0",
+                "components": [{"type": "library", "name": "nested", "purl": "pkg:maven/com.example/nested@1.0.0"}],
+            },
+            {"type": "library", "name": "express", "purl": "pkg:npm/express@4.0.0"},
+            {"type": "file", "name": "README.md"},
+            {"type": "library", "name": "django", "purl": "pkg:pypi/django@5.0"},
+        ],
+    }))
+    github_client = MagicMock()
+
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        sbom_file=str(sbom_file),
+    )
+    retriever = PackagesRetriever.create(args, github_client)
+
+    assert retriever.get_packages_urls_to_check() == [
+        PackageURL.from_string("pkg:maven/com.example/package@1.0.0"),
+        PackageURL.from_string("pkg:maven/com.example/nested@1.0.0"),
+        PackageURL.from_string("pkg:pypi/django@5.0"),
+    ]
+    github_client.fetch_github_sbom.assert_not_called()
+    github_client.stream_github_sbom_packages.assert_not_called()
+
+
+def test_get_packages_urls_from_spdx_file(tmp_path, mock_sbom_response: SBOMResponse):
+    sbom_file = tmp_path / "sbom.spdx.json"
+    sbom_file.write_text(mock_sbom_response.sbom.model_dump_json())
+    github_client = MagicMock()
+
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        sbom_file=str(sbom_file),
+    )
+    retriever = PackagesRetriever.create(args, github_client)
+
+    assert retriever.get_packages_urls_to_check() == [
+        PackageURL.from_string("pkg:maven/com.example/example-package@1.0.0")
+    ]
+    github_client.fetch_github_sbom.assert_not_called()
+
+
+def test_get_packages_urls_from_lockfiles(tmp_path, monkeypatch):
+    (tmp_path / "requirements.txt").write_text("django==5.0.1\nignored==1.0\n")
+    (tmp_path / "gradle.lockfile").write_text("org.slf4j:slf4j-api:2.0.9=runtimeClasspath\n")
+    monkeypatch.chdir(tmp_path)
+    github_client = MagicMock()
+
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        lockfiles=["requirements.txt", "*.lockfile"],
+        packages_ignore=[PackageURL(type="pypi", name="ignored")],
+    )
+    retriever = PackagesRetriever.create(args, github_client)
+
+    assert retriever.get_packages_urls_to_check() == [
+        PackageURL(type="pypi", name="django", version="5.0.1"),
+        PackageURL(type="maven", namespace="org.slf4j", name="slf4j-api", version="2.0.9"),
+    ]
+    github_client.fetch_github_sbom.assert_not_called()
+    github_client.stream_github_sbom_packages.assert_not_called()
+
+
+def test_get_packages_diff():
+    github_client = MagicMock()
+    github_client.fetch_dependency_changes.return_value = [
+        DependencyChange(change_type="added", manifest="pom.xml", name="com.example:updated", version="2.0.0",
+                         package_url="pkg:maven/com.example/updated@2.0.0"),
+        DependencyChange(change_type="added", manifest="module/pom.xml", name="com.example:updated",
+                         version="2.0.0", package_url="pkg:maven/com.example/updated@2.0.0"),
+        DependencyChange(change_type="removed", manifest="pom.xml", name="com.example:updated", version="1.0.0",
+                         package_url="pkg:maven/com.example/updated@1.0.0"),
+        DependencyChange(change_type="added", manifest="requirements.txt", name="Django", version="5.0",
+                         package_url="pkg:pypi/django@5.0"),
+        DependencyChange(change_type="added", manifest="pom.xml", name="com.example:ignored", version="1.0",
+                         package_url="pkg:maven/com.example/ignored@1.0"),
+        DependencyChange(change_type="added", manifest="Gemfile", name="unknown", version="1.0"),
+        DependencyChange(change_type="removed", manifest="pom.xml", name="com.example:removed", version="1.0.0",
+                         package_url="pkg:maven/com.example/removed@1.0.0"),
+    ]
+
+    args = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        github_token="token",
+        packages_ignore=[PackageURL(type="maven", namespace="com.example", name="ignored")],
+        diff_base_ref="main",
+        diff_head_ref="feature",
+    )
+    retriever = PackagesRetriever.create(args, github_client)
+    packages_diff = retriever.get_packages_diff()
+
+    github_client.fetch_dependency_changes.assert_called_once_with(
+        owner="owner", repo="repo", base_ref="main", head_ref="feature", token="token"
+    )
+    assert packages_diff.packages_urls_to_check() == [
+        PackageURL.from_string("pkg:maven/com.example/updated@2.0.0"),
+        PackageURL.from_string("pkg:pypi/django@5.0"),
+    ]
+    assert packages_diff.new_packages_urls() == [PackageURL.from_string("pkg:pypi/django@5.0")]
+    assert packages_diff.updated_packages_urls() == [PackageURL.from_string("pkg:maven/com.example/updated@2.0.0")]
+    assert packages_diff.removed_packages_urls() == [PackageURL.from_string("pkg:maven/com.example/removed@1.0.0")]
+
+    assert retriever.get_packages_urls_to_check() == packages_diff.packages_urls_to_check()
+    github_client.fetch_github_sbom.assert_not_called()
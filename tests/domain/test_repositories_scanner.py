@@ -0,0 +1,155 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.arguments.action_arguments import ActionArguments, MaintenanceMetricScore, MaintenanceMetricSlug
+from src.clients.github.model import SBOMResponseProjection
+from src.clients.package_maintenance.model import (
+    BinaryRepositoryProjection,
+    MaintenanceMetric,
+    PackageMetadataProjection,
+    PackagesRequest,
+    PackagesResponseProjection,
+)
+from src.service.packages_maintenance_retriever import PackagesMaintenanceRetriever
+from src.service.repositories_scanner import RepositoriesScanner, RepositoriesScanError
+from src.view.repositories_maintenance_report_document import RepositoriesMaintenanceReportDocument
+
+REPOSITORIES_PACKAGES = {
+    "repo-a": ["shared", "unmaintained", "only-a"],
+    "repo-b": ["shared", "unmaintained"],
+    "repo-c": ["shared", "unknown"],
+}
+
+
+def _sbom(names):
+    return SBOMResponseProjection.model_validate(
+        {
+            "sbom": {
+                "packages": [
+                    {
+                        "name": name,
+                        "externalRefs": [
+                            {"referenceType": "purl", "referenceLocator": f"pkg:maven/com.example/{name}@1.0.0"}
+                        ],
+                    }
+                    for name in names
+                ]
+            }
+        }
+    )
+
+
+def _fetch_github_sbom(owner, repo, token=None, response_model=None):
+    if repo == "repo-failing":
+        raise RuntimeError("404 Not Found")
+    return _sbom(REPOSITORIES_PACKAGES[repo])
+
+
+def _fetch_packages(payload: PackagesRequest, response_model=None):
+    packages = []
+    for package in payload.packages:
+        name = package.binary_repository_id.split(":")[1]
+        if name == "unknown":
+            continue
+        packages.append(
+            PackageMetadataProjection(
+                binary_repository=BinaryRepositoryProjection(
+                    type="maven",
+                    id=package.binary_repository_id,
+                    latest_version="1.0.0",
+                    url="https://repo.example.com/package",
+                    release_recency=MaintenanceMetric(score="D" if name == "unmaintained" else "A", value=1),
+                ),
+                source_repository=None,
+            )
+        )
+    return PackagesResponseProjection(packages=packages)
+
+
+@pytest.fixture
+def github_client():
+    github_client = MagicMock()
+    github_client.fetch_github_sbom.side_effect = _fetch_github_sbom
+    github_client.list_organization_repositories.return_value = ["repo-a", "repo-c"]
+    return github_client
+
+
+def _arguments(**kwargs):
+    return ActionArguments(
+        github_repository_owner="",
+        github_repository_name="",
+        packages_scores_thresholds={MaintenanceMetricSlug.binary_release_recency: MaintenanceMetricScore.B},
+        **kwargs,
+    )
+
+
+def test_packages_are_retrieved_once_for_all_repositories(github_client):
+    package_maintenance_client = MagicMock()
+    package_maintenance_client.fetch_packages.side_effect = _fetch_packages
+    arguments = _arguments(
+        github_repositories=[("organization", "repo-a"), ("organization", "repo-b"), ("organization", "repo-failing")],
+        github_organization="organization",
+    )
+    scanner = RepositoriesScanner.create(
+        arguments, github_client, PackagesMaintenanceRetriever(package_maintenance_client)
+    )
+
+    report = scanner.scan()
+
+    assert package_maintenance_client.fetch_packages.call_count == 1
+    assert len(package_maintenance_client.fetch_packages.call_args.args[0].packages) == 4
+    assert list(report.repositories_reports()) == ["organization/repo-a", "organization/repo-b", "organization/repo-c"]
+    assert list(report.failed_repositories()) == ["organization/repo-failing"]
+
+    summaries = {summary.repository: summary for summary in report.repositories_summaries()}
+    assert summaries["organization/repo-a"].packages_count == 3
+    assert summaries["organization/repo-a"].below_threshold_count == 1
+    assert summaries["organization/repo-c"].missing_data_count == 1
+
+    below_threshold_packages = report.below_threshold_packages()
+    assert len(below_threshold_packages) == 1
+    assert below_threshold_packages[0].package.binary_repository.id == "com.example:unmaintained"
+    assert below_threshold_packages[0].repositories == ["organization/repo-a", "organization/repo-b"]
+
+    markdown = RepositoriesMaintenanceReportDocument(report).render()
+    assert "Package maintenance report of <code>organization/repo-b</code>" in markdown
+    assert "404 Not Found" in markdown
+    assert markdown.count("This report was generated by the Package Maintenance Report Action.") == 1
+
+
+def test_scan_error_keeps_report_on_retrieved_packages(github_client):
+    package_maintenance_client = MagicMock()
+    package_maintenance_client.fetch_packages.side_effect = RuntimeError("502 Bad Gateway")
+    scanner = RepositoriesScanner.create(
+        _arguments(github_repositories=[("organization", "repo-a")]),
+        github_client,
+        PackagesMaintenanceRetriever(package_maintenance_client),
+    )
+
+    with pytest.raises(RepositoriesScanError) as error_info:
+        scanner.scan()
+
+    report = error_info.value.report
+    assert report.repositories_summaries()[0].packages_count == 0
+
+
+def test_scan_fails_when_no_repository_is_scanned(github_client):
+    github_client.fetch_github_sbom.side_effect = RuntimeError("401 Unauthorized\n| Bad credentials |")
+    package_maintenance_client = MagicMock()
+    scanner = RepositoriesScanner.create(
+        _arguments(github_repositories=[("organization", "repo-a"), ("organization", "repo-b")]),
+        github_client,
+        PackagesMaintenanceRetriever(package_maintenance_client),
+    )
+
+    with pytest.raises(RepositoriesScanError, match="Failed to retrieve packages of all 2 repositories") as error_info:
+        scanner.scan()
+
+    report = error_info.value.report
+    assert list(report.failed_repositories()) == ["organization/repo-a", "organization/repo-b"]
+    package_maintenance_client.fetch_packages.assert_not_called()
+
+    markdown = RepositoriesMaintenanceReportDocument(report).render()
+    # Multi-line errors with pipes stay within their table cells.
+    assert "| <code>organization/repo-a</code> | 401 Unauthorized<br>\\| Bad credentials \\| |" in markdown
@@ -0,0 +1,73 @@
+from src.arguments.action_arguments import (
+    ActionArguments,
+    MaintenanceMetricScore,
+    MaintenanceMetricSlug,
+    default_packages_scores_thresholds,
+)
+from src.clients.package_maintenance.model import (
+    BinaryRepositoryProjection,
+    MaintenanceMetric,
+    PackageMetadataProjection,
+    SourceRepositoryProjection,
+)
+from src.models.threshold_evaluator import ThresholdEvaluator
+
+
+def _package(release_recency_score, commits_frequency_score=None) -> PackageMetadataProjection:
+    source_repository = None
+    if commits_frequency_score:
+        source_repository = SourceRepositoryProjection(
+            url="https://github.com/example/example",
+            commits_frequency=MaintenanceMetric(score=commits_frequency_score, value=1),
+            commits_recency=None,
+            issues_lifetime=None,
+            issues_open_percentage=None,
+            pull_requests_lifetime=None,
+            pull_requests_open_percentage=None,
+        )
+    return PackageMetadataProjection(
+        binary_repository=BinaryRepositoryProjection(
+            id="com.example:example",
+            type="maven",
+            latest_version="1.0.0",
+            url="https://repo.example.com/package",
+            release_recency=MaintenanceMetric(score=release_recency_score, value=1),
+        ),
+        source_repository=source_repository,
+    )
+
+
+def test_below_threshold_metrics():
+    evaluator = ThresholdEvaluator({
+        MaintenanceMetricSlug.binary_release_recency: MaintenanceMetricScore.B,
+        MaintenanceMetricSlug.source_commit_frequency: MaintenanceMetricScore.A,
+    })
+
+    assert evaluator.below_threshold_metrics(_package("B", "A")) == set()
+    assert evaluator.below_threshold_metrics(_package("C", "B")) == {
+        MaintenanceMetricSlug.binary_release_recency,
+        MaintenanceMetricSlug.source_commit_frequency,
+    }
+    # Missing source repository metrics and unknown scores are not below the threshold.
+    assert evaluator.below_threshold_metrics(_package("D")) == {MaintenanceMetricSlug.binary_release_recency}
+    assert evaluator.below_threshold_metrics(_package("?")) == set()
+
+
+def test_below_threshold_metrics_batch():
+    evaluator = ThresholdEvaluator({MaintenanceMetricSlug.binary_release_recency: MaintenanceMetricScore.C})
+
+    assert evaluator.below_threshold_metrics_batch([_package("A"), _package("D"), _package("C")]) == [
+        set(), {MaintenanceMetricSlug.binary_release_recency}, set()
+    ]
+
+
+def test_create_from_default_thresholds():
+    arguments = ActionArguments(github_repository_owner="owner", github_repository_name="repo")
+    assert arguments.packages_scores_thresholds == default_packages_scores_thresholds()
+
+    evaluator = ThresholdEvaluator.create(arguments)
+
+    assert evaluator.below_threshold_metrics(_package("C", "C")) == {
+        MaintenanceMetricSlug.binary_release_recency,
+        MaintenanceMetricSlug.source_commit_frequency,
+    }
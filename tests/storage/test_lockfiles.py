@@ -0,0 +1,131 @@
+import json
+
+import pytest
+from packageurl import PackageURL
+
+from src.storage.lockfiles import (
+    Lockfiles,
+    get_lockfile_parser,
+    parse_gradle_lockfile,
+    parse_maven_dependency_list,
+    parse_pipfile_lock,
+    parse_poetry_lock,
+    parse_requirements,
+)
+
+
+def test_parse_poetry_lock():
+    content = """
+[[package]]
+name = "Django"
+version = "5.0.1"
+description = "A high-level Python web framework"
+optional = false
+
+[package.dependencies]
+asgiref = ">=3.7.0,<4"
+
+[[package]]
+name = "asgiref"
+version = "3.7.2"
+
+[metadata]
+lock-version = "2.0"
+"""
+    assert list(parse_poetry_lock(content)) == [
+        PackageURL(type="pypi", name="Django", version="5.0.1"),
+        PackageURL(type="pypi", name="asgiref", version="3.7.2"),
+    ]
+
+
+def test_parse_pipfile_lock():
+    content = json.dumps({
+        "_meta": {"hash": {"sha256": "0"}},
+        "default": {"requests": {"hashes": [], "version": "==2.32.3"}},
+        "develop": {"pytest": {"version": "==8.3.3"}, "local": {"path": "."}},
+    })
+    assert list(parse_pipfile_lock(content)) == [
+        PackageURL(type="pypi", name="requests", version="2.32.3"),
+        PackageURL(type="pypi", name="pytest", version="8.3.3"),
+        PackageURL(type="pypi", name="local"),
+    ]
+
+
+def test_parse_requirements():
+    content = """
+# Pinned requirements
+requests[socks]==2.32.3 ; python_version >= "3.8"
+Django == 5.0.1 \\
+    --hash=sha256:0
+flask>=3.0  # not pinned
+-r other-requirements.txt
+--index-url https://pypi.example.com/simple
+-e .
+package @ https://example.com/package.whl
+git+https://github.com/example/package.git
+"""
+    assert list(parse_requirements(content)) == [
+        PackageURL(type="pypi", name="requests", version="2.32.3"),
+        PackageURL(type="pypi", name="Django", version="5.0.1"),
+        PackageURL(type="pypi", name="flask"),
+    ]
+
+
+def test_parse_gradle_lockfile():
+    content = """# This is a Gradle generated file for dependency locking.
+# Manual edits can break the build and are not advised.
+com.google.guava:guava:31.1-jre=compileClasspath,runtimeClasspath
+org.slf4j:slf4j-api:2.0.9=runtimeClasspath
+empty=annotationProcessor
+"""
+    assert list(parse_gradle_lockfile(content)) == [
+        PackageURL(type="maven", namespace="com.google.guava", name="guava", version="31.1-jre"),
+        PackageURL(type="maven", namespace="org.slf4j", name="slf4j-api", version="2.0.9"),
+    ]
+
+
+def test_parse_maven_dependency_list():
+    content = """
+The following files have been resolved:
+   org.slf4j:slf4j-api:jar:2.0.9:compile
+   junit:junit:jar:4.13.2:test -- module junit
+   io.netty:netty-transport-native-epoll:jar:linux-x86_64:4.1.100.Final:runtime
+   none
+"""
+    assert list(parse_maven_dependency_list(content)) == [
+        PackageURL(type="maven", namespace="org.slf4j", name="slf4j-api", version="2.0.9"),
+        PackageURL(type="maven", namespace="junit", name="junit", version="4.13.2"),
+        PackageURL(type="maven", namespace="io.netty", name="netty-transport-native-epoll", version="4.1.100.Final"),
+    ]
+
+
+def test_get_lockfile_parser():
+    assert get_lockfile_parser("poetry.lock") is parse_poetry_lock
+    assert get_lockfile_parser("app/Pipfile.lock") is parse_pipfile_lock
+    assert get_lockfile_parser("requirements-dev.txt") is parse_requirements
+    assert get_lockfile_parser("module/gradle.lockfile") is parse_gradle_lockfile
+    assert get_lockfile_parser("target/dependencies.txt") is parse_maven_dependency_list
+    assert get_lockfile_parser("package-lock.json") is None
+
+
+def test_iter_packages_urls(tmp_path):
+    (tmp_path / "requirements.txt").write_text("requests==2.32.3\n")
+    (tmp_path / "service").mkdir()
+    (tmp_path / "service" / "requirements.txt").write_text("requests==2.32.3\ndjango==5.0.1\n")
+    (tmp_path / "service" / "gradle.lockfile").write_text("org.slf4j:slf4j-api:2.0.9=runtimeClasspath\n")
+    (tmp_path / "package-lock.json").write_text("{}")
+
+    lockfiles = Lockfiles(["**/requirements.txt", "**/*.lockfile", "package-lock.json"], root_dir=str(tmp_path))
+
+    assert list(lockfiles.iter_packages_urls()) == [
+        PackageURL(type="pypi", name="requests", version="2.32.3"),
+        PackageURL(type="pypi", name="django", version="5.0.1"),
+        PackageURL(type="maven", namespace="org.slf4j", name="slf4j-api", version="2.0.9"),
+    ]
+
+
+def test_no_matching_lockfiles(tmp_path):
+    lockfiles = Lockfiles(["**/poetry.lock"], root_dir=str(tmp_path))
+
+    with pytest.raises(ValueError, match="No lockfiles found"):
+        list(lockfiles.iter_packages_urls())
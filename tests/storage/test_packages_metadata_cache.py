@@ -0,0 +1,92 @@
+from src.clients.package_maintenance.model import PackageMetadata, BinaryRepository, MaintenanceMetric
+from src.storage.packages_metadata_cache import PackagesMetadataCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _package_metadata(binary_repository_id: str) -> PackageMetadata:
+    return PackageMetadata(
+        binary_repository=BinaryRepository(
+            type="maven",
+            id=binary_repository_id,
+            latest_version="1.0.0",
+            latest_version_published_at="2021-11-03T00:00:00Z",
+            name=None,
+            description=None,
+            url="https://repo.example.com/package",
+            source_repository_original_url=None,
+            source_repository_normal_url=None,
+            source_repository_id=None,
+            source_repository_type=None,
+            release_recency=MaintenanceMetric(score="A", value=1),
+        ),
+        source_repository=None,
+    )
+
+
+def _key(name: str):
+    return "maven", f"com.example:{name}"
+
+
+def test_cache_is_persisted_between_runs(tmp_path):
+    clock = FakeClock()
+    cache = PackagesMetadataCache.load(str(tmp_path), ttl_seconds=60, max_entries=10, clock=clock)
+    found, missing = _key("found"), _key("missing")
+
+    cached, to_fetch = cache.split_cached([found, missing])
+    assert cached == []
+    assert to_fetch == [found, missing]
+
+    cache.put([found, missing], [_package_metadata("com.example:found")])
+    cache.save()
+
+    cache = PackagesMetadataCache.load(str(tmp_path), ttl_seconds=60, max_entries=10, clock=clock)
+    cached, to_fetch = cache.split_cached([found, missing, _key("new")])
+    assert [package.binary_repository.id for package in cached] == ["com.example:found"]
+    # Package missing in the index is cached too and is not requested again.
+    assert to_fetch == [_key("new")]
+
+
+def test_expired_entries_are_fetched_again(tmp_path):
+    clock = FakeClock()
+    cache = PackagesMetadataCache.load(str(tmp_path), ttl_seconds=60, max_entries=10, clock=clock)
+    package_url = _key("found")
+    cache.put([package_url], [_package_metadata("com.example:found")])
+
+    clock.now += 61
+    cached, to_fetch = cache.split_cached([package_url])
+
+    assert cached == []
+    assert to_fetch == [package_url]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    clock = FakeClock()
+    cache = PackagesMetadataCache.load(str(tmp_path), ttl_seconds=60, max_entries=2, clock=clock)
+    for name in ["a", "b", "c"]:
+        cache.put([_key(name)], [_package_metadata(f"com.example:{name}")])
+        clock.now += 1
+    cache.split_cached([_key("a")])
+    cache.save()
+
+    cache = PackagesMetadataCache.load(str(tmp_path), ttl_seconds=60, max_entries=2, clock=clock)
+    cached, to_fetch = cache.split_cached([_key(name) for name in ["a", "b", "c"]])
+
+    assert sorted(package.binary_repository.id for package in cached) == ["com.example:a", "com.example:c"]
+    assert to_fetch == [_key("b")]
+
+
+def test_corrupted_cache_is_ignored(tmp_path):
+    (tmp_path / "packages-metadata.json").write_text("{not a json")
+
+    cache = PackagesMetadataCache.load(str(tmp_path), ttl_seconds=60, max_entries=10)
+    cached, to_fetch = cache.split_cached([_key("a")])
+
+    assert cached == []
+    assert to_fetch == [_key("a")]
@@ -0,0 +1,22 @@
+from src.arguments.action_arguments import ActionArguments
+from src.storage.sbom_cache import SbomCache, CachedSbom
+
+
+def test_sbom_cache_is_disabled_without_cache_dir():
+    args = ActionArguments(github_repository_owner="owner", github_repository_name="repo")
+
+    assert SbomCache.create(args) is None
+
+
+def test_sbom_cache_put_get(tmp_path):
+    args = ActionArguments(github_repository_owner="owner", github_repository_name="repo", cache_dir=str(tmp_path))
+    cache = SbomCache.create(args)
+
+    assert cache.get("owner", "repo") is None
+
+    cache.put("owner", "repo", CachedSbom(etag='"v1"', body=b'{"sbom": {}}'))
+    cache.put("owner", "repo", CachedSbom(etag='"v2"', body=b'{"sbom": {"name": "v2"}}'))
+
+    assert cache.get("owner", "repo") == CachedSbom(etag='"v2"', body=b'{"sbom": {"name": "v2"}}')
+    assert cache.get("owner", "other-repo") is None
+    assert (tmp_path / "sbom" / "owner__repo.json").exists()
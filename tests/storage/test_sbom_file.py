@@ -0,0 +1,98 @@
+import json
+import time
+
+import pytest
+
+from src.storage.sbom_file import SbomFile, SbomFileFormat
+
+SPDX_PACKAGES = [
+    {
+        "SPDXID": "SPDXRef-maven-com.example-package-1.0.0",
+        "name": "com.example:package",
+        "externalRefs": [
+            {
+                "referenceCategory": "PACKAGE-MANAGER",
+                "referenceType": "purl",
+                "referenceLocator": "pkg:maven/com.example/package@1.0.0",
+            }
+        ],
+    },
+    {"SPDXID": "SPDXRef-pypi-django-5.0", "name": "django", "externalRefs": []},
+]
+CYCLONEDX_COMPONENTS = [
+    {"type": "library", "name": "package", "purl": "pkg:maven/com.example/package@1.0.0"},
+    {"type": "library", "name": "django", "purl": "pkg:pypi/django@5.0"},
+]
+
+
+def _write(path, document) -> str:
+    path.write_text(json.dumps(document, indent=2))
+    return str(path)
+
+
+def test_detect_github_spdx_format(tmp_path):
+    path = _write(tmp_path / "sbom.json", {"sbom": {"spdxVersion": "SPDX-2.3", "packages": SPDX_PACKAGES}})
+    sbom_file = SbomFile(path)
+
+    assert sbom_file.detect_format() == SbomFileFormat.GITHUB_SPDX
+    assert list(sbom_file.iter_packages(SbomFileFormat.GITHUB_SPDX)) == SPDX_PACKAGES
+
+
+def test_detect_spdx_format(tmp_path):
+    path = _write(tmp_path / "sbom.spdx.json", {"spdxVersion": "SPDX-2.3", "name": "repo", "packages": SPDX_PACKAGES})
+    sbom_file = SbomFile(path)
+
+    assert sbom_file.detect_format() == SbomFileFormat.SPDX
+    assert list(sbom_file.iter_packages(SbomFileFormat.SPDX)) == SPDX_PACKAGES
+
+
+def test_detect_cyclonedx_format(tmp_path):
+    path = _write(
+        tmp_path / "bom.json",
+        {"bomFormat": "CycloneDX", "specVersion": "1.5", "metadata": {}, "components": CYCLONEDX_COMPONENTS},
+    )
+    sbom_file = SbomFile(path)
+
+    assert sbom_file.detect_format() == SbomFileFormat.CYCLONEDX
+    assert list(sbom_file.iter_packages(SbomFileFormat.CYCLONEDX)) == CYCLONEDX_COMPONENTS
+
+
+def test_packages_are_read_in_chunks(tmp_path):
+    packages = [{**SPDX_PACKAGES[0], "name": f"com.example:package-{i}"} for i in range(100)]
+    path = _write(tmp_path / "sbom.spdx.json", {"spdxVersion": "SPDX-2.3", "packages": packages})
+
+    # Chunks smaller than a package split packages between chunks.
+    assert list(SbomFile(path, chunk_size=7).iter_packages(SbomFileFormat.SPDX)) == packages
+
+
+def test_unsupported_format_is_rejected(tmp_path):
+    path = _write(tmp_path / "other.json", {"dependencies": []})
+
+    with pytest.raises(ValueError, match="Unsupported format of SBOM file"):
+        SbomFile(path).detect_format()
+
+
+def test_empty_file_is_rejected(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+
+    with pytest.raises(ValueError, match="Unexpected end of JSON document"):
+        list(SbomFile(str(path)).iter_packages(SbomFileFormat.SPDX))
+
+
+def test_large_sections_before_packages_are_skipped(tmp_path):
+    files = [
+        {"SPDXID": f"SPDXRef-File-{i}", "fileName": f"./src/{'module/' * 10}file-{i}.py", "checksums": []}
+        for i in range(100_000)
+    ]
+    relationships = [{"spdxElementId": f"SPDXRef-File-{i}", "relationshipType": "CONTAINS"} for i in range(10_000)]
+    document = {"spdxVersion": "SPDX-2.3", "files": files, "relationships": relationships, "packages": SPDX_PACKAGES}
+    path = _write(tmp_path / "sbom.spdx.json", document)
+    sbom_file = SbomFile(path)
+
+    started_at = time.monotonic()
+    packages = list(sbom_file.iter_packages(sbom_file.detect_format()))
+
+    assert packages == SPDX_PACKAGES
+    # Re-decoding the sections on every chunk took minutes for a document of this size.
+    assert time.monotonic() - started_at < 10
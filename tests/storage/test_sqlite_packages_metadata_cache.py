@@ -0,0 +1,191 @@
+import sqlite3
+import threading
+
+from src.clients.package_maintenance.model import PackageMetadata, BinaryRepository, MaintenanceMetric
+from src.storage.sqlite_packages_metadata_cache import SqlitePackagesMetadataCache, SQLITE_KEYS_PER_STATEMENT
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _package_metadata(binary_repository_id: str) -> PackageMetadata:
+    return PackageMetadata(
+        binary_repository=BinaryRepository(
+            type="maven",
+            id=binary_repository_id,
+            latest_version="1.0.0",
+            latest_version_published_at="2021-11-03T00:00:00Z",
+            name=None,
+            description=None,
+            url="https://repo.example.com/package",
+            source_repository_original_url=None,
+            source_repository_normal_url=None,
+            source_repository_id=None,
+            source_repository_type=None,
+            release_recency=MaintenanceMetric(score="A", value=1),
+        ),
+        source_repository=None,
+    )
+
+
+def _key(name: str):
+    return "maven", f"com.example:{name}"
+
+
+def _open(tmp_path, clock, ttl_seconds=60, max_entries=10) -> SqlitePackagesMetadataCache:
+    return SqlitePackagesMetadataCache.open(
+        str(tmp_path / "packages-metadata.sqlite3"), ttl_seconds=ttl_seconds, max_entries=max_entries, clock=clock
+    )
+
+
+def test_cache_is_shared_between_processes(tmp_path):
+    clock = FakeClock()
+    cache = _open(tmp_path, clock)
+    other_cache = _open(tmp_path, clock)
+    found, missing = _key("found"), _key("missing")
+
+    cached, to_fetch = cache.split_cached([found, missing])
+    assert cached == []
+    assert to_fetch == [found, missing]
+
+    # Fetched packages are visible to other connections without saving the cache.
+    cache.put([found, missing], [_package_metadata("com.example:found")])
+    cached, to_fetch = other_cache.split_cached([_key("new"), found, missing])
+    assert [package.binary_repository.id for package in cached] == ["com.example:found"]
+    # Package missing in the index is cached too and is not requested again.
+    assert to_fetch == [_key("new")]
+
+
+def test_expired_entries_are_fetched_again(tmp_path):
+    clock = FakeClock()
+    cache = _open(tmp_path, clock, ttl_seconds=120)
+    cache.put([_key("found")], [_package_metadata("com.example:found")])
+
+    clock.now += 61
+    # Reader with a shorter TTL considers the entry expired, even though the writer would not.
+    cached, to_fetch = _open(tmp_path, clock, ttl_seconds=60).split_cached([_key("found")])
+    assert cached == []
+    assert to_fetch == [_key("found")]
+
+    cached, to_fetch = cache.split_cached([_key("found")])
+    assert len(cached) == 1
+    assert to_fetch == []
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    clock = FakeClock()
+    cache = _open(tmp_path, clock, max_entries=2)
+    for name in ["a", "b", "c", "expired"]:
+        cache.put([_key(name)], [_package_metadata(f"com.example:{name}")])
+        clock.now += 1
+    cache.split_cached([_key("a")])
+    # Only the expired entry is deleted, the rest still exceeds the limit.
+    _open(tmp_path, clock, ttl_seconds=1).put([_key("expired")], [])
+    clock.now += 2
+    cache.save()
+
+    cached, to_fetch = _open(tmp_path, clock, max_entries=2).split_cached(
+        [_key(name) for name in ["a", "b", "c", "expired"]]
+    )
+
+    assert sorted(package.binary_repository.id for package in cached) == ["com.example:a", "com.example:c"]
+    assert to_fetch == [_key("b"), _key("expired")]
+
+
+def test_large_batches_are_looked_up_in_chunks(tmp_path):
+    cache = _open(tmp_path, FakeClock(), max_entries=10_000)
+    keys = [_key(str(index)) for index in range(SQLITE_KEYS_PER_STATEMENT * 2 + 1)]
+    cache.put(keys[::2], [_package_metadata(f"com.example:{index}") for index in range(0, len(keys), 2)])
+
+    cached, to_fetch = cache.split_cached(keys)
+
+    assert len(cached) == SQLITE_KEYS_PER_STATEMENT + 1
+    assert to_fetch == keys[1::2]
+
+
+def test_concurrent_writers(tmp_path):
+    clock = FakeClock()
+    caches = [_open(tmp_path, clock, max_entries=10_000) for _ in range(4)]
+
+    def write(writer: int, cache: SqlitePackagesMetadataCache):
+        for batch in range(20):
+            keys = [_key(f"{writer}-{batch}-{index}") for index in range(10)]
+            cache.put(keys, [_package_metadata(key[1]) for key in keys])
+            cache.split_cached(keys)
+        cache.save()
+
+    threads = [threading.Thread(target=write, args=(writer, cache)) for writer, cache in enumerate(caches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    keys = [_key(f"{writer}-{batch}-{index}") for writer in range(4) for batch in range(20) for index in range(10)]
+    cached, to_fetch = _open(tmp_path, clock).split_cached(keys)
+    assert len(cached) == len(keys)
+    assert to_fetch == []
+
+
+def test_broken_database_is_ignored(tmp_path):
+    clock = FakeClock()
+    cache = _open(tmp_path, clock)
+    cache.close()
+
+    cached, to_fetch = cache.split_cached([_key("a")])
+    cache.put([_key("a")], [_package_metadata("com.example:a")])
+    cache.save()
+
+    assert cached == []
+    assert to_fetch == [_key("a")]
+
+
+def test_lookup_missing_the_cache_does_not_take_write_lock(tmp_path):
+    cache = _open(tmp_path, FakeClock())
+    statements = []
+    cache._connection.set_trace_callback(statements.append)
+
+    cached, to_fetch = cache.split_cached([_key("a"), _key("b")])
+
+    assert cached == []
+    assert to_fetch == [_key("a"), _key("b")]
+    assert not any(statement.startswith("BEGIN") for statement in statements)
+
+
+class _FailingCommitConnection:
+    """
+    Connection failing to commit once, as when the database stays locked by another process.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+        self.failed = False
+
+    def execute(self, statement, *args):
+        if statement == "COMMIT" and not self.failed:
+            self.failed = True
+            raise sqlite3.OperationalError("database is locked")
+        return self._connection.execute(statement, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def test_failed_commit_is_rolled_back(tmp_path):
+    clock = FakeClock()
+    cache = _open(tmp_path, clock)
+    connection = _FailingCommitConnection(cache._connection)
+    cache._connection = connection
+
+    cache.put([_key("a")], [_package_metadata("com.example:a")])
+    cache.put([_key("b")], [_package_metadata("com.example:b")])
+
+    assert connection.failed
+    assert not connection.in_transaction
+    cached, to_fetch = cache.split_cached([_key("a"), _key("b")])
+    assert [package.binary_repository.id for package in cached] == ["com.example:b"]
+    assert to_fetch == [_key("a")]
@@ -1,10 +1,14 @@
+import asyncio
 import pytest
 import sys
+from argparse import Namespace
 from unittest.mock import patch
 
 from main import parse_arguments
 from src.arguments.action_arguments import MaintenanceMetricSlug, MaintenanceMetricScore
 from src.arguments.parse_action_arguments import _parse_packages_scores_thresholds
+from src.action import perform_action
+from src.async_action import perform_action_async
 
 
 def test_parse_packages_scores_thresholds():
@@ -85,3 +89,52 @@ def test_multiline_ignore_packages():
         assert repo.strip() == 'repo'
         assert ignore_packages == ['pkg1', 'pkg2', 'pkg3']
         assert args.packages_scores_thresholds is None
+
+
+def test_async_action_rejects_multi_repository_scan():
+    args = Namespace(
+        github_repository=None,
+        github_token="token",
+        packages_ignore=None,
+        packages_scores_thresholds=None,
+        github_organization="organization",
+    )
+
+    with pytest.raises(ValueError, match="not supported by the asynchronous action"):
+        asyncio.run(perform_action_async(args))
+
+
+def test_async_action_rejects_pipeline_mode():
+    args = Namespace(
+        github_repository="owner/repo",
+        github_token="token",
+        packages_ignore=None,
+        packages_scores_thresholds=None,
+        pipeline="true",
+    )
+
+    with pytest.raises(ValueError, match="Pipeline mode is not supported by the asynchronous action"):
+        asyncio.run(perform_action_async(args))
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_packages_metadata_store_is_closed_on_error(asynchronous):
+    args = Namespace(
+        github_repository="owner/repo",
+        github_token="token",
+        packages_ignore=None,
+        packages_scores_thresholds=None,
+    )
+    module = "src.async_action" if asynchronous else "src.action"
+    retriever = "AsyncPackagesRetriever" if asynchronous else "PackagesRetriever"
+
+    with patch(f"{module}.create_packages_metadata_store") as create_store, patch(
+        f"{module}.{retriever}.create", side_effect=RuntimeError("Failed")
+    ):
+        with pytest.raises(RuntimeError):
+            if asynchronous:
+                asyncio.run(perform_action_async(args))
+            else:
+                perform_action(args)
+
+    create_store.return_value.close.assert_called_once()
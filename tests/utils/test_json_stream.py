@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from src.utils.json_stream import JsonArrayStreamParser, iter_json_array_items
+
+
+def _chunks(content: bytes, size: int):
+    return [content[i : i + size] for i in range(0, len(content), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+def test_iter_json_array_items(chunk_size):
+    document = {
+        "sbom": {
+            "SPDXID": "SPDXRef-DOCUMENT",
+            "creationInfo": {"created": "2021-09-01T00:00:00Z", "creators": ["packages"]},
+            "size": 12345,
+            "packages": [{"name": f"pàckage-{i}", "version": 1.5e3, "externalRefs": []} for i in range(100)],
+            "relationships": [{"spdxElementId": "SPDXRef-DOCUMENT"}],
+        }
+    }
+    content = json.dumps(document, ensure_ascii=False, indent=2).encode()
+
+    items = list(iter_json_array_items(_chunks(content, chunk_size), ("sbom", "packages")))
+
+    assert items == document["sbom"]["packages"]
+
+
+def test_parsing_stops_after_array():
+    chunks = iter([b'{"packages": [1, 2]', b', "rest": "not json'])
+
+    assert list(iter_json_array_items(chunks, ("packages",))) == [1, 2]
+    assert next(chunks) == b', "rest": "not json'
+
+
+def test_number_split_between_chunks():
+    assert list(iter_json_array_items([b'{"packages": [1, 2', b'3]}'], ("packages",))) == [1, 23]
+
+
+@pytest.mark.parametrize(
+    "chunks", [[b'{"packages": [1.', b"5]}"], [b'{"packages": [1e', b"5]}"], [b'{"packages": [-', b"1.5e1]}"]]
+)
+def test_fraction_and_exponent_split_between_chunks(chunks):
+    assert list(iter_json_array_items(chunks, ("packages",))) == [json.loads(b"".join(chunks))["packages"][0]]
+
+
+def test_skipped_number_split_between_chunks():
+    parser = JsonArrayStreamParser(("packages",))
+
+    assert parser.feed(b'{"size": 1') == []
+    assert parser.feed(b'2}') == []
+    assert parser.done
+
+
+def test_skipped_values_are_not_buffered():
+    skipped = {"files": [{"name": f'fi"le\\-{i}', "checksums": [{"value": "}]"}]} for i in range(20_000)]}
+    content = json.dumps({**skipped, "packages": [{"name": "package"}]}).encode()
+    parser = JsonArrayStreamParser(("packages",))
+    max_buffer_size = 0
+
+    items = []
+    for chunk in _chunks(content, 1024):
+        items.extend(parser.feed(chunk))
+        max_buffer_size = max(max_buffer_size, len(parser._buffer))
+
+    assert items == [{"name": "package"}]
+    assert max_buffer_size <= 2 * 1024
+
+
+def test_item_split_between_many_chunks_is_decoded_once():
+    item = {"name": "x" * 100_000, "nested": [{"value": '"]}'}]}
+    content = json.dumps({"packages": [item, 1]}).encode()
+
+    assert list(iter_json_array_items(_chunks(content, 7), ("packages",))) == [item, 1]
+
+
+def test_missing_path():
+    assert list(iter_json_array_items([b'{"sbom": {"name": "packages"}}'], ("sbom", "packages"))) == []
+
+
+def test_truncated_document():
+    with pytest.raises(ValueError):
+        list(iter_json_array_items([b'{"packages": [1, 2'], ("packages",)))
+
+
+def test_malformed_document():
+    parser = JsonArrayStreamParser(("packages",))
+
+    with pytest.raises(ValueError):
+        parser.feed(b'["packages"]')
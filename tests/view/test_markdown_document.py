@@ -0,0 +1,77 @@
+import io
+
+import pytest
+from packageurl import PackageURL
+
+from src.arguments.action_arguments import ActionArguments
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+from src.view.markdown_document import MarkdownDocument, OmittedContent
+from src.view.packages_maintenance_report_document import PackagesMaintenanceReportDocument
+
+
+def test_table_rows_are_written_to_sink_as_produced():
+    sink = io.StringIO()
+    document = MarkdownDocument(sink=sink)
+    written = []
+
+    def rows():
+        for i in range(3):
+            # Previous rows are already written when the next row is produced.
+            written.append(sink.getvalue().count("\n"))
+            yield [str(i), f"package-{i}"]
+
+    document.heading("Packages", level=3).table(headers=["#", "Name"], rows=rows())
+
+    assert written == [3, 4, 5]
+    assert sink.getvalue().splitlines()[-1] == "| 2 | package-2 |"
+    assert document.get_content() == ""
+
+
+def test_table_rejects_row_of_wrong_size():
+    with pytest.raises(ValueError, match="same number of columns"):
+        MarkdownDocument().table(headers=["#", "Name"], rows=[["1"]])
+
+
+def test_report_written_to_sink_equals_rendered_report():
+    report = PackagesMaintenanceReport.create(
+        packages=[PackageURL(type="maven", namespace="com.acme", name="private-package")],
+        packages_maintenance=[],
+        action_arguments=ActionArguments(
+            github_repository_owner="owner",
+            github_repository_name="repo",
+            packages_scores_thresholds={}
+        ),
+    )
+    document = PackagesMaintenanceReportDocument(report)
+    sink = io.StringIO()
+
+    document.write(sink)
+
+    assert sink.getvalue() == document.render()
+    assert "| maven | com.acme | private-package |" in sink.getvalue()
+
+
+def test_content_not_fitting_max_size_is_left_out():
+    document = MarkdownDocument(max_size=60)
+
+    document.heading("Packages", level=3).table(headers=["#", "Name"], rows=[["1", "a" * 40], ["2", "b"]])
+    document.text("Text not fitting").text("Short")
+
+    content = document.get_content()
+    assert len(content.encode()) <= 60
+    assert "| 2 | b |" in content
+    assert "Short" not in content
+    assert document.omitted == OmittedContent(rows=1, sections=0, fragments=2)
+
+
+def test_section_is_written_whole_or_left_out():
+    sink = io.StringIO()
+    document = MarkdownDocument(sink=sink, max_size=30)
+
+    for i in range(3):
+        with document.section():
+            document.heading(f"Section {i}").text("Text of section")
+
+    assert sink.getvalue() == "# Section 0\nText of section\n"
+    assert document.size == len(sink.getvalue())
+    assert document.omitted == OmittedContent(rows=0, sections=2, fragments=0)
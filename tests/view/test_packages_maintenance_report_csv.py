@@ -0,0 +1,108 @@
+import csv
+import io
+
+from packageurl import PackageURL
+
+from src.arguments.action_arguments import ActionArguments, MaintenanceMetricScore, MaintenanceMetricSlug
+from src.clients.package_maintenance.model import (
+    BinaryRepositoryProjection,
+    MaintenanceMetric,
+    PackageMetadataProjection,
+    SourceRepositoryProjection,
+)
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+from src.view.packages_maintenance_report_csv import write_found_packages_csv
+
+ARGUMENTS = ActionArguments(
+    github_repository_owner="owner",
+    github_repository_name="repo",
+    packages_scores_thresholds={
+        MaintenanceMetricSlug.binary_release_recency: MaintenanceMetricScore.B,
+        MaintenanceMetricSlug.source_commit_recency: MaintenanceMetricScore.B,
+    },
+)
+
+
+def _package_metadata(name: str, source_repository=None) -> PackageMetadataProjection:
+    return PackageMetadataProjection(
+        binary_repository=BinaryRepositoryProjection(
+            id=f"com.example:{name}",
+            type="maven",
+            latest_version="1.0.0",
+            url=f"https://repo.example.com/{name}",
+            release_recency=MaintenanceMetric(score="D", value=42),
+        ),
+        source_repository=source_repository,
+    )
+
+
+def _write_csv(packages_maintenance):
+    packages_urls = [
+        PackageURL(type="maven", namespace="com.example", name=package.binary_repository.id.split(":")[1])
+        for package in packages_maintenance
+    ]
+    report = PackagesMaintenanceReport.create(packages_urls, packages_maintenance, ARGUMENTS)
+    sink = io.StringIO(newline="")
+    write_found_packages_csv(sink, {"owner/repo": report})
+    sink.seek(0)
+    return list(csv.reader(sink))
+
+
+def test_headers_are_written_in_order():
+    headers, *_ = _write_csv([])
+
+    assert headers == [
+        "repository",
+        "type",
+        "id",
+        "latest_version",
+        "binary_url",
+        "source_url",
+        "binary_release_recency_value",
+        "binary_release_recency_score",
+        "source_commit_frequency_value",
+        "source_commit_frequency_score",
+        "source_commit_recency_value",
+        "source_commit_recency_score",
+        "source_issues_lifetime_value",
+        "source_issues_lifetime_score",
+        "issues_open_percentage_value",
+        "issues_open_percentage_score",
+        "pull_requests_lifetime_value",
+        "pull_requests_lifetime_score",
+        "pull_requests_open_percentage_value",
+        "pull_requests_open_percentage_score",
+        "below_threshold_metrics",
+    ]
+
+
+def test_package_without_source_repository():
+    headers, row = _write_csv([_package_metadata("binary-only")])
+    row = dict(zip(headers, row))
+
+    assert row["repository"] == "owner/repo"
+    assert row["id"] == "com.example:binary-only"
+    assert row["binary_url"] == "https://repo.example.com/binary-only"
+    assert row["source_url"] == ""
+    assert (row["binary_release_recency_value"], row["binary_release_recency_score"]) == ("42", "D")
+    assert (row["source_commit_recency_value"], row["source_commit_recency_score"]) == ("", "")
+    assert row["below_threshold_metrics"] == "binary_release_recency"
+
+
+def test_missing_metrics_and_below_threshold_metrics():
+    source_repository = SourceRepositoryProjection(
+        url="https://github.com/example/with-source",
+        commits_frequency=MaintenanceMetric(score="A", value=10),
+        commits_recency=MaintenanceMetric(score="C", value=400),
+        issues_lifetime=None,
+        issues_open_percentage=None,
+        pull_requests_lifetime=None,
+        pull_requests_open_percentage=None,
+    )
+    headers, row = _write_csv([_package_metadata("with-source", source_repository)])
+    row = dict(zip(headers, row))
+
+    assert row["source_url"] == "https://github.com/example/with-source"
+    assert (row["source_commit_frequency_value"], row["source_commit_frequency_score"]) == ("10", "A")
+    assert (row["source_issues_lifetime_value"], row["source_issues_lifetime_score"]) == ("", "")
+    assert row["below_threshold_metrics"] == "binary_release_recency source_commit_recency"
@@ -0,0 +1,98 @@
+import io
+import json
+
+from packageurl import PackageURL
+
+from src.arguments.action_arguments import ActionArguments, MaintenanceMetricScore, MaintenanceMetricSlug
+from src.clients.package_maintenance.model import BinaryRepositoryProjection, MaintenanceMetric, PackageMetadataProjection
+from src.models.packages_diff import PackagesDiff
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+from src.view.packages_maintenance_report_jsonl import create_run_metadata, write_packages_jsonl
+
+ARGUMENTS = ActionArguments(
+    github_repository_owner="owner",
+    github_repository_name="repo",
+    packages_scores_thresholds={MaintenanceMetricSlug.binary_release_recency: MaintenanceMetricScore.B},
+)
+
+
+def _report() -> PackagesMaintenanceReport:
+    packages_urls = [
+        PackageURL(type="maven", namespace="com.example", name="found", version="1.0.0"),
+        PackageURL(type="maven", namespace="com.example", name="found", version="2.0.0"),
+        PackageURL(type="maven", namespace="com.example", name="missing", version="1.0.0"),
+    ]
+    packages_maintenance = [
+        PackageMetadataProjection(
+            binary_repository=BinaryRepositoryProjection(
+                id="com.example:found",
+                type="maven",
+                latest_version="2.0.0",
+                url="https://repo.example.com/found",
+                release_recency=MaintenanceMetric(score="D", value=42),
+            ),
+            source_repository=None,
+        )
+    ]
+    return PackagesMaintenanceReport.create(packages_urls, packages_maintenance, ARGUMENTS)
+
+
+def test_write_packages_jsonl(monkeypatch):
+    monkeypatch.setenv("GITHUB_RUN_ID", "7")
+    monkeypatch.setenv("GITHUB_SHA", "abc")
+    sink = io.StringIO()
+
+    write_packages_jsonl(sink, {"owner/repo": _report()}, create_run_metadata(ARGUMENTS))
+
+    run, found, missing = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert run["type"] == "run"
+    assert run["github_run_id"] == "7"
+    assert run["github_sha"] == "abc"
+    assert run["packages_scores_thresholds"] == {"binary_release_recency": "B"}
+    assert run["diff"] is None
+
+    assert found["type"] == "package"
+    assert found["repository"] == "owner/repo"
+    assert found["key"] == ["maven", "com.example:found"]
+    assert found["packages_urls"] == ["pkg:maven/com.example/found@1.0.0", "pkg:maven/com.example/found@2.0.0"]
+    assert found["missing_data"] is False
+    assert found["metrics"]["binary_release_recency"] == {"value": 42, "score": "D"}
+    assert found["metrics"]["source_commit_frequency"] is None
+    assert found["below_threshold_metrics"] == ["binary_release_recency"]
+
+    assert missing["key"] == ["maven", "com.example:missing"]
+    assert missing["packages_urls"] == ["pkg:maven/com.example/missing@1.0.0"]
+    assert missing["missing_data"] is True
+    assert missing["below_threshold_metrics"] == []
+
+
+def test_run_metadata_of_diff():
+    diff = PackagesDiff("main", "feature", [], [])
+
+    run = create_run_metadata(ARGUMENTS, diff)
+
+    assert run["diff"] == {"base_ref": "main", "head_ref": "feature"}
+
+
+def test_found_package_key_is_canonical():
+    packages_urls = [PackageURL(type="pypi", name="Django_REST.framework", version="3.0.0")]
+    packages_maintenance = [
+        PackageMetadataProjection(
+            binary_repository=BinaryRepositoryProjection(
+                id="Django_REST.framework",
+                type="pypi",
+                latest_version="3.15.0",
+                url="https://pypi.org/project/djangorestframework",
+                release_recency=MaintenanceMetric(score="A", value=1),
+            ),
+            source_repository=None,
+        )
+    ]
+    report = PackagesMaintenanceReport.create(packages_urls, packages_maintenance, ARGUMENTS)
+    sink = io.StringIO()
+
+    write_packages_jsonl(sink, {"owner/repo": report}, create_run_metadata(ARGUMENTS))
+
+    _, found = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert found["key"] == ["pypi", "django-rest-framework"]
+    assert found["packages_urls"] == ["pkg:pypi/django-rest.framework@3.0.0"]
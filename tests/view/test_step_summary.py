@@ -0,0 +1,95 @@
+import csv
+import os
+
+from packageurl import PackageURL
+
+from src.arguments.action_arguments import ActionArguments, MaintenanceMetricScore, MaintenanceMetricSlug
+from src.clients.package_maintenance.model import BinaryRepositoryProjection, MaintenanceMetric, PackageMetadataProjection
+from src.models.packages_maintenance_report import PackagesMaintenanceReport
+from src.models.repositories_maintenance_report import RepositoriesMaintenanceReport
+from src.view.packages_maintenance_report_document import PackagesMaintenanceReportDocument
+from src.view.repositories_maintenance_report_document import RepositoriesMaintenanceReportDocument
+from src.view.step_summary import StepSummaryWriter, OVERFLOW_CSV_FILE, OVERFLOW_MARKDOWN_FILE, STEP_SUMMARY_MAX_SIZE
+
+
+def _report(packages_count: int) -> PackagesMaintenanceReport:
+    packages_maintenance = [
+        PackageMetadataProjection(
+            binary_repository=BinaryRepositoryProjection(
+                id=f"com.example:package-{i}",
+                type="maven",
+                latest_version="1.0.0",
+                url=f"https://repo.example.com/package-{i}",
+                # The last package is the only one below the threshold.
+                release_recency=MaintenanceMetric(score="D" if i == packages_count - 1 else "A", value=i),
+            ),
+            source_repository=None,
+        )
+        for i in range(packages_count)
+    ]
+    packages_urls = [PackageURL(type="maven", namespace="com.example", name=f"package-{i}") for i in range(packages_count)]
+    arguments = ActionArguments(
+        github_repository_owner="owner",
+        github_repository_name="repo",
+        packages_scores_thresholds={MaintenanceMetricSlug.binary_release_recency: MaintenanceMetricScore.B},
+    )
+    return PackagesMaintenanceReport.create(packages_urls, packages_maintenance, arguments)
+
+
+def test_report_fitting_into_summary_is_written_as_is(tmp_path):
+    summary_file = tmp_path / "summary.md"
+    report = _report(3)
+    document = PackagesMaintenanceReportDocument(report)
+
+    StepSummaryWriter(str(summary_file), str(tmp_path / "report")).write(document.write, {"owner/repo": report})
+
+    summary = summary_file.read_text()
+    assert sorted(summary.splitlines()) == sorted(document.render().splitlines())
+    # Packages below the threshold are listed first.
+    assert summary.index("com.example:package-2") < summary.index("com.example:package-0")
+    assert "Truncated report" not in summary
+    assert not (tmp_path / "report").exists()
+
+
+def test_report_overflowing_summary_is_written_to_report_dir(tmp_path):
+    summary_file = tmp_path / "summary.md"
+    report_dir = tmp_path / "report"
+    report = _report(100)
+    document = PackagesMaintenanceReportDocument(report)
+    writer = StepSummaryWriter(
+        str(summary_file), str(report_dir), "https://github.com/owner/repo/actions/runs/1", max_size=8 * 1024
+    )
+
+    writer.write(document.write, {"owner/repo": report})
+
+    summary = summary_file.read_text()
+    assert len(summary.encode()) <= 8 * 1024
+    # The package below the threshold is listed first, although it is the last found package.
+    assert summary.index("com.example:package-99") < summary.index("com.example:package-0 ")
+    assert "table rows and 0 repository reports were left out" in summary
+    assert "(https://github.com/owner/repo/actions/runs/1)" in summary
+    assert (report_dir / OVERFLOW_MARKDOWN_FILE).read_text() == document.render()
+    with open(report_dir / OVERFLOW_CSV_FILE, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 100
+    assert rows[99]["id"] == "com.example:package-99"
+    assert rows[99]["binary_release_recency_value"] == "99"
+    assert rows[99]["below_threshold_metrics"] == "binary_release_recency"
+
+
+def test_many_repositories_reports_are_kept_within_summary_size(tmp_path):
+    summary_file = tmp_path / "summary.md"
+    report_dir = tmp_path / "report"
+    reports = {f"owner/repo-{i}": _report(5) for i in range(800)}
+    document = RepositoriesMaintenanceReportDocument(RepositoriesMaintenanceReport(reports, {}))
+
+    StepSummaryWriter(str(summary_file), str(report_dir)).write(document.write, reports)
+
+    assert os.path.getsize(summary_file) <= STEP_SUMMARY_MAX_SIZE
+    summary = summary_file.read_text()
+    written_reports = summary.count("### Package maintenance report of")
+    assert 0 < written_reports < 800
+    # Reports of repositories are written whole: each written report ends with its last section.
+    assert summary.count("A package maintenance score is below the threshold;") == written_reports
+    assert f"0 table rows and {800 - written_reports} repository reports were left out" in summary
+    assert (report_dir / OVERFLOW_MARKDOWN_FILE).read_text() == document.render()